@@ -1,58 +1,162 @@
 # agnet 패키지 초기화 파일
+from importlib import import_module
 
-# diary에서 export할 클래스들
-from .diary import (
-    InfoNode,
-    SuggestKeywordsNode,
-    CreateEntryNode,
-    GenerateDiaryBodyNode,
-    GenerateEmotionChartsNode,
-    GenerateDiaryNode,
-    RouterNode,
-    get_diary_system_prompt,
-    get_summary_prompt,
-    get_body_prompt,
-)
-
-# secretfriend에서 export할 클래스들
-from .secretfriend import (
-    MusicRecommendationNode,
-    QuoteRecommendationNode,
-    PraiseNode,
-    MBTIFeedbackNode,
-    StartNodeCheck,
-    LetterMarkdownNode,
-    get_music_prompt,
-    get_quote_prompt,
-    get_praise_prompt,
-    get_f_feedback_prompt,
-    get_t_feedback_prompt,
-)
-
-from .core import (State, SecretFriendState, suggest_keywords_tool, 
-                SpotifyTool, create_web_search_tool, Companion, DiaryEntry, 
-                CoreEmotionType, emotion_keyword_map, MusicResponse, 
-                QuoteResponse, SpotifyToolInput)
-
+# export 이름 → 실제로 정의된 모듈 (지연 import)
+_EXPORTS = {
+    # diary
+    "InfoNode": ".diary",
+    "SuggestKeywordsNode": ".diary",
+    "CreateEntryNode": ".diary",
+    "GenerateDiaryBodyNode": ".diary",
+    "GenerateEmotionChartsNode": ".diary",
+    "GenerateDiaryNode": ".diary",
+    "RouterNode": ".diary",
+    "EntryRouterNode": ".diary",
+    "CommandNode": ".diary",
+    "SaveDiaryNode": ".diary",
+    "InfoContextManager": ".diary",
+    "build_main_workflow": ".diary",
+    "build_main_graph": ".diary",
+    "EmotionChartRenderer": ".diary",
+    "ChartArtifactStore": ".diary",
+    "InMemoryChartStore": ".diary",
+    "get_chart_process_pool": ".diary",
+    "DiaryStore": ".diary",
+    "EmotionStats": ".diary",
+    "UserEmotionStats": ".diary",
+    "DiaryMemoryIndex": ".diary",
+    "MemoryRecord": ".diary",
+    "get_diary_system_prompt": ".diary",
+    "get_summary_prompt": ".diary",
+    "get_body_prompt": ".diary",
+    # secretfriend
+    "MusicRecommendationNode": ".secretfriend",
+    "QuoteRecommendationNode": ".secretfriend",
+    "PraiseNode": ".secretfriend",
+    "MBTIFeedbackNode": ".secretfriend",
+    "StartNodeCheck": ".secretfriend",
+    "LetterMarkdownNode": ".secretfriend",
+    "QuoteIndex": ".secretfriend",
+    "QuoteRecord": ".secretfriend",
+    "build_letter_workflow": ".secretfriend",
+    "build_letter_graph": ".secretfriend",
+    "LetterBatchRunner": ".secretfriend",
+    "LetterBatchProgress": ".secretfriend",
+    "LetterBatchResult": ".secretfriend",
+    "LetterStreamEvent": ".secretfriend",
+    "astream_letter": ".secretfriend",
+    "stream_letter": ".secretfriend",
+    "get_music_prompt": ".secretfriend",
+    "get_quote_prompt": ".secretfriend",
+    "get_praise_prompt": ".secretfriend",
+    "get_f_feedback_prompt": ".secretfriend",
+    "get_t_feedback_prompt": ".secretfriend",
+    "get_mbti_feedback_prompt": ".secretfriend",
+    "get_music_keywords_prompt": ".secretfriend",
+    "get_music_reason_prompt": ".secretfriend",
+    # core
+    "State": ".core",
+    "SecretFriendState": ".core",
+    "suggest_keywords_tool": ".core",
+    "SpotifyTool": ".core",
+    "AsyncSpotifyClient": ".core",
+    "SpotifyAPIError": ".core",
+    "SQLiteCheckpointSaver": ".core",
+    "MicroBatchLLM": ".core",
+    "RateLimiter": ".core",
+    "RateLimitedLLM": ".core",
+    "rate_limited": ".core",
+    "get_rate_limiter": ".core",
+    "configure_rate_limiter": ".core",
+    "rate_limiter_metrics": ".core",
+    "BaseNode": ".core",
+    "NodeRunMetrics": ".core",
+    "MetricsSink": ".core",
+    "HistogramMetricsSink": ".core",
+    "JSONLinesMetricsSink": ".core",
+    "get_metrics_sinks": ".core",
+    "configure_metrics_sinks": ".core",
+    "add_metrics_sink": ".core",
+    "node_metrics": ".core",
+    # Streaming
+    "TokenStreamEvent": ".core",
+    "token_stream_config": ".core",
+    "with_stream_usage": ".core",
+    # Search digest
+    "QuoteCandidate": ".core",
+    "clean_page_text": ".core",
+    "extract_quote_candidates": ".core",
+    "digest_search_results": ".core",
+    "create_web_search_tool": ".core",
+    "Companion": ".core",
+    "DiaryEntry": ".core",
+    "DiaryRecord": ".core",
+    "CoreEmotionType": ".core",
+    "emotion_keyword_map": ".core",
+    "MusicResponse": ".core",
+    "QuoteResponse": ".core",
+    "MBTIFeedbackResponse": ".core",
+    "MusicKeywords": ".core",
+    "SpotifyToolInput": ".core",
+}
 
 __all__ = [
     # Models
     "Companion",
     "DiaryEntry", 
+    "DiaryRecord",
     "CoreEmotionType",
     "emotion_keyword_map",
     "MusicResponse",
     "QuoteResponse",
+    "MBTIFeedbackResponse",
+    "MusicKeywords",
     "SpotifyToolInput",
 
     # Tools
     "suggest_keywords_tool",
     "SpotifyTool",
+    "AsyncSpotifyClient",
+    "SpotifyAPIError",
     "create_web_search_tool",
 
     # States
     "State",
     "SecretFriendState",
+    "SQLiteCheckpointSaver",
+
+    # Batching
+    "MicroBatchLLM",
+
+    # Rate limiting
+    "RateLimiter",
+    "RateLimitedLLM",
+    "rate_limited",
+    "get_rate_limiter",
+    "configure_rate_limiter",
+    "rate_limiter_metrics",
+
+    # Nodes / Metrics
+    "BaseNode",
+    "NodeRunMetrics",
+    "MetricsSink",
+    "HistogramMetricsSink",
+    "JSONLinesMetricsSink",
+    "get_metrics_sinks",
+    "configure_metrics_sinks",
+    "add_metrics_sink",
+    "node_metrics",
+
+    # Streaming
+    "TokenStreamEvent",
+    "token_stream_config",
+    "with_stream_usage",
+
+    # Search digest
+    "QuoteCandidate",
+    "clean_page_text",
+    "extract_quote_candidates",
+    "digest_search_results",
 
     # Diary Nodes
     "InfoNode",
@@ -62,7 +166,34 @@ __all__ = [
     "GenerateEmotionChartsNode",
     "GenerateDiaryNode",
     "RouterNode",
-    
+    "EntryRouterNode",
+    "CommandNode",
+    "SaveDiaryNode",
+
+    # Diary Context
+    "InfoContextManager",
+
+    # Diary Graph
+    "build_main_workflow",
+    "build_main_graph",
+
+    # Diary Charts
+    "EmotionChartRenderer",
+    "ChartArtifactStore",
+    "InMemoryChartStore",
+    "get_chart_process_pool",
+
+    # Diary Store
+    "DiaryStore",
+
+    # Diary Stats
+    "EmotionStats",
+    "UserEmotionStats",
+
+    # Diary Memory
+    "DiaryMemoryIndex",
+    "MemoryRecord",
+
     # Diary Prompts
     "get_diary_system_prompt",
     "get_summary_prompt",
@@ -75,11 +206,46 @@ __all__ = [
     "MBTIFeedbackNode",
     "StartNodeCheck",
     "LetterMarkdownNode",
-    
+
+    # SecretFriend Quote index
+    "QuoteIndex",
+    "QuoteRecord",
+
+    # SecretFriend Graph
+    "build_letter_workflow",
+    "build_letter_graph",
+
+    # SecretFriend Batch
+    "LetterBatchRunner",
+    "LetterBatchProgress",
+    "LetterBatchResult",
+
+    # SecretFriend Stream
+    "LetterStreamEvent",
+    "astream_letter",
+    "stream_letter",
+
     # SecretFriend Prompts
     "get_music_prompt",
     "get_quote_prompt", 
     "get_praise_prompt",
     "get_f_feedback_prompt",
     "get_t_feedback_prompt",
-]
\ No newline at end of file
+    "get_mbti_feedback_prompt",
+    "get_music_keywords_prompt",
+    "get_music_reason_prompt",
+]
+
+
+def __getattr__(name: str):
+    # 처음 접근할 때 해당 모듈을 import (import 시점 비용/부작용 최소화)
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
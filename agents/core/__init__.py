@@ -1,21 +1,74 @@
-from .states import (State, SecretFriendState)
+# core 패키지: 모델 / 도구 / 상태 정의
+from importlib import import_module
 
-from .tools import (suggest_keywords_tool, SpotifyTool, create_web_search_tool)
-
-from .models import (Companion, DiaryEntry, CoreEmotionType, 
-                    emotion_keyword_map, MusicResponse, QuoteResponse, 
-                    SpotifyToolInput)
+# export 이름 → 실제로 정의된 모듈 (지연 import)
+_EXPORTS = {
+    # Models
+    "Companion": ".models",
+    "DiaryEntry": ".models",
+    "DiaryRecord": ".models",
+    "CoreEmotionType": ".models",
+    "emotion_keyword_map": ".models",
+    "MusicResponse": ".models",
+    "QuoteResponse": ".models",
+    "MBTIFeedbackResponse": ".models",
+    "MusicKeywords": ".models",
+    "SpotifyToolInput": ".models",
+    # Tools
+    "suggest_keywords_tool": ".tools",
+    "SpotifyTool": ".tools",
+    "create_web_search_tool": ".tools",
+    # Spotify client
+    "AsyncSpotifyClient": ".spotify",
+    "SpotifyAPIError": ".spotify",
+    # Checkpointer
+    "SQLiteCheckpointSaver": ".checkpoint",
+    # Batching
+    "MicroBatchLLM": ".batching",
+    # Rate limiting
+    "RateLimiter": ".ratelimit",
+    "RateLimitedLLM": ".ratelimit",
+    "rate_limited": ".ratelimit",
+    "get_rate_limiter": ".ratelimit",
+    "configure_rate_limiter": ".ratelimit",
+    "rate_limiter_metrics": ".ratelimit",
+    # Nodes / Metrics
+    "BaseNode": ".nodes",
+    "NodeRunMetrics": ".metrics",
+    "MetricsSink": ".metrics",
+    "HistogramMetricsSink": ".metrics",
+    "JSONLinesMetricsSink": ".metrics",
+    "get_metrics_sinks": ".metrics",
+    "configure_metrics_sinks": ".metrics",
+    "add_metrics_sink": ".metrics",
+    "node_metrics": ".metrics",
+    # Streaming
+    "TokenStreamEvent": ".streaming",
+    "token_stream_config": ".streaming",
+    "with_stream_usage": ".streaming",
+    # Search digest
+    "QuoteCandidate": ".search_digest",
+    "clean_page_text": ".search_digest",
+    "extract_quote_candidates": ".search_digest",
+    "digest_search_results": ".search_digest",
+    # States
+    "State": ".states",
+    "SecretFriendState": ".states",
+}
 
 __all__ = [
     # Models - Diary
     "Companion",
     "DiaryEntry",
+    "DiaryRecord",
     "CoreEmotionType",
     "emotion_keyword_map",
 
     # Models - SecretFriend
     "MusicResponse",
     "QuoteResponse",
+    "MBTIFeedbackResponse",
+    "MusicKeywords",
     "SpotifyToolInput",
 
     # Tools - Diary
@@ -23,6 +76,8 @@ __all__ = [
 
     # Tools - SecretFriend
     "SpotifyTool",
+    "AsyncSpotifyClient",
+    "SpotifyAPIError",
     "create_web_search_tool",
 
     # States - Diary
@@ -30,4 +85,54 @@ __all__ = [
 
     # States - SecretFriend
     "SecretFriendState",
-]
\ No newline at end of file
+
+    # Checkpointer
+    "SQLiteCheckpointSaver",
+
+    # Batching
+    "MicroBatchLLM",
+
+    # Rate limiting
+    "RateLimiter",
+    "RateLimitedLLM",
+    "rate_limited",
+    "get_rate_limiter",
+    "configure_rate_limiter",
+    "rate_limiter_metrics",
+
+    # Nodes / Metrics
+    "BaseNode",
+    "NodeRunMetrics",
+    "MetricsSink",
+    "HistogramMetricsSink",
+    "JSONLinesMetricsSink",
+    "get_metrics_sinks",
+    "configure_metrics_sinks",
+    "add_metrics_sink",
+    "node_metrics",
+
+    # Streaming
+    "TokenStreamEvent",
+    "token_stream_config",
+    "with_stream_usage",
+
+    # Search digest
+    "QuoteCandidate",
+    "clean_page_text",
+    "extract_quote_candidates",
+    "digest_search_results",
+]
+
+
+def __getattr__(name: str):
+    # 처음 접근할 때 해당 모듈을 import (import 시점 비용/부작용 최소화)
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,111 @@
+from typing import Any, List, Optional
+import asyncio
+
+from .metrics import current_node_usage, node_usage
+
+
+class MicroBatchLLM:
+    """
+    여러 코루틴에서 동시에 들어오는 LLM 호출을 모아 llm.abatch 한 번으로 보내는 래퍼
+    - max_batch_size개가 모이거나 첫 요청 후 max_wait초가 지나면 모인 요청을 함께 전송
+    - 동시에 진행하는 요청 수는 max_concurrency로 제한 (abatch의 max_concurrency 설정)
+    - 노드에는 일반 LLM 대신 그대로 전달 (PraiseNode(MicroBatchLLM(llm)) 등)
+    - 동기 invoke/batch와 config/kwargs가 붙은 호출은 모으지 않고 원래 llm으로 바로 전달
+    - 노드 측정(BaseNode)의 LLM 호출 / 토큰 수는 묶어 보내도 요청한 노드별로 따로 집계
+
+    Attributes:
+        max_batch_size (int): 한 번에 묶을 최대 요청 수.
+        max_wait (float): 첫 요청 이후 다른 요청을 기다리는 최대 시간(초).
+        max_concurrency (int | None): abatch 안에서 동시에 보낼 최대 요청 수 (None이면 제한 없음).
+        batch_count (int): 보낸 abatch 횟수.
+        request_count (int): 묶어서 보낸 요청 수.
+    """
+
+    def __init__(self, llm, max_batch_size: int = 16, max_wait: float = 0.02, max_concurrency: Optional[int] = None):
+        self.llm = llm
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.max_concurrency = max_concurrency
+        self.batch_count = 0
+        self.request_count = 0
+
+        # 이벤트 루프마다 새로 만들어야 하는 객체들
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pending: List[tuple] = []  # (input, future, 요청한 노드의 사용량 수집기)
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: set = set()
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._pending = []
+            self._timer = None
+            self._tasks = set()
+        return loop
+
+    # 동기 경로 (그대로 전달)
+    def invoke(self, input, config=None, **kwargs):
+        return self.llm.invoke(input, config, **kwargs)
+
+    def batch(self, inputs, config=None, **kwargs):
+        return self.llm.batch(inputs, config, **kwargs)
+
+    # 비동기 경로 (모아서 전송)
+    async def ainvoke(self, input, config=None, **kwargs):
+        if config is not None or kwargs:
+            return await self.llm.ainvoke(input, config, **kwargs)
+
+        loop = self._ensure_loop()
+        future = loop.create_future()
+        self._pending.append((input, future, current_node_usage()))
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush)
+        return await future
+
+    async def abatch(self, inputs, config=None, **kwargs) -> List[Any]:
+        if config is not None or kwargs:
+            return await self.llm.abatch(inputs, config, **kwargs)
+        return list(await asyncio.gather(*(self.ainvoke(input) for input in inputs)))
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        task = asyncio.ensure_future(self._dispatch(batch))
+        # 완료 전에 GC되지 않도록 참조 유지
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _dispatch(self, batch: List[tuple]) -> None:
+        self.batch_count += 1
+        self.request_count += len(batch)
+        configs = []
+        for _, _, usage in batch:
+            config = {"max_concurrency": self.max_concurrency} if self.max_concurrency else {}
+            if usage is not None:
+                config["callbacks"] = [usage]
+            configs.append(config)
+        try:
+            # 이 작업은 처음 요청한 노드의 컨텍스트를 물려받으므로, 사용량은 요청별 config로만 집계
+            with node_usage(None):
+                outputs = await self.llm.abatch(
+                    [input for input, _, _ in batch],
+                    configs if any(configs) else None,
+                    return_exceptions=True,
+                )
+        except Exception as exc:
+            outputs = [exc] * len(batch)
+
+        for (_, future, _), output in zip(batch, outputs):
+            if future.done():  # 호출한 쪽이 취소된 경우
+                continue
+            if isinstance(output, BaseException):
+                future.set_exception(output)
+            else:
+                future.set_result(output)
@@ -0,0 +1,66 @@
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+import threading
+import time
+
+
+class TTLCache:
+    """
+    TTL(만료 시간)과 LRU 제거 정책을 가진 스레드 안전 인메모리 캐시
+
+    Attributes:
+        maxsize (int): 보관할 최대 키 개수. 초과 시 가장 오래 사용하지 않은 키부터 제거.
+        ttl (float): 항목 유효 시간(초).
+    """
+
+    def __init__(self, maxsize: int = 256, ttl: float = 3600.0, timer: Callable[[], float] = time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._timer = timer
+        self._data: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        # 프로세스 간 전달 시 Lock은 제외
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """유효한 값이 있으면 반환하고 최근 사용으로 표시, 없거나 만료되면 None"""
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+
+            expires_at, value = item
+            if expires_at <= self._timer():
+                del self._data[key]
+                return None
+
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._data[key] = (self._timer() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key: Hashable) -> Optional[Any]:
+        """키를 제거하고 값(만료 여부와 무관) 반환, 없으면 None"""
+        with self._lock:
+            item = self._data.pop(key, None)
+            return None if item is None else item[1]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
@@ -0,0 +1,560 @@
+from collections.abc import AsyncIterator, Iterator, Sequence
+from pathlib import Path
+from typing import Any, Callable, Iterable, Optional, Union
+import asyncio
+import random
+import sqlite3
+import threading
+import time
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    SerializerProtocol,
+    get_checkpoint_id,
+    get_checkpoint_metadata,
+)
+
+from .cache import TTLCache
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS threads (
+    thread_id TEXT PRIMARY KEY,
+    updated_at REAL NOT NULL,
+    finished INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS threads_updated_at ON threads (updated_at);
+
+CREATE TABLE IF NOT EXISTS checkpoints (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL,
+    checkpoint_id TEXT NOT NULL,
+    parent_checkpoint_id TEXT,
+    checkpoint_type TEXT NOT NULL,
+    checkpoint BLOB NOT NULL,
+    metadata_type TEXT NOT NULL,
+    metadata BLOB NOT NULL,
+    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id)
+);
+
+CREATE TABLE IF NOT EXISTS blobs (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL,
+    channel TEXT NOT NULL,
+    version TEXT NOT NULL,
+    kind TEXT NOT NULL,              -- full / delta / empty
+    base_version TEXT,               -- delta가 이어 붙는 이전 버전
+    depth INTEGER NOT NULL DEFAULT 0,
+    type TEXT NOT NULL,
+    data BLOB NOT NULL,
+    PRIMARY KEY (thread_id, checkpoint_ns, channel, version)
+);
+
+CREATE TABLE IF NOT EXISTS writes (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL,
+    checkpoint_id TEXT NOT NULL,
+    task_id TEXT NOT NULL,
+    idx INTEGER NOT NULL,
+    channel TEXT NOT NULL,
+    type TEXT NOT NULL,
+    value BLOB NOT NULL,
+    task_path TEXT NOT NULL DEFAULT '',
+    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, task_id, idx)
+);
+"""
+
+
+def _is_prefix(previous: list, current: list) -> bool:
+    """current가 previous 뒤에 항목만 덧붙인 리스트인지 확인"""
+    if len(current) < len(previous):
+        return False
+    return all(a is b or a == b for a, b in zip(previous, current))
+
+
+class SQLiteCheckpointSaver(BaseCheckpointSaver[str]):
+    """
+    파일(SQLite) 기반 LangGraph 체크포인터 (main_graph의 MemorySaver 대체)
+    - 채널 값은 바뀐 채널만 버전별로 저장하고, messages 같은 append-only 리스트 채널은
+      직전 버전에 새로 추가된 항목만 delta로 저장 (full_every번마다 전체 스냅샷)
+    - 오래 사용하지 않은 스레드(ttl) / 일기 작성이 끝난 스레드(finished_ttl)를 삭제
+    - 스레드별 최근 keep_last개 체크포인트만 남기고 나머지를 정리(compaction)
+    - evict/compact는 put 시점에 maintenance_interval 간격으로 자동 실행되며 직접 호출도 가능
+
+    Attributes:
+        path (str | Path): SQLite 파일 경로 (":memory:" 가능).
+        delta_channels (tuple[str, ...]): delta로 저장할 리스트 채널 이름.
+        full_every (int): delta를 이만큼 이어 붙이면 전체 스냅샷을 한 번 저장.
+        keep_last (int | None): compaction 후 스레드/네임스페이스별로 남길 체크포인트 수, None이면 정리 안 함.
+        ttl (float | None): 마지막 저장 후 이 시간(초)이 지난 스레드 삭제, None이면 삭제 안 함.
+        finished_ttl (float | None): finished_channel이 기록된 스레드의 보관 시간(초).
+        finished_channel (str): 값이 기록되면 스레드를 '작성 완료'로 보는 채널.
+        maintenance_interval (float): 자동 evict/compact 최소 간격(초).
+        delta_cache_size (int): delta 계산을 위해 마지막 리스트를 기억해 둘 최대 스레드 수.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        *,
+        serde: Optional[SerializerProtocol] = None,
+        delta_channels: Iterable[str] = ("messages",),
+        full_every: int = 32,
+        keep_last: Optional[int] = 20,
+        ttl: Optional[float] = 60 * 60 * 24 * 7,
+        finished_ttl: Optional[float] = 60 * 60 * 24,
+        finished_channel: str = "final_markdown",
+        maintenance_interval: float = 300.0,
+        delta_cache_size: int = 1024,
+        timer: Callable[[], float] = time.time,
+    ):
+        super().__init__(serde=serde)
+        self.path = path
+        self.delta_channels = tuple(delta_channels)
+        self.full_every = full_every
+        self.keep_last = keep_last
+        self.ttl = ttl
+        self.finished_ttl = finished_ttl
+        self.finished_channel = finished_channel
+        self.maintenance_interval = maintenance_interval
+        self._timer = timer
+
+        self._lock = threading.RLock()
+        self.conn = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+        if str(path) != ":memory:":
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(_SCHEMA)
+
+        # thread_id → {(checkpoint_ns, channel): (version, 마지막으로 저장한 리스트, delta 깊이)}
+        # delta 계산용이며, 없으면(재시작 직후 등) 전체 스냅샷으로 저장
+        self._tails = TTLCache(maxsize=delta_cache_size, ttl=ttl or 60 * 60 * 24)
+        self._dirty: set = set()
+        self._last_maintenance = self._timer()
+
+    # 연결 관리
+    def close(self) -> None:
+        with self._lock:
+            self.conn.close()
+
+    def __enter__(self) -> "SQLiteCheckpointSaver":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    # 채널 값 저장/복원
+    def _dump_channel(self, tails: dict, checkpoint_ns: str, channel: str, version: str, values: dict) -> tuple:
+        """(kind, base_version, depth, type, data) 반환"""
+        if channel not in values:
+            return "empty", None, 0, "empty", b""
+
+        value = values[channel]
+        if channel in self.delta_channels and isinstance(value, list):
+            tail = tails.get((checkpoint_ns, channel))
+            tails[(checkpoint_ns, channel)] = (version, list(value), 0)
+            if tail is not None:
+                base_version, previous, depth = tail
+                if depth + 1 < self.full_every and _is_prefix(previous, value):
+                    tails[(checkpoint_ns, channel)] = (version, list(value), depth + 1)
+                    type_, data = self.serde.dumps_typed(value[len(previous):])
+                    return "delta", base_version, depth + 1, type_, data
+
+        type_, data = self.serde.dumps_typed(value)
+        return "full", None, 0, type_, data
+
+    def _load_channel(self, thread_id: str, checkpoint_ns: str, channel: str, version: str) -> tuple[bool, Any]:
+        """(값 존재 여부, 값) 반환, delta면 전체 스냅샷까지 거슬러 올라가 이어 붙임"""
+        chunks = []
+        while True:
+            row = self.conn.execute(
+                "SELECT kind, base_version, type, data FROM blobs "
+                "WHERE thread_id = ? AND checkpoint_ns = ? AND channel = ? AND version = ?",
+                (thread_id, checkpoint_ns, channel, version),
+            ).fetchone()
+            if row is None or row[0] == "empty":
+                if chunks:
+                    raise ValueError(f"delta의 기준 버전을 찾을 수 없습니다: {thread_id}/{channel}@{version}")
+                return False, None
+
+            kind, base_version, type_, data = row
+            chunks.append(self.serde.loads_typed((type_, data)))
+            if kind == "full":
+                break
+            version = base_version
+
+        value = chunks.pop()
+        if chunks:
+            value = list(value)
+            for delta in reversed(chunks):
+                value.extend(delta)
+        return True, value
+
+    def _load_channel_values(self, thread_id: str, checkpoint_ns: str, versions: ChannelVersions) -> dict:
+        channel_values = {}
+        for channel, version in versions.items():
+            found, value = self._load_channel(thread_id, checkpoint_ns, channel, str(version))
+            if found:
+                channel_values[channel] = value
+        return channel_values
+
+    def _row_to_tuple(self, row: tuple) -> CheckpointTuple:
+        thread_id, checkpoint_ns, checkpoint_id, parent_id, c_type, c_data, m_type, m_data = row
+        checkpoint: Checkpoint = self.serde.loads_typed((c_type, c_data))
+        writes = self.conn.execute(
+            "SELECT task_id, channel, type, value FROM writes "
+            "WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ? ORDER BY task_id, idx",
+            (thread_id, checkpoint_ns, checkpoint_id),
+        ).fetchall()
+        return CheckpointTuple(
+            config={
+                "configurable": {
+                    "thread_id": thread_id,
+                    "checkpoint_ns": checkpoint_ns,
+                    "checkpoint_id": checkpoint_id,
+                }
+            },
+            checkpoint={
+                **checkpoint,
+                "channel_values": self._load_channel_values(
+                    thread_id, checkpoint_ns, checkpoint["channel_versions"]
+                ),
+            },
+            metadata=self.serde.loads_typed((m_type, m_data)),
+            parent_config=(
+                {
+                    "configurable": {
+                        "thread_id": thread_id,
+                        "checkpoint_ns": checkpoint_ns,
+                        "checkpoint_id": parent_id,
+                    }
+                }
+                if parent_id
+                else None
+            ),
+            pending_writes=[
+                (task_id, channel, self.serde.loads_typed((type_, value)))
+                for task_id, channel, type_, value in writes
+            ],
+        )
+
+    # BaseCheckpointSaver 구현
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        query = (
+            "SELECT thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id, "
+            "checkpoint_type, checkpoint, metadata_type, metadata FROM checkpoints "
+            "WHERE thread_id = ? AND checkpoint_ns = ? "
+        )
+        with self._lock:
+            if checkpoint_id := get_checkpoint_id(config):
+                row = self.conn.execute(query + "AND checkpoint_id = ?", (thread_id, checkpoint_ns, checkpoint_id)).fetchone()
+            else:
+                row = self.conn.execute(
+                    query + "ORDER BY checkpoint_id DESC LIMIT 1", (thread_id, checkpoint_ns)
+                ).fetchone()
+            return self._row_to_tuple(row) if row else None
+
+    def list(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[CheckpointTuple]:
+        clauses, params = [], []
+        if config:
+            clauses.append("thread_id = ?")
+            params.append(config["configurable"]["thread_id"])
+            if (checkpoint_ns := config["configurable"].get("checkpoint_ns")) is not None:
+                clauses.append("checkpoint_ns = ?")
+                params.append(checkpoint_ns)
+            if checkpoint_id := get_checkpoint_id(config):
+                clauses.append("checkpoint_id = ?")
+                params.append(checkpoint_id)
+        if before and (before_id := get_checkpoint_id(before)):
+            clauses.append("checkpoint_id < ?")
+            params.append(before_id)
+
+        query = (
+            "SELECT thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id, "
+            "checkpoint_type, checkpoint, metadata_type, metadata FROM checkpoints "
+            + (f"WHERE {' AND '.join(clauses)} " if clauses else "")
+            + "ORDER BY thread_id, checkpoint_ns, checkpoint_id DESC"
+        )
+        with self._lock:
+            rows = self.conn.execute(query, params).fetchall()
+
+        for row in rows:
+            if limit is not None and limit <= 0:
+                break
+            if filter:
+                metadata = self.serde.loads_typed((row[6], row[7]))
+                if not all(metadata.get(key) == value for key, value in filter.items()):
+                    continue
+            with self._lock:
+                item = self._row_to_tuple(row)
+            if limit is not None:
+                limit -= 1
+            yield item
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        c = checkpoint.copy()
+        values: dict[str, Any] = c.pop("channel_values")  # type: ignore[misc]
+
+        with self._lock:
+            tails = self._tails.get(thread_id)
+            if tails is None:
+                tails = {}
+                self._tails.set(thread_id, tails)
+
+            blob_rows = []
+            for channel, version in new_versions.items():
+                kind, base_version, depth, type_, data = self._dump_channel(
+                    tails, checkpoint_ns, channel, str(version), values
+                )
+                blob_rows.append((thread_id, checkpoint_ns, channel, str(version), kind, base_version, depth, type_, data))
+
+            c_type, c_data = self.serde.dumps_typed(c)
+            m_type, m_data = self.serde.dumps_typed(get_checkpoint_metadata(config, metadata))
+            finished = int(bool(values.get(self.finished_channel)))
+
+            with self.conn:
+                self.conn.execute("BEGIN")
+                self.conn.executemany("INSERT OR REPLACE INTO blobs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", blob_rows)
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO checkpoints VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        thread_id,
+                        checkpoint_ns,
+                        checkpoint["id"],
+                        config["configurable"].get("checkpoint_id"),
+                        c_type,
+                        c_data,
+                        m_type,
+                        m_data,
+                    ),
+                )
+                self.conn.execute(
+                    "INSERT INTO threads VALUES (?, ?, ?) ON CONFLICT(thread_id) DO UPDATE SET "
+                    "updated_at = excluded.updated_at, finished = max(finished, excluded.finished)",
+                    (thread_id, self._timer(), finished),
+                )
+            self._dirty.add(thread_id)
+
+        self._maybe_maintain()
+        return {
+            "configurable": {
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": checkpoint["id"],
+            }
+        }
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_id = config["configurable"]["checkpoint_id"]
+        # 특수 채널(음수 idx)은 덮어쓰고, 일반 채널은 처음 기록만 유지
+        replace = all(channel in WRITES_IDX_MAP for channel, _ in writes)
+        rows = []
+        for idx, (channel, value) in enumerate(writes):
+            type_, data = self.serde.dumps_typed(value)
+            rows.append(
+                (thread_id, checkpoint_ns, checkpoint_id, task_id, WRITES_IDX_MAP.get(channel, idx), channel, type_, data, task_path)
+            )
+        with self._lock, self.conn:
+            self.conn.execute("BEGIN")
+            self.conn.executemany(
+                f"INSERT OR {'REPLACE' if replace else 'IGNORE'} INTO writes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+
+    def delete_thread(self, thread_id: str) -> None:
+        with self._lock:
+            self._delete_threads([thread_id])
+
+    def get_next_version(self, current: Optional[str], channel: None) -> str:
+        if current is None:
+            current_v = 0
+        elif isinstance(current, int):
+            current_v = current
+        else:
+            current_v = int(current.split(".")[0])
+        return f"{current_v + 1:032}.{random.random():016}"
+
+    # 비동기 버전 (디스크 I/O는 스레드에서 실행)
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        items = await asyncio.to_thread(lambda: list(self.list(config, filter=filter, before=before, limit=limit)))
+        for item in items:
+            yield item
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        return await asyncio.to_thread(self.put, config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        await asyncio.to_thread(self.put_writes, config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        await asyncio.to_thread(self.delete_thread, thread_id)
+
+    # 보관 정책
+    def _delete_threads(self, thread_ids: list) -> None:
+        if not thread_ids:
+            return
+        params = [(thread_id,) for thread_id in thread_ids]
+        with self.conn:
+            self.conn.execute("BEGIN")
+            for table in ("checkpoints", "blobs", "writes", "threads"):
+                self.conn.executemany(f"DELETE FROM {table} WHERE thread_id = ?", params)
+        for thread_id in thread_ids:
+            self._dirty.discard(thread_id)
+            self._tails.pop(thread_id)
+
+    def evict(self, now: Optional[float] = None) -> int:
+        """보관 기간이 지난 스레드(유휴 / 작성 완료)를 삭제하고 삭제한 스레드 수 반환"""
+        now = self._timer() if now is None else now
+        conditions, params = [], []
+        if self.ttl is not None:
+            conditions.append("updated_at < ?")
+            params.append(now - self.ttl)
+        if self.finished_ttl is not None:
+            conditions.append("(finished = 1 AND updated_at < ?)")
+            params.append(now - self.finished_ttl)
+        if not conditions:
+            return 0
+
+        with self._lock:
+            thread_ids = [
+                row[0] for row in self.conn.execute(f"SELECT thread_id FROM threads WHERE {' OR '.join(conditions)}", params)
+            ]
+            self._delete_threads(thread_ids)
+        return len(thread_ids)
+
+    def compact(self, thread_ids: Optional[Iterable[str]] = None, keep_last: Optional[int] = None) -> int:
+        """
+        스레드별 최근 keep_last개 체크포인트만 남기고 정리, 삭제한 체크포인트 수 반환
+        - 남은 체크포인트가 참조하지 않는 채널 버전/pending writes도 삭제
+        - 기준 버전이 지워지는 delta는 전체 스냅샷으로 다시 저장
+        """
+        keep_last = self.keep_last if keep_last is None else keep_last
+        if keep_last is None:
+            return 0
+
+        removed = 0
+        with self._lock:
+            if thread_ids is None:
+                thread_ids = [row[0] for row in self.conn.execute("SELECT thread_id FROM threads")]
+            for thread_id in thread_ids:
+                namespaces = [
+                    row[0]
+                    for row in self.conn.execute(
+                        "SELECT DISTINCT checkpoint_ns FROM checkpoints WHERE thread_id = ?", (thread_id,)
+                    )
+                ]
+                for checkpoint_ns in namespaces:
+                    removed += self._compact_namespace(thread_id, checkpoint_ns, keep_last)
+        return removed
+
+    def _compact_namespace(self, thread_id: str, checkpoint_ns: str, keep_last: int) -> int:
+        rows = self.conn.execute(
+            "SELECT checkpoint_id, checkpoint_type, checkpoint FROM checkpoints "
+            "WHERE thread_id = ? AND checkpoint_ns = ? ORDER BY checkpoint_id DESC",
+            (thread_id, checkpoint_ns),
+        ).fetchall()
+        if len(rows) <= keep_last:
+            return 0
+
+        kept, dropped = rows[:keep_last], [row[0] for row in rows[keep_last:]]
+        referenced = set()
+        for _, c_type, c_data in kept:
+            for channel, version in self.serde.loads_typed((c_type, c_data))["channel_versions"].items():
+                referenced.add((channel, str(version)))
+
+        blobs = self.conn.execute(
+            "SELECT channel, version, kind, base_version FROM blobs WHERE thread_id = ? AND checkpoint_ns = ?",
+            (thread_id, checkpoint_ns),
+        ).fetchall()
+
+        # 지워질 버전에 기대는 delta는 삭제 전에 전체 값으로 복원해 둠
+        rebased = []
+        for channel, version, kind, base_version in blobs:
+            if kind == "delta" and (channel, version) in referenced and (channel, base_version) not in referenced:
+                _, value = self._load_channel(thread_id, checkpoint_ns, channel, version)
+                rebased.append((channel, version, *self.serde.dumps_typed(value)))
+        unreferenced = [(channel, version) for channel, version, _, _ in blobs if (channel, version) not in referenced]
+
+        with self.conn:
+            self.conn.execute("BEGIN")
+            self.conn.executemany(
+                "UPDATE blobs SET kind = 'full', base_version = NULL, depth = 0, type = ?, data = ? "
+                "WHERE thread_id = ? AND checkpoint_ns = ? AND channel = ? AND version = ?",
+                [(type_, data, thread_id, checkpoint_ns, channel, version) for channel, version, type_, data in rebased],
+            )
+            self.conn.executemany(
+                "DELETE FROM blobs WHERE thread_id = ? AND checkpoint_ns = ? AND channel = ? AND version = ?",
+                [(thread_id, checkpoint_ns, channel, version) for channel, version in unreferenced],
+            )
+            for table in ("checkpoints", "writes"):
+                self.conn.executemany(
+                    f"DELETE FROM {table} WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?",
+                    [(thread_id, checkpoint_ns, checkpoint_id) for checkpoint_id in dropped],
+                )
+        return len(dropped)
+
+    def _maybe_maintain(self) -> None:
+        if self._timer() - self._last_maintenance < self.maintenance_interval:
+            return
+        with self._lock:
+            self._last_maintenance = self._timer()
+            dirty, self._dirty = self._dirty, set()
+        self.evict()
+        self.compact(dirty)
+
+    def vacuum(self) -> None:
+        """삭제로 생긴 빈 공간을 파일에서 회수"""
+        with self._lock:
+            self.conn.execute("VACUUM")
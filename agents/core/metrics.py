@@ -0,0 +1,265 @@
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import IO, Any, Dict, Iterator, List, Optional, Sequence, Union
+import json
+import threading
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.tracers.context import register_configure_hook
+from pydantic import BaseModel, Field
+
+
+class NodeRunMetrics(BaseModel):
+    """
+    노드 한 번 실행에 대한 측정 결과입니다.
+
+    Attributes:
+        node (str): 노드 이름 (BaseNode.name).
+        started_at (float): 시작 시각 (Unix time).
+        elapsed (float): 실행 시간(초).
+        llm_calls (int): 노드 안에서 호출한 LLM 횟수 (에이전트 / 체인 내부 호출 포함).
+        prompt_tokens (int): 입력 토큰 수 합계 (모델이 사용량을 돌려준 호출만 집계).
+        completion_tokens (int): 출력 토큰 수 합계.
+        error (str | None): 실패 시 예외 이름 (성공 시 None).
+    """
+    node: str = Field(..., description="노드 이름")
+    started_at: float = Field(..., description="시작 시각(Unix time)")
+    elapsed: float = Field(..., description="실행 시간(초)")
+    llm_calls: int = Field(default=0, description="LLM 호출 수")
+    prompt_tokens: int = Field(default=0, description="입력 토큰 수")
+    completion_tokens: int = Field(default=0, description="출력 토큰 수")
+    error: Optional[str] = Field(default=None, description="예외 이름")
+
+
+class LLMUsageHandler(BaseCallbackHandler):
+    """
+    노드 실행 동안의 LLM 호출 수 / 토큰 사용량을 모으는 콜백
+    - node_usage()로 컨텍스트에 등록하면 그 안에서 실행되는 모든 LLM 호출에 자동으로 붙음
+    - 토큰은 AIMessage.usage_metadata, 없으면 llm_output["token_usage"]에서 읽음
+    """
+    run_inline = True
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.llm_calls = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+
+    def on_llm_end(self, response, **kwargs: Any) -> None:
+        prompt = completion = 0
+        found = False
+        for generations in response.generations:
+            for generation in generations:
+                usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+                if usage:
+                    found = True
+                    prompt += usage.get("input_tokens", 0)
+                    completion += usage.get("output_tokens", 0)
+        if not found:
+            usage = (response.llm_output or {}).get("token_usage") or {}
+            prompt, completion = usage.get("prompt_tokens", 0), usage.get("completion_tokens", 0)
+
+        with self._lock:
+            self.llm_calls += 1
+            self.prompt_tokens += prompt
+            self.completion_tokens += completion
+
+    def on_llm_error(self, error: BaseException, **kwargs: Any) -> None:
+        with self._lock:
+            self.llm_calls += 1
+
+
+# 현재 실행 중인 노드의 사용량 수집기 (LangChain이 새 실행을 구성할 때마다 콜백으로 추가)
+_node_usage_var: ContextVar[Optional[LLMUsageHandler]] = ContextVar("howru_node_usage", default=None)
+register_configure_hook(_node_usage_var, inheritable=True)
+
+
+def current_node_usage() -> Optional[LLMUsageHandler]:
+    return _node_usage_var.get()
+
+
+@contextmanager
+def node_usage(handler: Optional[LLMUsageHandler]) -> Iterator[Optional[LLMUsageHandler]]:
+    """이 블록 안의 LLM 호출을 handler로 집계 (None이면 집계하지 않음)"""
+    token = _node_usage_var.set(handler)
+    try:
+        yield handler
+    finally:
+        _node_usage_var.reset(token)
+
+
+class MetricsSink(ABC):
+    """노드 측정 결과를 받는 저장소 (BaseNode가 실행마다 record 호출)"""
+
+    @abstractmethod
+    def record(self, metrics: NodeRunMetrics) -> None:
+        pass
+
+
+class HistogramMetricsSink(MetricsSink):
+    """
+    프로세스 안에서 노드별 실행 시간 히스토그램과 누적 카운터를 유지하는 저장소
+    - summary(): 노드별 호출 수 / 오류 수 / 시간 통계(ms) / LLM 호출 수 / 토큰 수
+    - to_prometheus(): Prometheus 텍스트 형식으로 출력 (/metrics 응답이나 파일 덤프용)
+
+    Attributes:
+        buckets (Sequence[float]): 실행 시간 히스토그램 구간 상한(초).
+    """
+
+    DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+    SAMPLES = 1024  # 백분위 계산에 쓰는 노드별 최근 실행 시간 수
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        self._nodes: Dict[str, Dict[str, Any]] = {}
+
+    def _node(self, name: str) -> Dict[str, Any]:
+        node = self._nodes.get(name)
+        if node is None:
+            node = self._nodes[name] = {
+                "calls": 0, "errors": 0, "time_total": 0.0, "time_max": 0.0,
+                "llm_calls": 0, "prompt_tokens": 0, "completion_tokens": 0,
+                "bucket_counts": [0] * (len(self.buckets) + 1),  # 마지막 칸은 +Inf
+                "samples": deque(maxlen=self.SAMPLES),
+            }
+        return node
+
+    def record(self, metrics: NodeRunMetrics) -> None:
+        with self._lock:
+            node = self._node(metrics.node)
+            node["calls"] += 1
+            node["errors"] += metrics.error is not None
+            node["time_total"] += metrics.elapsed
+            node["time_max"] = max(node["time_max"], metrics.elapsed)
+            node["llm_calls"] += metrics.llm_calls
+            node["prompt_tokens"] += metrics.prompt_tokens
+            node["completion_tokens"] += metrics.completion_tokens
+            node["bucket_counts"][bisect_left(self.buckets, metrics.elapsed)] += 1
+            node["samples"].append(metrics.elapsed)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._nodes.clear()
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        result = {}
+        with self._lock:
+            for name, node in sorted(self._nodes.items()):
+                samples = sorted(node["samples"])
+                result[name] = {
+                    "calls": node["calls"],
+                    "errors": node["errors"],
+                    "mean_ms": node["time_total"] / node["calls"] * 1000,
+                    "p50_ms": samples[len(samples) // 2] * 1000,
+                    "p95_ms": samples[min(int(len(samples) * 0.95), len(samples) - 1)] * 1000,
+                    "max_ms": node["time_max"] * 1000,
+                    "llm_calls": node["llm_calls"],
+                    "prompt_tokens": node["prompt_tokens"],
+                    "completion_tokens": node["completion_tokens"],
+                }
+        return result
+
+    def to_prometheus(self, prefix: str = "howru_node") -> str:
+        lines = [
+            f"# HELP {prefix}_duration_seconds Node execution time.",
+            f"# TYPE {prefix}_duration_seconds histogram",
+        ]
+        counters = {"errors": [], "llm_calls": [], "tokens": []}
+        with self._lock:
+            for name, node in sorted(self._nodes.items()):
+                label = 'node="{}"'.format(name.replace("\\", "\\\\").replace('"', '\\"'))
+                cumulative = 0
+                for bound, count in zip(self.buckets + (float("inf"),), node["bucket_counts"]):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    lines.append(f'{prefix}_duration_seconds_bucket{{{label},le="{le}"}} {cumulative}')
+                lines.append(f"{prefix}_duration_seconds_sum{{{label}}} {node['time_total']!r}")
+                lines.append(f"{prefix}_duration_seconds_count{{{label}}} {node['calls']}")
+                counters["errors"].append(f"{prefix}_errors_total{{{label}}} {node['errors']}")
+                counters["llm_calls"].append(f"{prefix}_llm_calls_total{{{label}}} {node['llm_calls']}")
+                counters["tokens"].append(f'{prefix}_tokens_total{{{label},type="prompt"}} {node["prompt_tokens"]}')
+                counters["tokens"].append(f'{prefix}_tokens_total{{{label},type="completion"}} {node["completion_tokens"]}')
+
+        helps = {"errors": "Failed node executions.", "llm_calls": "LLM calls made inside the node.", "tokens": "LLM tokens used inside the node."}
+        for key, samples in counters.items():
+            lines.append(f"# HELP {prefix}_{key}_total {helps[key]}")
+            lines.append(f"# TYPE {prefix}_{key}_total counter")
+            lines.extend(samples)
+        return "\n".join(lines) + "\n"
+
+
+class JSONLinesMetricsSink(MetricsSink):
+    """
+    노드 실행마다 측정 결과를 JSON 한 줄로 기록하는 저장소 (사후 분석용)
+    - 경로를 주면 이어쓰기 모드로 열고, 열린 파일 객체를 주면 그대로 사용
+
+    Attributes:
+        path (str | Path | None): 기록 파일 경로 (파일 객체를 받은 경우 None).
+    """
+
+    def __init__(self, target: Union[str, Path, IO[str]]):
+        self._lock = threading.Lock()
+        if isinstance(target, (str, Path)):
+            self.path = target
+            self._file = open(target, "a", encoding="utf-8")
+            self._owns_file = True
+        else:
+            self.path = None
+            self._file = target
+            self._owns_file = False
+
+    def record(self, metrics: NodeRunMetrics) -> None:
+        line = json.dumps(metrics.model_dump(), ensure_ascii=False)
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._owns_file:
+                self._file.close()
+
+    def __enter__(self) -> "JSONLinesMetricsSink":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+# 모든 노드가 기본으로 쓰는 저장소 (기본값은 프로세스 내 히스토그램 하나)
+_default_histogram = HistogramMetricsSink()
+_sinks: List[MetricsSink] = [_default_histogram]
+_sinks_lock = threading.Lock()
+
+
+def get_metrics_sinks() -> List[MetricsSink]:
+    with _sinks_lock:
+        return list(_sinks)
+
+
+def configure_metrics_sinks(*sinks: MetricsSink) -> List[MetricsSink]:
+    """
+    기본 저장소 목록을 교체 (인자가 없으면 측정 끔)
+    예) configure_metrics_sinks(JSONLinesMetricsSink("node_metrics.jsonl"))  # 히스토그램 대신 파일로만 기록
+    """
+    global _sinks
+    with _sinks_lock:
+        _sinks = list(sinks)
+        return list(_sinks)
+
+
+def add_metrics_sink(sink: MetricsSink) -> MetricsSink:
+    with _sinks_lock:
+        _sinks.append(sink)
+    return sink
+
+
+def node_metrics() -> Dict[str, Dict[str, Any]]:
+    """기본 히스토그램 저장소의 노드별 요약 (configure_metrics_sinks로 뺀 경우에도 그때까지의 값)"""
+    return _default_histogram.summary()
+
@@ -1,6 +1,6 @@
-from datetime import time
+from datetime import date, time
 from pydantic import BaseModel, Field
-from typing import Annotated, List, Literal
+from typing import Annotated, List, Literal, Optional
 
 # Diary
 class Companion(BaseModel):
@@ -42,6 +42,32 @@ class DiaryEntry(BaseModel):
     summary: Annotated[str, Field(..., max_length=150, description="전체 사건을 요약한 한 문장 (예: '친구와의 저녁 식사로 하루를 따뜻하게 마무리했다.')")]
 
 
+class DiaryRecord(BaseModel):
+    """
+    하루치 일기 저장 단위입니다. (DiaryStore에 저장/조회)
+
+    Attributes:
+        user_name (str): 사용자 이름.
+        diary_date (date): 일기 날짜 (State.today_date).
+        written_at (time | None): 작성 시각.
+        one_liner (str): 오늘의 한 줄.
+        diary_body (str): 일기 본문.
+        entries (List[DiaryEntry]): 그날 기록된 사건 목록.
+        emotion_pie_chart_url (str): 감정 비율 차트 위치 (파일 경로 또는 data URI).
+        emotion_timeline_chart_url (str): 감정 흐름 차트 위치.
+        emotion_score_chart_url (str): 감정 점수 차트 위치.
+    """
+    user_name: str = Field(default="", description="사용자 이름")
+    diary_date: date = Field(..., description="일기 날짜")
+    written_at: Optional[time] = Field(default=None, description="작성 시각")
+    one_liner: str = Field(default="", description="오늘의 한 줄")
+    diary_body: str = Field(default="", description="일기 본문")
+    entries: List[DiaryEntry] = Field(default_factory=list, description="그날 기록된 사건 목록")
+    emotion_pie_chart_url: str = Field(default="", description="감정 비율 차트 위치")
+    emotion_timeline_chart_url: str = Field(default="", description="감정 흐름 차트 위치")
+    emotion_score_chart_url: str = Field(default="", description="감정 점수 차트 위치")
+
+
 # SecretFriend
 class MusicResponse(BaseModel):
     """
@@ -73,6 +99,28 @@ class QuoteResponse(BaseModel):
     explanation: str = Field(..., description="왜 이 명언이 적절한지에 대한 설명")
 
 
+class MBTIFeedbackResponse(BaseModel):
+    """
+    F/T 유형 피드백을 한 번의 LLM 호출로 함께 받기 위한 모델입니다.
+
+    Attributes:
+        F_feedback (str): F 유형을 위한 감정적인 위로 메시지.
+        T_feedback (str): T 유형을 위한 논리적이고 실용적인 조언 메시지.
+    """
+    F_feedback: str = Field(..., description="F 유형을 위한 위로 메시지 (한 문단, 반말)")
+    T_feedback: str = Field(..., description="T 유형을 위한 조언 메시지 (한 문단, 반말)")
+
+
+class MusicKeywords(BaseModel):
+    """
+    음악 추천 빠른 경로에서 한 번의 LLM 호출로 받는 Spotify 검색 키워드 목록입니다.
+
+    Attributes:
+        keywords (List[str]): 일기 분위기에 어울리는 순서대로 정렬한 검색 키워드 (한 단어 명사).
+    """
+    keywords: List[str] = Field(..., description="어울리는 순서대로 정렬한 Spotify 검색 키워드 (각각 한 단어 명사, 3~5개)")
+
+
 class SpotifyToolInput(BaseModel):
     diary: str = Field(
         ..., description="일기 본문 텍스트를 입력합니다."
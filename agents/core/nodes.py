@@ -0,0 +1,90 @@
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+import time
+
+from langchain_core.runnables import RunnableLambda
+
+from .metrics import LLMUsageHandler, MetricsSink, NodeRunMetrics, get_metrics_sinks, node_usage
+
+NodeState = Dict[str, Any]  # State(일기) / SecretFriendState(편지) 모두 사용
+
+
+class BaseNode(ABC):
+    """
+    일기 / 편지 그래프 노드의 공통 부모 클래스
+    - 실행(__call__ / acall)마다 실행 시간, LLM 호출 수, 입력/출력 토큰 수, 예외를 측정해
+      metrics sink(기본값: get_metrics_sinks())에 기록
+    - verbose=True면 logging()과 측정 결과를 함께 출력
+
+    Attributes:
+        name (str): 노드 이름 (측정 결과의 node 값).
+        verbose (bool): 로그 출력 여부.
+        metrics_sinks (List[MetricsSink] | None): 이 노드만 따로 기록할 저장소 (None이면 기본 저장소, []면 측정 안 함).
+    """
+
+    def __init__(self, **kwargs):
+        self.name = "BaseNode"
+        self.verbose = False
+        if "verbose" in kwargs:
+            self.verbose = kwargs["verbose"]
+        self.metrics_sinks: Optional[List[MetricsSink]] = kwargs.get("metrics_sinks")
+
+    @abstractmethod
+    def execute(self, state: NodeState) -> NodeState:
+        pass
+
+    async def aexecute(self, state: NodeState) -> NodeState:
+        """비동기 실행 (I/O가 없는 노드는 동기 execute를 그대로 사용)"""
+        return self.execute(state)
+
+    def logging(self, method_name, **kwargs):
+        if self.verbose:
+            print(f"[{self.name}] {method_name}")
+            for key, value in kwargs.items():
+                print(f"{key}: {value}")
+
+    @contextmanager
+    def _measure(self) -> Iterator[None]:
+        sinks = self.metrics_sinks if self.metrics_sinks is not None else get_metrics_sinks()
+        if not sinks and not self.verbose:
+            yield
+            return
+
+        usage = LLMUsageHandler()
+        started_at, start = time.time(), time.perf_counter()
+        error = None
+        try:
+            with node_usage(usage):
+                yield
+        except Exception as exc:
+            error = type(exc).__name__
+            raise
+        finally:
+            metrics = NodeRunMetrics(
+                node=self.name,
+                started_at=started_at,
+                elapsed=time.perf_counter() - start,
+                llm_calls=usage.llm_calls,
+                prompt_tokens=usage.prompt_tokens,
+                completion_tokens=usage.completion_tokens,
+                error=error,
+            )
+            for sink in sinks:
+                sink.record(metrics)
+            self.logging("metrics", **metrics.model_dump(exclude={"node", "started_at"}))
+
+    def __call__(self, state: NodeState):
+        with self._measure():
+            return self.execute(state)
+
+    async def acall(self, state: NodeState):
+        with self._measure():
+            return await self.aexecute(state)
+
+    def as_runnable(self) -> RunnableLambda:
+        """
+        동기/비동기 경로를 모두 가진 Runnable로 변환
+        - graph.add_node(name, node.as_runnable()) 로 등록하면 ainvoke/astream 시 aexecute 사용
+        """
+        return RunnableLambda(self.__call__, afunc=self.acall, name=self.name)
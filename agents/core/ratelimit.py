@@ -0,0 +1,506 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional, TypeVar
+import asyncio
+import random
+import re
+import threading
+import time
+
+from langchain_core.messages.utils import count_tokens_approximately
+from langchain_core.runnables import Runnable
+
+T = TypeVar("T")
+
+# 다시 시도하면 성공할 수 있는 HTTP 상태 코드
+RETRYABLE_STATUS = frozenset({408, 409, 425, 429, 500, 502, 503, 504})
+# 다시 시도할 예외 (openai / httpx / aiohttp / 표준 라이브러리, 클래스 이름으로 판별해 import 불필요)
+RETRYABLE_ERRORS = frozenset({
+    "RateLimitError", "APITimeoutError", "APIConnectionError", "InternalServerError",
+    "TimeoutException", "ConnectError", "RemoteProtocolError",
+    "ClientConnectionError", "ServerTimeoutError",
+    "TimeoutError", "ConnectionError",
+})
+_STATUS_IN_MESSAGE = re.compile(r"\b(?:Error|status(?: code)?)[: ]+(\d{3})\b", re.IGNORECASE)
+
+
+def status_code_of(exc: BaseException) -> Optional[int]:
+    """예외에서 HTTP 상태 코드 추출 (status_code / http_status 속성, response, 또는 "Error 429: ..." 메시지)"""
+    for attr in ("status_code", "http_status"):
+        value = getattr(exc, attr, None)
+        if isinstance(value, int):
+            return value
+    response = getattr(exc, "response", None)
+    for attr in ("status_code", "status"):
+        value = getattr(response, attr, None)
+        if isinstance(value, int):
+            return value
+    match = _STATUS_IN_MESSAGE.search(str(exc))
+    return int(match.group(1)) if match else None
+
+
+def parse_retry_after(value) -> Optional[float]:
+    """Retry-After 값(초 또는 HTTP-date, RFC 9110)을 남은 초로 변환, 해석할 수 없으면 None"""
+    if value is None:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except (TypeError, ValueError):
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        return None
+    if when.tzinfo is None:  # "-0000" 등 시간대 없는 날짜는 UTC로 간주
+        when = when.replace(tzinfo=timezone.utc)
+    return max(when.timestamp() - time.time(), 0.0)
+
+
+def retry_after_of(exc: BaseException) -> Optional[float]:
+    """예외에 담긴 Retry-After(초) 값, 없으면 None"""
+    value = getattr(exc, "retry_after", None)
+    if value is None:
+        headers = getattr(exc, "headers", None) or getattr(getattr(exc, "response", None), "headers", None)
+        value = headers.get("Retry-After") if headers is not None else None
+    return parse_retry_after(value)
+
+
+def is_retryable(exc: BaseException) -> bool:
+    if status_code_of(exc) in RETRYABLE_STATUS:
+        return True
+    return any(cls.__name__ in RETRYABLE_ERRORS for cls in type(exc).__mro__)
+
+
+class TokenBucket:
+    """
+    초당 rate만큼 채워지고 최대 capacity까지 쌓이는 토큰 버킷
+    - reserve는 잔량이 모자라도 먼저 차감(음수 허용)하고 기다릴 시간을 돌려줌 → 먼저 온 요청부터 순서대로 통과
+    """
+
+    def __init__(self, capacity: float, rate: float, timer: Callable[[], float]):
+        self.capacity = capacity
+        self.rate = rate
+        self._timer = timer
+        self._level = capacity
+        self._updated = timer()
+
+    def _refill(self, now: float) -> None:
+        self._level = min(self.capacity, self._level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self, amount: float, now: float) -> float:
+        """amount만큼 차감하고, 잔량이 다시 0 이상이 될 때까지 기다릴 시간(초) 반환"""
+        self._refill(now)
+        self._level -= min(amount, self.capacity)  # capacity보다 큰 요청도 한 번은 통과
+        return 0.0 if self._level >= 0 else -self._level / self.rate
+
+    def adjust(self, amount: float, now: float) -> None:
+        """실제 사용량과 예상치의 차이(amount)를 반영 (양수면 추가 차감, 음수면 반환)"""
+        self._refill(now)
+        self._level = min(self.capacity, self._level - amount)
+
+
+class RateLimiter:
+    """
+    외부 API(제공자) 하나에 대한 호출 속도 제한 + 재시도 스케줄러
+    - 분당 요청 수(rpm) / 분당 토큰 수(tpm) 토큰 버킷, 예산이 없으면 기다렸다가 호출
+    - 429 / 5xx / 연결 오류는 지수 백오프 + full jitter로 재시도 (Retry-After가 있으면 그 시간 이상 대기)
+    - 429를 받으면 같은 제공자의 다른 호출도 Retry-After 동안 함께 멈춤
+    - 동기(call) / 비동기(acall) 모두 지원, 여러 스레드와 이벤트 루프에서 함께 사용 가능
+    - metrics(): 대기 중인 호출 수(queue_depth), 대기 시간 통계, 재시도/실패 횟수
+
+    Attributes:
+        name (str): 제공자 이름 (예: "openai", "spotify", "tavily").
+        rpm (float | None): 분당 최대 요청 수 (None이면 제한 없음).
+        tpm (float | None): 분당 최대 토큰 수 (None이면 제한 없음).
+        max_retries (int): 재시도 최대 횟수.
+        base_delay (float): 첫 재시도 백오프 상한(초), 재시도마다 2배.
+        max_delay (float): 백오프 상한(초).
+        burst_seconds (float): 버킷 크기 = 이 시간(초) 동안의 예산 (기본 60초 = 분당 예산 전체를 한 번에 사용 가능).
+    """
+
+    WAIT_SAMPLES = 1024  # 백분위 계산에 쓰는 최근 대기 시간 수
+
+    def __init__(
+        self,
+        name: str,
+        rpm: Optional[float] = None,
+        tpm: Optional[float] = None,
+        max_retries: int = 4,
+        base_delay: float = 0.5,
+        max_delay: float = 30.0,
+        burst_seconds: float = 60.0,
+        timer: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+        asleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+        rng: Callable[[], float] = random.random,
+    ):
+        self.name = name
+        self.rpm = rpm
+        self.tpm = tpm
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.burst_seconds = burst_seconds
+        self._timer = timer
+        self._sleep = sleep
+        self._asleep = asleep
+        self._rng = rng
+
+        self._lock = threading.Lock()
+        self._requests = TokenBucket(max(rpm * burst_seconds / 60.0, 1.0), rpm / 60.0, timer) if rpm else None
+        self._tokens = TokenBucket(tpm * burst_seconds / 60.0, tpm / 60.0, timer) if tpm else None
+        self._paused_until = 0.0
+
+        # 지표
+        self._queue_depth = 0
+        self._max_queue_depth = 0
+        self._waits: deque = deque(maxlen=self.WAIT_SAMPLES)
+        self._counters = {"calls": 0, "waited": 0, "wait_time_total": 0.0, "wait_time_max": 0.0, "retries": 0, "failures": 0, "rate_limited": 0}
+
+    # 예산 확보
+    def _reserve(self, tokens: float) -> float:
+        with self._lock:
+            now = self._timer()
+            delay = max(self._paused_until - now, 0.0)
+            if self._requests is not None:
+                delay = max(delay, self._requests.reserve(1, now))
+            if self._tokens is not None and tokens:
+                delay = max(delay, self._tokens.reserve(tokens, now))
+            self._counters["calls"] += 1
+            if delay > 0:
+                self._queue_depth += 1
+                self._max_queue_depth = max(self._max_queue_depth, self._queue_depth)
+            return delay
+
+    def _waited(self, delay: float) -> None:
+        with self._lock:
+            self._waits.append(delay)
+            if delay > 0:
+                self._queue_depth -= 1
+                self._counters["waited"] += 1
+                self._counters["wait_time_total"] += delay
+                self._counters["wait_time_max"] = max(self._counters["wait_time_max"], delay)
+
+    def acquire(self, tokens: float = 0) -> float:
+        """요청 1건(+ 예상 토큰 수)의 예산을 확보할 때까지 대기하고 대기 시간 반환"""
+        delay = self._reserve(tokens)
+        try:
+            if delay > 0:
+                self._sleep(delay)
+        finally:
+            self._waited(delay)
+        return delay
+
+    async def aacquire(self, tokens: float = 0) -> float:
+        delay = self._reserve(tokens)
+        try:
+            if delay > 0:
+                await self._asleep(delay)
+        finally:
+            self._waited(delay)
+        return delay
+
+    def adjust_tokens(self, amount: float) -> None:
+        """호출 후 실제 토큰 수 - 예상 토큰 수를 반영"""
+        if self._tokens is not None and amount:
+            with self._lock:
+                self._tokens.adjust(amount, self._timer())
+
+    def settle(self, estimated: float, usage: Optional[Dict[str, Any]]) -> None:
+        """응답의 usage_metadata(total_tokens)로 acquire 때 차감한 예상 토큰 수를 보정 (사용량이 없으면 예상치 유지)"""
+        if usage and usage.get("total_tokens"):
+            self.adjust_tokens(usage["total_tokens"] - estimated)
+
+    # 재시도
+    def retry_delay(self, attempt: int, exc: BaseException) -> Optional[float]:
+        """
+        attempt번째 실패(0부터) 후 다시 시도하기 전 대기 시간, 재시도하지 않으면 None
+        - 재시도 / 실패 / 429 횟수를 지표에 기록하고, Retry-After가 있으면 이 제공자의 다른 호출도 함께 멈춤
+        - call / acall로 감쌀 수 없는 호출(스트리밍 등)에서 직접 재시도 루프를 만들 때 wait_retry / await_retry와 함께 사용
+        """
+        if attempt >= self.max_retries or not is_retryable(exc):
+            with self._lock:
+                self._counters["failures"] += 1
+            return None
+
+        delay = self._rng() * min(self.max_delay, self.base_delay * 2 ** attempt)
+        retry_after = retry_after_of(exc)
+        with self._lock:
+            self._counters["retries"] += 1
+            if status_code_of(exc) == 429:
+                self._counters["rate_limited"] += 1
+                if retry_after is not None:
+                    # 서버가 알려준 시간 동안은 이 제공자의 모든 호출을 멈춤
+                    self._paused_until = max(self._paused_until, self._timer() + retry_after)
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.max_delay))
+        return delay
+
+    def call(self, fn: Callable[..., T], *args, tokens: float = 0, **kwargs) -> T:
+        """예산 확보 후 fn 호출, 재시도 가능한 오류면 백오프 후 다시 호출"""
+        attempt = 0
+        while True:
+            self.acquire(tokens)
+            try:
+                return fn(*args, **kwargs)
+            except Exception as exc:
+                delay = self.retry_delay(attempt, exc)
+                if delay is None:
+                    raise
+            self.wait_retry(delay)
+            attempt += 1
+
+    def wait_retry(self, delay: float) -> None:
+        """retry_delay가 돌려준 시간만큼 대기"""
+        self._sleep(delay)
+
+    async def await_retry(self, delay: float) -> None:
+        await self._asleep(delay)
+
+    async def acall(self, fn: Callable[..., Awaitable[T]], *args, tokens: float = 0, **kwargs) -> T:
+        attempt = 0
+        while True:
+            await self.aacquire(tokens)
+            try:
+                return await fn(*args, **kwargs)
+            except Exception as exc:
+                delay = self.retry_delay(attempt, exc)
+                if delay is None:
+                    raise
+            await self.await_retry(delay)
+            attempt += 1
+
+    # 지표
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            waits = sorted(self._waits)
+            result = dict(self._counters)
+            result.update(
+                provider=self.name,
+                queue_depth=self._queue_depth,
+                max_queue_depth=self._max_queue_depth,
+                wait_time_p50=waits[len(waits) // 2] if waits else 0.0,
+                wait_time_p95=waits[min(int(len(waits) * 0.95), len(waits) - 1)] if waits else 0.0,
+            )
+        return result
+
+
+# 제공자별 공용 RateLimiter (기본값은 속도 제한 없이 재시도만, configure_rate_limiter로 예산 설정)
+_limiters: Dict[str, RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(provider: str) -> RateLimiter:
+    with _limiters_lock:
+        limiter = _limiters.get(provider)
+        if limiter is None:
+            limiter = _limiters[provider] = RateLimiter(provider)
+        return limiter
+
+
+def configure_rate_limiter(provider: str, **kwargs) -> RateLimiter:
+    """
+    제공자의 공용 RateLimiter를 새 설정으로 교체
+    예) configure_rate_limiter("openai", rpm=500, tpm=200_000), configure_rate_limiter("spotify", rpm=120)
+    """
+    limiter = RateLimiter(provider, **kwargs)
+    with _limiters_lock:
+        _limiters[provider] = limiter
+    return limiter
+
+
+def rate_limiter_metrics() -> Dict[str, Dict[str, Any]]:
+    """모든 제공자의 지표"""
+    with _limiters_lock:
+        limiters = list(_limiters.values())
+    return {limiter.name: limiter.metrics() for limiter in limiters}
+
+
+def _estimate_tokens(input: Any) -> int:
+    if hasattr(input, "to_messages"):  # PromptValue
+        input = input.to_messages()
+    if isinstance(input, str):
+        return max(len(input) // 4, 1)
+    if isinstance(input, (list, tuple)):
+        try:
+            return count_tokens_approximately(input)
+        except Exception:  # 메시지로 변환할 수 없는 입력
+            return 0
+    return 0
+
+
+class RateLimitedLLM(Runnable):
+    """
+    LLM(Runnable)의 모든 호출을 RateLimiter를 거쳐 실행하는 래퍼
+    - invoke / ainvoke: 예상 토큰 수(프롬프트 근사치 + completion_tokens)로 예산 확보 후 호출, 실패 시 재시도
+      응답의 usage_metadata가 있으면 실제 토큰 수로 보정
+    - stream / astream: 첫 청크를 받기 전의 오류만 재시도 (이미 내보낸 청크는 되돌릴 수 없음)
+      청크에 실린 usage_metadata(ChatOpenAI는 stream_usage=True일 때 마지막 청크)를 합쳐 같은 방식으로 보정
+      AgentExecutor는 기본적으로 stream을 사용하므로 create_tool_calling_agent(llm=rate_limited(llm), ...)로 전달
+    - batch: config의 max_concurrency(없으면 DEFAULT_BATCH_CONCURRENCY)개 스레드로 실행
+    - bind_tools / with_structured_output 결과도 같은 RateLimiter를 사용하도록 다시 감쌈
+    - 체인(prompt | llm)에 그대로 넣어 사용 가능
+    - 재시도는 RateLimiter가 담당하므로 감싼 LLM 클라이언트의 자체 재시도는 끄는 것을 권장
+      (예: ChatOpenAI(max_retries=0), 기본값 2를 그대로 두면 실패한 호출 하나가 최대 (4+1)×(2+1)번 전송됨)
+
+    Attributes:
+        llm: 감싼 LLM.
+        limiter (RateLimiter): 사용할 RateLimiter (기본값: 공용 "openai" 제한기).
+        completion_tokens (int): 토큰 예산 확보 시 더하는 예상 출력 토큰 수.
+    """
+
+    DEFAULT_BATCH_CONCURRENCY = 8  # batch에 max_concurrency가 없을 때 동시에 쓰는 최대 스레드 수
+
+    def __init__(self, llm, limiter: Optional[RateLimiter] = None, provider: str = "openai", completion_tokens: int = 256):
+        self.llm = llm
+        self._limiter = limiter
+        self.provider = provider
+        self.completion_tokens = completion_tokens
+
+    @property
+    def limiter(self) -> RateLimiter:
+        # 지정하지 않았으면 호출 시점의 공용 제한기 사용 (configure_rate_limiter 이후 생성된 노드가 아니어도 반영)
+        return self._limiter or get_rate_limiter(self.provider)
+
+    def __getattr__(self, name: str):
+        # 감싼 LLM의 다른 속성(get_num_tokens_from_messages 등)은 그대로 노출
+        if name == "llm":
+            raise AttributeError(name)
+        return getattr(self.llm, name)
+
+    def _wrap(self, llm) -> "RateLimitedLLM":
+        return RateLimitedLLM(llm, limiter=self._limiter, provider=self.provider, completion_tokens=self.completion_tokens)
+
+    def bind_tools(self, *args, **kwargs) -> "RateLimitedLLM":
+        return self._wrap(self.llm.bind_tools(*args, **kwargs))
+
+    def with_structured_output(self, *args, **kwargs) -> "RateLimitedLLM":
+        return self._wrap(self.llm.with_structured_output(*args, **kwargs))
+
+    @staticmethod
+    def _config_args(config) -> tuple:
+        # config가 없으면 넘기지 않음 (config가 없는 호출만 묶는 MicroBatchLLM을 감싼 경우 유지)
+        return (config,) if config is not None else ()
+
+    @staticmethod
+    def _max_concurrency(config) -> Optional[int]:
+        first = config[0] if isinstance(config, list) and config else config
+        return (first or {}).get("max_concurrency")
+
+    def invoke(self, input, config=None, **kwargs):
+        limiter, estimated = self.limiter, _estimate_tokens(input) + self.completion_tokens
+        args = self._config_args(config)
+        output = limiter.call(self.llm.invoke, input, *args, tokens=estimated, **kwargs)
+        limiter.settle(estimated, getattr(output, "usage_metadata", None))
+        return output
+
+    async def ainvoke(self, input, config=None, **kwargs):
+        limiter, estimated = self.limiter, _estimate_tokens(input) + self.completion_tokens
+        args = self._config_args(config)
+        output = await limiter.acall(self.llm.ainvoke, input, *args, tokens=estimated, **kwargs)
+        limiter.settle(estimated, getattr(output, "usage_metadata", None))
+        return output
+
+    def batch(self, inputs: List[Any], config=None, *, return_exceptions: bool = False, **kwargs) -> List[Any]:
+        if not inputs:
+            return []
+        configs = config if isinstance(config, list) else [config] * len(inputs)
+        workers = min(len(inputs), self._max_concurrency(config) or self.DEFAULT_BATCH_CONCURRENCY)
+
+        def run(pair):
+            try:
+                return self.invoke(pair[0], pair[1], **kwargs)
+            except Exception as exc:
+                if not return_exceptions:
+                    raise
+                return exc
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(run, zip(inputs, configs)))
+
+    async def abatch(self, inputs: List[Any], config=None, *, return_exceptions: bool = False, **kwargs) -> List[Any]:
+        configs = config if isinstance(config, list) else [config] * len(inputs)
+        max_concurrency = self._max_concurrency(config)
+        semaphore = asyncio.Semaphore(max_concurrency) if max_concurrency else None
+
+        async def run(input, c):
+            if semaphore is None:
+                return await self.ainvoke(input, c, **kwargs)
+            async with semaphore:
+                return await self.ainvoke(input, c, **kwargs)
+
+        return list(
+            await asyncio.gather(
+                *(run(input, c) for input, c in zip(inputs, configs)),
+                return_exceptions=return_exceptions,
+            )
+        )
+
+    @staticmethod
+    def _add_usage(total: Optional[Dict[str, Any]], chunk: Any) -> Optional[Dict[str, Any]]:
+        """청크들의 usage_metadata 합계 (AIMessageChunk를 더할 때와 같은 방식)"""
+        usage = getattr(chunk, "usage_metadata", None)
+        if not usage:
+            return total
+        if total is None:
+            return dict(usage)
+        return {key: total.get(key, 0) + usage.get(key, 0) for key in ("input_tokens", "output_tokens", "total_tokens")}
+
+    def stream(self, input, config=None, **kwargs):
+        limiter, estimated = self.limiter, _estimate_tokens(input) + self.completion_tokens
+        args = self._config_args(config)
+        attempt = 0
+        while True:
+            limiter.acquire(estimated)
+            started, usage = False, None
+            try:
+                for chunk in self.llm.stream(input, *args, **kwargs):
+                    started = True
+                    usage = self._add_usage(usage, chunk)
+                    yield chunk
+                return
+            except Exception as exc:
+                delay = None if started else limiter.retry_delay(attempt, exc)
+                if delay is None:
+                    raise
+            finally:
+                if started:  # 중간에 실패 / 중단돼도 받은 만큼의 사용량은 반영
+                    limiter.settle(estimated, usage)
+            limiter.wait_retry(delay)
+            attempt += 1
+
+    async def astream(self, input, config=None, **kwargs):
+        limiter, estimated = self.limiter, _estimate_tokens(input) + self.completion_tokens
+        args = self._config_args(config)
+        attempt = 0
+        while True:
+            await limiter.aacquire(estimated)
+            started, usage = False, None
+            try:
+                async for chunk in self.llm.astream(input, *args, **kwargs):
+                    started = True
+                    usage = self._add_usage(usage, chunk)
+                    yield chunk
+                return
+            except Exception as exc:
+                delay = None if started else limiter.retry_delay(attempt, exc)
+                if delay is None:
+                    raise
+            finally:
+                if started:
+                    limiter.settle(estimated, usage)
+            await limiter.await_retry(delay)
+            attempt += 1
+
+
+def rate_limited(llm, provider: str = "openai", limiter: Optional[RateLimiter] = None):
+    """
+    llm을 RateLimitedLLM으로 감싸서 반환 (이미 감싼 경우 / None이면 그대로)
+    - 재시도는 RateLimiter가 하므로 llm은 자체 재시도 없이 만들어 넘길 것 (예: ChatOpenAI(max_retries=0))
+    """
+    if llm is None or isinstance(llm, RateLimitedLLM):
+        return llm
+    return RateLimitedLLM(llm, limiter=limiter, provider=provider)
@@ -0,0 +1,176 @@
+from html import unescape
+from typing import Any, Dict, Iterable, List, Optional
+import re
+
+from pydantic import BaseModel, Field
+
+# 저자 이름 (한글/영문 2~30자, 가운뎃점 / 마침표 / 공백 허용)
+_NAME = r"[가-힣A-Za-z][가-힣A-Za-z.·' ]{0,28}[가-힣A-Za-z.]"
+_DASH = r"[-–—―~]{1,2}"
+_OPEN = r"[“\"「『‘']"
+_CLOSE = r"[”\"」』’']"
+_QUOTE_BODY = r"[^“”\"「」『』]{6,200}?"
+
+_QUOTE_PATTERNS = [
+    # “명언” - 저자 / “명언” (저자)
+    re.compile(rf"{_OPEN}\s*(?P<quote>{_QUOTE_BODY})\s*{_CLOSE}\s*(?:{_DASH}\s*(?P<author>{_NAME})|\(\s*(?P<author2>{_NAME})\s*\))"),
+    # 저자는 “명언”이라고 말했다
+    re.compile(rf"(?P<author>{_NAME})(?:은|는|이|가)\s*{_OPEN}(?P<quote>{_QUOTE_BODY}){_CLOSE}\s*(?:이?라고|고)\s*(?:말|했|남겼)"),
+    # 명언 - 저자 (따옴표 없이 한 줄)
+    re.compile(rf"^(?P<quote>[^-–—―~|]{{10,200}}?)\s+{_DASH}\s*(?P<author>{_NAME})(?:\s*\([^)]*\))?\s*$"),
+]
+# 다음 줄에 따로 적힌 저자 ("- 저자", "― 저자 (설명)")
+_AUTHOR_LINE = re.compile(rf"^{_DASH}\s*(?P<author>{_NAME})(?:\s*[,(].*)?$")
+
+_BLOCK_TAGS = re.compile(r"<\s*(?:br|/p|/div|/li|/h[1-6]|/tr|/blockquote|/section|/article)\s*/?>", re.I)
+_DROP_BLOCKS = re.compile(r"<(script|style|noscript|nav|footer|header|form)\b.*?</\1\s*>", re.I | re.S)
+_TAGS = re.compile(r"<[^>]+>")
+_MD_IMAGES = re.compile(r"!\[[^\]]*\]\([^)]*\)")
+_MD_LINKS = re.compile(r"\[([^\]]*)\]\([^)]*\)")
+_URLS = re.compile(r"https?://\S+")
+_MD_MARKS = re.compile(r"^[#>*\s]+|[*_`]+")
+# 본문이 아닌 줄 (짧은 줄에서만 확인: 메뉴 / 로그인 / 공유 / 쿠키 / 저작권 안내 등)
+_BOILERPLATE = re.compile(
+    r"로그인|회원가입|메뉴|구독|공유|댓글|좋아요|저작권|무단\s*전재|재배포|광고|쿠키|개인정보|이용약관|바로가기|"
+    r"관련\s*(?:기사|글)|이전\s*글|다음\s*글|검색|copyright|©|all rights reserved|cookie|privacy|"
+    r"subscribe|sign in|log in|share|advertisement|menu",
+    re.I,
+)
+_BOILERPLATE_MAX_LEN = 100
+_UNKNOWN_AUTHORS = {"unknown", "anonymous", "작자 미상", "작자미상", "미상", "익명", "출처 미상", "출처미상"}
+_AUTHOR_STOP_ENDINGS = ("다", "요", "고", "며", "서", "면")
+
+
+class QuoteCandidate(BaseModel):
+    """
+    검색 결과 원문에서 뽑은 명언 후보입니다.
+
+    Attributes:
+        quote (str): 명언 문장.
+        author (str): 말한 사람.
+        url (str | None): 명언이 있던 페이지 주소.
+    """
+    quote: str = Field(..., description="명언 문장")
+    author: str = Field(..., description="말한 사람")
+    url: Optional[str] = Field(default=None, description="출처 페이지 주소")
+
+
+def clean_page_text(text: str) -> str:
+    """HTML / 마크다운 원문에서 태그, 링크, 메뉴 / 광고 / 저작권 같은 반복 문구를 걷어낸 본문 줄만 남김"""
+    if not text:
+        return ""
+    text = _DROP_BLOCKS.sub("\n", text)
+    text = _BLOCK_TAGS.sub("\n", text)
+    text = unescape(_TAGS.sub(" ", text))
+    text = _MD_IMAGES.sub("", text)
+    text = _MD_LINKS.sub(r"\1", text)
+    text = _URLS.sub("", text)
+
+    lines, seen = [], set()
+    for line in text.splitlines():
+        line = " ".join(_MD_MARKS.sub("", line).split())
+        if not line or line.count("|") >= 2 or not re.search(r"[0-9A-Za-z가-힣]", line):
+            continue
+        if len(line) < _BOILERPLATE_MAX_LEN and _BOILERPLATE.search(line):
+            continue
+        if line in seen:  # 페이지마다 반복되는 메뉴 / 안내 문구
+            continue
+        seen.add(line)
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def _valid_author(author: str) -> Optional[str]:
+    author = " ".join(author.split()).strip(" .·'")
+    author = re.sub(r"^(?:by|출처\s*:?)\s+", "", author, flags=re.I)
+    if len(author) < 2 or author.lower() in _UNKNOWN_AUTHORS or len(author.split()) > 5:
+        return None
+    # "…라고 말했다"처럼 저자 자리에 문장이 잡힌 경우 제외
+    if re.fullmatch(r"[가-힣 ]+", author) and author.endswith(_AUTHOR_STOP_ENDINGS) and len(author) > 4:
+        return None
+    return author
+
+
+def _valid_quote(quote: str) -> Optional[str]:
+    quote = " ".join(quote.split()).strip(" \"'“”‘’「」『』")
+    if not 6 <= len(quote) <= 200 or len(re.findall(r"[0-9A-Za-z가-힣]", quote)) < 4:
+        return None
+    return quote
+
+
+def extract_quote_candidates(text: str, url: Optional[str] = None) -> List[QuoteCandidate]:
+    """
+    정리된 본문(clean_page_text 결과)에서 "명언 - 저자" 형태의 후보를 찾아 등장 순서대로 반환
+    - “명언” - 저자 / “명언” (저자) / 저자는 “명언”이라고 말했다 / 명언 - 저자 / 명언 줄 + 다음 줄의 "- 저자"
+    - 저자가 없거나 미상(Unknown, 작자 미상 등)인 후보는 제외
+    """
+    candidates = []
+    lines = text.splitlines()
+    for i, line in enumerate(lines):
+        found = False
+        for pattern in _QUOTE_PATTERNS:
+            for match in pattern.finditer(line):
+                groups = match.groupdict()
+                quote = _valid_quote(groups["quote"])
+                author = _valid_author(groups.get("author") or groups.get("author2") or "")
+                if quote and author:
+                    candidates.append(QuoteCandidate(quote=quote, author=author, url=url))
+                    found = True
+            if found:
+                break
+
+        if not found and i + 1 < len(lines):
+            author_match = _AUTHOR_LINE.match(lines[i + 1])
+            if author_match:
+                quote = _valid_quote(line)
+                author = _valid_author(author_match.group("author"))
+                if quote and author:
+                    candidates.append(QuoteCandidate(quote=quote, author=author, url=url))
+    return candidates
+
+
+def _dedupe(candidates: Iterable[QuoteCandidate], limit: int) -> List[QuoteCandidate]:
+    """같은 명언(문장 부호 / 대소문자 무시)은 처음 것만, 요약에 앞부분만 실린 경우 더 긴 문장으로 교체"""
+    unique: List[QuoteCandidate] = []
+    keys: List[str] = []
+    for candidate in candidates:
+        key = re.sub(r"[^0-9a-z가-힣]", "", candidate.quote.lower())
+        for i, seen in enumerate(keys):
+            if seen.startswith(key):
+                break
+            if key.startswith(seen):
+                unique[i], keys[i] = candidate, key
+                break
+        else:
+            if len(unique) >= limit:
+                continue
+            unique.append(candidate)
+            keys.append(key)
+    return unique
+
+
+def digest_search_results(results: Any, max_candidates: int = 8, snippet_chars: int = 200) -> Any:
+    """
+    Tavily 검색 결과를 LLM에 넘기기 좋은 작은 요약으로 변환
+    - 각 페이지 원문(raw_content)과 요약(content)에서 명언 / 저자 후보를 뽑아 검색 순위 → 등장 순서로 최대 max_candidates개
+    - 원문은 버리고 페이지마다 제목 / 주소 / 정리된 요약 앞부분(snippet_chars자)만 남김
+    - 오류 결과({"error": ...}) 등 형식이 다른 값은 그대로 반환
+    """
+    if not isinstance(results, dict) or not isinstance(results.get("results"), list):
+        return results
+
+    candidates, sources = [], []
+    for result in results["results"]:
+        url = result.get("url")
+        content = clean_page_text(result.get("content") or "")
+        raw_content = clean_page_text(result.get("raw_content") or "")
+        candidates.extend(extract_quote_candidates(content, url))
+        candidates.extend(extract_quote_candidates(raw_content, url))
+        sources.append({"title": result.get("title"), "url": url, "snippet": content[:snippet_chars]})
+
+    digest: Dict[str, Any] = {"query": results.get("query")}
+    if results.get("answer"):
+        digest["answer"] = results["answer"]
+    digest["candidates"] = [candidate.model_dump() for candidate in _dedupe(candidates, max_candidates)]
+    digest["sources"] = sources
+    return digest
@@ -0,0 +1,195 @@
+from typing import AsyncIterator, Optional
+import asyncio
+import os
+import time
+import weakref
+
+from .ratelimit import RateLimiter, get_rate_limiter, parse_retry_after
+
+
+SPOTIFY_API_URL = "https://api.spotify.com/v1"
+SPOTIFY_TOKEN_URL = "https://accounts.spotify.com/api/token"
+
+
+class SpotifyAPIError(RuntimeError):
+    """Spotify API 호출 실패 (status_code / retry_after는 RateLimiter의 재시도 판단에 사용)"""
+
+    def __init__(self, message: str, status_code: Optional[int] = None, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+    @classmethod
+    def from_response(cls, prefix: str, response) -> "SpotifyAPIError":
+        return cls(
+            f"{prefix}: {response.status_code} {response.text}",
+            status_code=response.status_code,
+            retry_after=parse_retry_after(response.headers.get("Retry-After")),
+        )
+
+
+class _LoopResources:
+    """이벤트 루프 하나에 묶인 httpx.AsyncClient / Semaphore / Lock"""
+
+    def __init__(self, http, max_concurrency: int):
+        self.http = http
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.token_lock = asyncio.Lock()
+        self.closer: Optional[AsyncIterator[None]] = None
+
+
+async def _close_on_loop_shutdown(http) -> AsyncIterator[None]:
+    """
+    시작해 둔 채로 두면, 루프 종료 시 asyncio.run(shutdown_asyncgens)이 finally를 실행해 http를 닫는 비동기 제너레이터
+    (닫힌 루프의 커넥션은 다른 루프에서 aclose할 수 없으므로 원래 루프가 끝나기 전에 닫음)
+    """
+    try:
+        yield
+    finally:
+        await http.aclose()
+
+
+class AsyncSpotifyClient:
+    """
+    Spotify Web API 비동기 클라이언트 (Client Credentials 인증)
+    - 이벤트 루프마다 keep-alive 커넥션 풀을 가진 httpx.AsyncClient 하나를 재사용
+      (asyncio.run 등으로 루프가 끝날 때 그 루프의 클라이언트도 함께 닫힘, aclose()는 현재 루프의 클라이언트를 닫음)
+    - access token은 만료 직전까지 캐시해 재사용, 동시에 받은 401은 토큰 재발급 한 번으로 처리
+    - 동시에 보내는 요청 수를 max_concurrency로 제한
+    - 요청 속도 제한 / 429·5xx 재시도는 rate_limiter(기본값: 공용 "spotify" 제한기)가 담당
+
+    Attributes:
+        max_concurrency (int): 동시에 진행할 수 있는 최대 요청 수.
+        timeout (float): 요청 1회 타임아웃(초).
+    """
+
+    # 만료 직전 토큰 사용을 피하기 위한 여유 시간(초)
+    TOKEN_EXPIRY_MARGIN = 60
+
+    def __init__(
+        self,
+        client_id: Optional[str] = None,
+        client_secret: Optional[str] = None,
+        api_url: str = SPOTIFY_API_URL,
+        token_url: str = SPOTIFY_TOKEN_URL,
+        max_concurrency: int = 8,
+        timeout: float = 10.0,
+        rate_limiter: Optional[RateLimiter] = None,
+    ):
+        self._client_id = client_id
+        self._client_secret = client_secret
+        self.api_url = api_url.rstrip("/")
+        self.token_url = token_url
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self._rate_limiter = rate_limiter
+
+        self._token: Optional[str] = None
+        self._token_expires_at = 0.0
+
+        # 이벤트 루프마다 새로 만들어야 하는 객체들 (루프가 사라지면 함께 정리)
+        self._resources: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopResources]" = weakref.WeakKeyDictionary()
+
+    def _credentials(self) -> tuple[str, str]:
+        client_id = self._client_id or os.getenv("SPOTIFY_CLIENT_ID")
+        client_secret = self._client_secret or os.getenv("SPOTIFY_CLIENT_SECRET")
+        if not client_id or not client_secret:
+            raise SpotifyAPIError("SPOTIFY_CLIENT_ID / SPOTIFY_CLIENT_SECRET 환경변수를 설정해주세요.")
+        return client_id, client_secret
+
+    async def _loop_resources(self) -> _LoopResources:
+        loop = asyncio.get_running_loop()
+        resources = self._resources.get(loop)
+        if resources is not None:
+            return resources
+
+        import httpx
+
+        resources = _LoopResources(
+            httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.max_concurrency,
+                    max_keepalive_connections=self.max_concurrency,
+                ),
+            ),
+            self.max_concurrency,
+        )
+        resources.closer = _close_on_loop_shutdown(resources.http)
+        await resources.closer.__anext__()
+        self._resources[loop] = resources
+        return resources
+
+    async def _get_token(self, resources: _LoopResources, stale: Optional[str] = None) -> str:
+        """
+        캐시된 토큰 반환, 없거나 만료됐으면 발급
+        - stale: 401을 받은 토큰. 캐시된 토큰이 아직 그 토큰일 때만 재발급 (다른 요청이 이미 갱신했으면 그 토큰 사용)
+        """
+        def cached() -> Optional[str]:
+            if self._token and self._token != stale and time.monotonic() < self._token_expires_at:
+                return self._token
+            return None
+
+        token = cached()
+        if token:
+            return token
+
+        async with resources.token_lock:
+            # 대기하는 동안 다른 요청이 이미 갱신했을 수 있음
+            token = cached()
+            if token:
+                return token
+
+            response = await resources.http.post(
+                self.token_url,
+                data={"grant_type": "client_credentials"},
+                auth=self._credentials(),
+            )
+            if response.status_code != 200:
+                raise SpotifyAPIError.from_response("토큰 발급 실패", response)
+
+            payload = response.json()
+            self._token = payload["access_token"]
+            expires_in = float(payload.get("expires_in", 3600))
+            self._token_expires_at = time.monotonic() + max(expires_in - self.TOKEN_EXPIRY_MARGIN, 0)
+            return self._token
+
+    @property
+    def rate_limiter(self) -> RateLimiter:
+        return self._rate_limiter or get_rate_limiter("spotify")
+
+    async def _get(self, path: str, params: dict) -> dict:
+        return await self.rate_limiter.acall(self._get_once, path, params)
+
+    async def _get_once(self, path: str, params: dict) -> dict:
+        resources = await self._loop_resources()
+
+        async with resources.semaphore:
+            token = await self._get_token(resources)
+            response = await resources.http.get(
+                f"{self.api_url}{path}", params=params, headers={"Authorization": f"Bearer {token}"}
+            )
+
+            # 토큰이 서버 측에서 먼저 만료된 경우 한 번만 재발급 후 재시도
+            if response.status_code == 401:
+                token = await self._get_token(resources, stale=token)
+                response = await resources.http.get(
+                    f"{self.api_url}{path}", params=params, headers={"Authorization": f"Bearer {token}"}
+                )
+
+        if response.status_code != 200:
+            raise SpotifyAPIError.from_response("Spotify API 호출 실패", response)
+        return response.json()
+
+    async def search(self, q: str, type: str = "track", limit: int = 10, offset: int = 0, market: Optional[str] = None) -> dict:
+        """spotipy.Spotify.search와 같은 형태의 결과(dict) 반환"""
+        params = {"q": q, "type": type, "limit": limit, "offset": offset}
+        if market:
+            params["market"] = market
+        return await self._get("/search", params)
+
+    async def aclose(self) -> None:
+        """현재 이벤트 루프의 클라이언트를 닫음 (다른 루프의 클라이언트는 그 루프가 끝날 때 닫힘)"""
+        resources = self._resources.pop(asyncio.get_running_loop(), None)
+        if resources is not None:
+            await resources.closer.aclose()
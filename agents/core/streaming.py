@@ -0,0 +1,121 @@
+from typing import Any, Callable, Iterable, Optional
+
+from langchain_core.messages import BaseMessage, message_chunk_to_message
+from langchain_core.runnables import RunnableConfig
+from langgraph.config import get_config, get_stream_writer
+from pydantic import BaseModel, Field
+
+# config["configurable"]에서 토큰 스트리밍 요청을 나타내는 키
+STREAM_TOKENS_KEY = "stream_tokens"
+
+
+class TokenStreamEvent(BaseModel):
+    """
+    노드가 LLM 응답을 받는 동안 그래프 스트림(stream_mode="custom")으로 내보내는 텍스트 조각입니다.
+
+    Attributes:
+        node (str): 내보낸 노드 이름 (예: "InfoNode", "GenerateDiaryBodyNode").
+        field (str): 조각이 이어 붙을 상태 항목 ("messages" = 대화 응답, "diary_body" = 일기 본문).
+        text (str): 새로 생성된 텍스트.
+    """
+    node: str = Field(..., description="노드 이름")
+    field: str = Field(..., description="상태 항목")
+    text: str = Field(..., description="새로 생성된 텍스트")
+
+
+def token_stream_config(config: Optional[RunnableConfig] = None) -> RunnableConfig:
+    """
+    노드가 LLM 응답을 토큰 단위로 내보내도록 요청하는 config 반환 (stream_mode="custom"과 함께 사용)
+
+    예)
+        graph.stream(inputs, token_stream_config({"configurable": {"thread_id": "1"}}), stream_mode=["custom", "values"])
+    """
+    config = dict(config or {})
+    config["configurable"] = {**config.get("configurable", {}), STREAM_TOKENS_KEY: True}
+    return config
+
+
+def current_stream_writer() -> Optional[Callable[[Any], None]]:
+    """
+    token_stream_config로 토큰 스트리밍을 요청한 그래프 실행이면 LangGraph stream writer, 아니면 None
+    - LangGraph는 stream_mode="custom"이 없어도 아무 일도 하지 않는 writer를 돌려주므로,
+      요청이 없는 invoke / ainvoke는 그대로 한 번에 호출 (응답의 usage_metadata 유지)
+    """
+    try:
+        if not get_config().get("configurable", {}).get(STREAM_TOKENS_KEY):
+            return None
+        return get_stream_writer()
+    except (RuntimeError, KeyError):
+        return None
+
+
+def _chat_model_of(runnable) -> Any:
+    """RateLimitedLLM / bind 결과 등 래퍼를 벗겨낸 실제 채팅 모델"""
+    for _ in range(8):
+        inner = getattr(runnable, "bound", None) or getattr(runnable, "llm", None)
+        if inner is None:
+            return runnable
+        runnable = inner
+    return runnable
+
+
+def with_stream_usage(llm):
+    """
+    스트리밍 응답에도 usage_metadata가 실리도록 stream_usage=True를 묶은 llm 반환
+    (ChatOpenAI처럼 stream_usage 옵션이 있는 모델만, 없으면 그대로)
+    - 마지막 조각의 사용량이 합쳐진 메시지에 남아 노드 토큰 측정 / RateLimiter 토큰 예산 보정에 반영됨
+    """
+    model = _chat_model_of(llm)
+    if "stream_usage" not in getattr(type(model), "model_fields", {}):
+        return llm
+    return llm.bind(stream_usage=True)
+
+
+class _MessageAccumulator:
+    """
+    스트리밍 조각을 하나의 메시지로 합치면서 사용자에게 보낼 텍스트만 writer로 전달
+    - 도구 호출 조각(DiaryEntry / suggest_keywords_tool 등)이 보이면 그 턴은 도구 호출로 보고 이후 텍스트를 보내지 않음
+    """
+
+    def __init__(self, writer: Callable[[Any], None], node: str, field: str):
+        self.writer = writer
+        self.node = node
+        self.field = field
+        self.message = None
+        self.tool_call = False
+
+    def add(self, chunk: BaseMessage) -> None:
+        self.message = chunk if self.message is None else self.message + chunk
+        if getattr(chunk, "tool_call_chunks", None) or getattr(chunk, "tool_calls", None):
+            self.tool_call = True
+        if self.tool_call:
+            return
+        text = chunk.text()
+        if text:
+            self.writer(TokenStreamEvent(node=self.node, field=self.field, text=text))
+
+    def result(self) -> BaseMessage:
+        if self.message is None:
+            raise ValueError(f"{self.node}: LLM 스트림이 비어 있습니다.")
+        return message_chunk_to_message(self.message)
+
+
+def stream_message(runnable, input, writer: Callable[[Any], None], node: str, field: str, config=None) -> BaseMessage:
+    """
+    runnable(LLM 또는 prompt | LLM 체인)을 스트리밍으로 호출하며 텍스트 조각을 writer로 내보내고,
+    invoke와 같은 최종 메시지(도구 호출 포함)를 반환
+    """
+    accumulator = _MessageAccumulator(writer, node, field)
+    chunks: Iterable = runnable.stream(input, config) if config is not None else runnable.stream(input)
+    for chunk in chunks:
+        accumulator.add(chunk)
+    return accumulator.result()
+
+
+async def astream_message(runnable, input, writer: Callable[[Any], None], node: str, field: str, config=None) -> BaseMessage:
+    """stream_message의 비동기 버전"""
+    accumulator = _MessageAccumulator(writer, node, field)
+    chunks = runnable.astream(input, config) if config is not None else runnable.astream(input)
+    async for chunk in chunks:
+        accumulator.add(chunk)
+    return accumulator.result()
@@ -0,0 +1,16 @@
+from typing import List
+import re
+
+# 한글/영문/숫자 어절
+TOKEN_PATTERN = re.compile(r"[0-9A-Za-z가-힣]+")
+
+
+def char_ngrams(text: str) -> List[str]:
+    """어절 단위로 나눈 뒤 글자 2-gram 생성 (형태소 분석기 없이 한국어 활용형을 맞추기 위함)"""
+    grams = []
+    for token in TOKEN_PATTERN.findall(text.lower()):
+        if len(token) == 1:
+            grams.append(token)
+        else:
+            grams.extend(token[i:i + 2] for i in range(len(token) - 1))
+    return grams
@@ -1,17 +1,19 @@
 from typing import List
-from langchain.tools import tool
+from langchain_core.tools import tool
 from .models import CoreEmotionType, emotion_keyword_map, SpotifyToolInput
+from .cache import TTLCache
+from .ratelimit import get_rate_limiter
+from .search_digest import digest_search_results
+from .spotify import AsyncSpotifyClient
 
+from functools import lru_cache
 import os
-import spotipy
-from spotipy.oauth2 import SpotifyClientCredentials
+import threading
 from typing import Type
-from pydantic import BaseModel
-from langchain.tools import BaseTool
+from pydantic import BaseModel, Field
+from langchain_core.tools import BaseTool
 import random
 
-from langchain_tavily import TavilySearch
-
 # Diary
 @tool
 def suggest_keywords_tool(core_emotion: CoreEmotionType) -> List[str]:
@@ -26,12 +28,53 @@ def suggest_keywords_tool(core_emotion: CoreEmotionType) -> List[str]:
 
 
 # SecretFriend
-# Spotify API 인증 설정
-sp = spotipy.Spotify(
-    client_credentials_manager=SpotifyClientCredentials(
-        client_id=os.getenv("SPOTIFY_CLIENT_ID"), client_secret=os.getenv("SPOTIFY_CLIENT_SECRET")
-    )
-)
+# Spotify 클라이언트는 처음 사용할 때 생성 (import 시점에는 spotipy 로드/인증 설정을 하지 않음)
+_sp = None
+_async_sp = None
+_client_lock = threading.Lock()
+
+
+def get_spotify_client():
+    """동기 실행(_run)용 spotipy 클라이언트 반환"""
+    global _sp
+    with _client_lock:
+        if _sp is None:
+            import spotipy
+            from spotipy.oauth2 import SpotifyClientCredentials
+
+            # Spotify API 인증 설정
+            _sp = spotipy.Spotify(
+                client_credentials_manager=SpotifyClientCredentials(
+                    client_id=os.getenv("SPOTIFY_CLIENT_ID"), client_secret=os.getenv("SPOTIFY_CLIENT_SECRET")
+                )
+            )
+    return _sp
+
+
+def get_async_spotify_client() -> AsyncSpotifyClient:
+    """비동기 실행(_arun)용 Spotify 클라이언트 반환 (커넥션 풀 + 토큰 캐시)"""
+    global _async_sp
+    with _client_lock:
+        if _async_sp is None:
+            _async_sp = AsyncSpotifyClient()
+    return _async_sp
+
+
+# 키워드별 후보 곡 캐시 (Spotify 검색 1페이지 = 최대 50곡)
+SPOTIFY_SEARCH_LIMIT = 50
+spotify_track_cache = TTLCache(maxsize=512, ttl=60 * 60 * 6)
+
+
+def _normalize_keyword(keyword: str) -> str:
+    return " ".join(keyword.lower().split())
+
+
+def _to_candidate(track: dict) -> dict:
+    return {
+        "title": track.get("name"),
+        "artist": (track.get("artists") or [{}])[0].get("name"),
+        "url": track.get("external_urls", {}).get("spotify"),
+    }
 
 
 class SpotifyTool(BaseTool):
@@ -39,6 +82,7 @@ class SpotifyTool(BaseTool):
     Spotify Music Recommender
     - Input: diary를 args_schema로 직접 받음
     - Output: 일기에서 추출한 키워드를 기반으로 Spotify 검색 API 사용해 단 하나의 곡 추천
+    - 키워드별 후보 곡 목록(최대 50곡)을 캐시에 보관하고, 곡은 로컬에서 무작위로 선택
     """
     name: str = "spotify_recommender_tool"
     description: str = (
@@ -46,6 +90,43 @@ class SpotifyTool(BaseTool):
         "Spotify 검색 API를 활용해 단 하나의 곡을 추천합니다."
     )
     args_schema: Type[BaseModel] = SpotifyToolInput
+    cache: TTLCache = Field(default_factory=lambda: spotify_track_cache, exclude=True)
+    async_client: AsyncSpotifyClient = Field(default_factory=get_async_spotify_client, exclude=True)
+
+    def _store_candidates(self, key: str, results: dict) -> List[dict]:
+        items = results.get("tracks", {}).get("items", [])
+        candidates = [_to_candidate(track) for track in items if track]
+        self.cache.set(key, candidates)
+        return candidates
+
+    def search_candidates(self, keyword: str) -> List[dict]:
+        """키워드의 후보 곡 목록 반환 (캐시 미스일 때만 Spotify 검색)"""
+        key = _normalize_keyword(keyword)
+        candidates = self.cache.get(key)
+        if candidates is None:
+            results = get_rate_limiter("spotify").call(
+                get_spotify_client().search, q=keyword, type="track", limit=SPOTIFY_SEARCH_LIMIT, offset=0, market="KR"
+            )
+            candidates = self._store_candidates(key, results)
+        return candidates
+
+    async def asearch_candidates(self, keyword: str) -> List[dict]:
+        """search_candidates의 비동기 버전"""
+        key = _normalize_keyword(keyword)
+        candidates = self.cache.get(key)
+        if candidates is None:
+            results = await self.async_client.search(
+                q=keyword, type="track", limit=SPOTIFY_SEARCH_LIMIT, offset=0, market="KR"
+            )
+            candidates = self._store_candidates(key, results)
+        return candidates
+
+    def _format_result(self, keyword: str, candidates: List[dict]) -> str:
+        if candidates:
+            track = random.choice(candidates)  # 후보 중 무작위 선택으로 다양한 곡 추천
+            return f"""제목은 [{track['title']}], 가수는 [{track['artist']}], url은 [{track['url']}] 입니다."""
+
+        return f"'{keyword}' 키워드에 맞는 추천 곡을 찾지 못했습니다."
     
     def _run(self, diary: str, keyword: str) -> str:
         diary_body = diary.strip()
@@ -56,33 +137,92 @@ class SpotifyTool(BaseTool):
         if not keyword:
             return "keyword를 다시 생성해 입력해주세요."
 
-        query = f"{keyword}"
-        offset = random.randint(0, 50)  # 오프셋을 랜덤으로 설정하여 다양한 곡 추천
-        results = sp.search(q=query, type="track", limit=1, offset=offset, market="KR")
-        items = results.get("tracks", {}).get("items", [])
-        if items:
-            track = items[0]
-            title = track.get("name")
-            artist_name = track.get("artists", [{}])[0].get("name")
-            url = track.get("external_urls", {}).get("spotify")
-            return f"""제목은 [{title}], 가수는 [{artist_name}], url은 [{url}] 입니다."""
+        return self._format_result(keyword, self.search_candidates(keyword))
 
-        return f"'{keyword}' 키워드에 맞는 추천 곡을 찾지 못했습니다."
+    async def _arun(self, diary: str, keyword: str) -> str:
+        diary_body = diary.strip()
+        if not diary_body:
+            return "일기 본문을 입력해주세요."
 
-    def _arun(self):
-        raise NotImplementedError("Spotify Music Recommender does not support ")
+        keyword = keyword.strip()
+        if not keyword:
+            return "keyword를 다시 생성해 입력해주세요."
 
+        return self._format_result(keyword, await self.asearch_candidates(keyword))
 
-def create_web_search_tool():
-    # 웹 검색 도구 생성
-    tavily_tool = TavilySearch(
-                    max_results=3,             # 최대 답변 수
-                    include_answer=True,       # 원본 쿼리에 대한 짧은 답변 포함
-                    include_raw_content=True   # HTML 원본 내용 포함
-                )
-    
-    tavily_tool.description = (
-        "일기 내용을 기반으로 사용자를 위로하거나 격려할 수 있는 명언을 검색합니다. "
-        "사용자가 제공한 일기 텍스트에 적합한 명언과 간단한 해설을 최대 3건 반환합니다."
+
+@lru_cache(maxsize=None)
+def _rate_limited_tavily_wrapper():
+    """공용 "tavily" RateLimiter를 거쳐 검색하는 TavilySearchAPIWrapper (langchain_tavily는 처음 사용할 때 import)"""
+    from langchain_tavily.tavily_search import TavilySearchAPIWrapper
+
+    class RateLimitedTavilySearchAPIWrapper(TavilySearchAPIWrapper):
+        def raw_results(self, *args, **kwargs):
+            return get_rate_limiter("tavily").call(super().raw_results, *args, **kwargs)
+
+        async def raw_results_async(self, *args, **kwargs):
+            return await get_rate_limiter("tavily").acall(super().raw_results_async, *args, **kwargs)
+
+    return RateLimitedTavilySearchAPIWrapper
+
+
+@lru_cache(maxsize=None)
+def _digesting_tavily_search():
+    """검색 결과 원문을 명언 후보 목록으로 줄여서 반환하는 TavilySearch (langchain_tavily는 처음 사용할 때 import)"""
+    from langchain_tavily import TavilySearch
+
+    class DigestingTavilySearch(TavilySearch):
+        max_candidates: int = 8
+
+        def _run(self, *args, **kwargs):
+            return digest_search_results(super()._run(*args, **kwargs), max_candidates=self.max_candidates)
+
+        async def _arun(self, *args, **kwargs):
+            return digest_search_results(await super()._arun(*args, **kwargs), max_candidates=self.max_candidates)
+
+    return DigestingTavilySearch
+
+
+def create_web_search_tool(
+    api_base_url: str | None = None,
+    digest: bool = True,
+    max_candidates: int = 8,
+    tavily_api_key: str | None = None,
+):
+    """
+    명언 검색용 Tavily 도구 생성
+
+    Args:
+        api_base_url: Tavily API 주소 (테스트용 로컬 서버 등, None이면 기본 주소).
+        digest: True면 페이지 원문(raw_content)은 도구 안에서만 읽고, 명언 / 저자 후보와 짧은 요약만 에이전트에 전달
+            (False면 기존처럼 원문까지 그대로 전달).
+        max_candidates: digest=True일 때 전달할 최대 명언 후보 수.
+        tavily_api_key: Tavily API 키 (None이면 환경 변수 TAVILY_API_KEY 사용).
+    """
+    wrapper_kwargs = {}
+    if api_base_url:
+        wrapper_kwargs["api_base_url"] = api_base_url
+    if tavily_api_key:
+        wrapper_kwargs["tavily_api_key"] = tavily_api_key
+    tool_kwargs = dict(
+        max_results=3,             # 최대 답변 수
+        include_answer=True,       # 원본 쿼리에 대한 짧은 답변 포함
+        include_raw_content=True,  # 페이지 원문 포함 (digest=True면 후보 추출에만 사용)
+        api_wrapper=_rate_limited_tavily_wrapper()(**wrapper_kwargs),
     )
-    return tavily_tool
\ No newline at end of file
+
+    # 웹 검색 도구 생성
+    if digest:
+        tavily_tool = _digesting_tavily_search()(max_candidates=max_candidates, **tool_kwargs)
+        tavily_tool.description = (
+            "일기 내용을 기반으로 사용자를 위로하거나 격려할 수 있는 명언을 검색합니다. "
+            "검색된 페이지에서 뽑은 명언 / 저자 후보(candidates)와 페이지 요약(sources)을 반환합니다."
+        )
+    else:
+        from langchain_tavily import TavilySearch
+        tavily_tool = TavilySearch(**tool_kwargs)
+        tavily_tool.description = (
+            "일기 내용을 기반으로 사용자를 위로하거나 격려할 수 있는 명언을 검색합니다. "
+            "사용자가 제공한 일기 텍스트에 적합한 명언과 간단한 해설을 최대 3건 반환합니다."
+        )
+    return tavily_tool
@@ -1,19 +1,42 @@
-# diary_nodes에서 export할 클래스들
-from .diary_nodes import (
-    InfoNode,
-    SuggestKeywordsNode,
-    CreateEntryNode,
-    GenerateDiaryBodyNode,
-    GenerateEmotionChartsNode,
-    GenerateDiaryNode,
-    RouterNode,
-)
-
-from .prompts import (
-    get_diary_system_prompt,
-    get_summary_prompt,
-    get_body_prompt,
-)
+# diary 패키지: 일기 작성 노드 / 프롬프트
+from importlib import import_module
+
+# export 이름 → 실제로 정의된 모듈 (지연 import)
+_EXPORTS = {
+    # Nodes
+    "InfoNode": ".diary_nodes",
+    "SuggestKeywordsNode": ".diary_nodes",
+    "CreateEntryNode": ".diary_nodes",
+    "GenerateDiaryBodyNode": ".diary_nodes",
+    "GenerateEmotionChartsNode": ".diary_nodes",
+    "GenerateDiaryNode": ".diary_nodes",
+    "RouterNode": ".diary_nodes",
+    "EntryRouterNode": ".diary_nodes",
+    "CommandNode": ".diary_nodes",
+    "SaveDiaryNode": ".diary_nodes",
+    # Context
+    "InfoContextManager": ".context",
+    # Graph
+    "build_main_workflow": ".graph",
+    "build_main_graph": ".graph",
+    # Charts
+    "EmotionChartRenderer": ".charts",
+    "ChartArtifactStore": ".chart_store",
+    "InMemoryChartStore": ".chart_store",
+    "get_chart_process_pool": ".chart_store",
+    # Store
+    "DiaryStore": ".store",
+    # Stats
+    "EmotionStats": ".stats",
+    "UserEmotionStats": ".stats",
+    # Memory
+    "DiaryMemoryIndex": ".memory_index",
+    "MemoryRecord": ".memory_index",
+    # Prompts
+    "get_diary_system_prompt": ".prompts",
+    "get_summary_prompt": ".prompts",
+    "get_body_prompt": ".prompts",
+}
 
 __all__ = [
     # Nodes
@@ -24,9 +47,50 @@ __all__ = [
     "GenerateEmotionChartsNode",
     "GenerateDiaryNode",
     "RouterNode",
-    
+    "EntryRouterNode",
+    "CommandNode",
+    "SaveDiaryNode",
+
+    # Context
+    "InfoContextManager",
+
+    # Graph
+    "build_main_workflow",
+    "build_main_graph",
+
+    # Charts
+    "EmotionChartRenderer",
+    "ChartArtifactStore",
+    "InMemoryChartStore",
+    "get_chart_process_pool",
+
+    # Store
+    "DiaryStore",
+
+    # Stats
+    "EmotionStats",
+    "UserEmotionStats",
+
+    # Memory
+    "DiaryMemoryIndex",
+    "MemoryRecord",
+
     # Prompts
     "get_diary_system_prompt",
     "get_summary_prompt",
     "get_body_prompt",
-]
\ No newline at end of file
+]
+
+
+def __getattr__(name: str):
+    # 처음 접근할 때 해당 모듈을 import (import 시점 비용/부작용 최소화)
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
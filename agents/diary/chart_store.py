@@ -0,0 +1,262 @@
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Optional, Union
+import base64
+import hashlib
+import io
+import json
+import multiprocessing
+import os
+import re
+import tempfile
+import threading
+import time
+
+from agents.core.cache import TTLCache
+
+# 렌더링 결과가 달라지는 변경(스타일 등)이 생기면 올려서 이전 캐시를 무효화
+CHART_STYLE_VERSION = 1
+
+CHART_FORMATS = {
+    "png": "image/png",
+    "svg": "image/svg+xml",
+}
+
+# ChartArtifactStore가 만든 파일 이름({kind}_{hash}.{format})만 정리 대상
+# (같은 폴더의 다른 파일, 예: 저장소에 커밋된 emotion_charts/*.png는 건드리지 않음)
+_ARTIFACT_NAME = re.compile(r"[a-z]+_[0-9a-f]{32}\.(?:%s)" % "|".join(CHART_FORMATS))
+# get_or_render의 임시 파일 (렌더링 중 워커가 죽으면 남음)
+_TEMP_NAME = re.compile(r"tmp[^.]+\.(?:%s)\.tmp" % "|".join(CHART_FORMATS))
+# 이보다 오래된 임시 파일은 버려진 것으로 보고 정리 (렌더링은 길어야 몇 초)
+STALE_TEMP_AGE = 60 * 60
+# 마지막 정리 시각을 기록하는 파일 (mtime) → 프로세스 풀 워커 / 여러 프로세스가 정리 간격을 공유
+CLEANUP_MARKER = ".last_cleanup"
+
+
+def chart_key(kind: str, data: dict, format: str = "png") -> str:
+    """차트 입력값(종류, 데이터, 포맷)의 해시 → 같은 입력이면 같은 키"""
+    payload = {
+        "version": CHART_STYLE_VERSION,
+        "kind": kind,
+        "format": format,
+        "emotion_counts": list(data["emotion_counts"].items()),
+        "time_labels": data["time_labels"],
+        "emotion_indices": data["emotion_indices"],
+        "emotion_scores": data["emotion_scores"],
+    }
+    encoded = json.dumps(payload, ensure_ascii=False, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()[:32]
+
+
+def to_data_uri(content: bytes, format: str = "png") -> str:
+    """Markdown/HTML에 바로 넣을 수 있는 data URI로 변환"""
+    return f"data:{CHART_FORMATS[format]};base64,{base64.b64encode(content).decode('ascii')}"
+
+
+def _check_format(format: str) -> None:
+    if format not in CHART_FORMATS:
+        raise ValueError(f"지원하지 않는 차트 포맷입니다: {format} (가능한 값: {', '.join(CHART_FORMATS)})")
+
+
+class ChartArtifactStore:
+    """
+    차트 입력 해시를 파일명으로 쓰는 파일 저장소 (content-addressed)
+    - 같은 입력의 차트가 이미 있으면 렌더링을 건너뛰고 기존 파일 경로 반환
+    - max_age / max_bytes를 지정한 경우에만 오래된 파일 / 전체 용량 초과분을 오래된 순으로 정리
+    - 버려진 임시 파일(STALE_TEMP_AGE 경과)은 정책과 관계없이 정리
+    - 기본값은 만료 없음: SaveDiaryNode / DiaryStore가 저장하는 일기의 emotion_*_chart_url은
+      이 저장소의 파일 경로이므로, 정리를 켜면 오래된 일기의 차트 링크가 끊어질 수 있음
+      (저장된 일기와 함께 쓰는 저장소에서는 정리를 켜지 않거나, 지워져도 되는 별도 폴더에서만 사용)
+
+    Attributes:
+        root (Path): 차트 파일을 저장할 폴더 (처음 저장할 때 생성).
+        max_age (float | None): 파일 보관 기간(초), None이면 기간 제한 없음 (기본값).
+        max_bytes (int | None): 폴더 전체 최대 용량(바이트), None이면 용량 제한 없음 (기본값).
+        cleanup_interval (float): 자동 정리 최소 간격(초), 폴더의 CLEANUP_MARKER 파일로 프로세스 간에도 공유.
+    """
+
+    def __init__(
+        self,
+        root: Union[str, Path],
+        max_age: Optional[float] = None,
+        max_bytes: Optional[int] = None,
+        cleanup_interval: float = 300.0,
+    ):
+        self.root = Path(root)
+        self.max_age = max_age
+        self.max_bytes = max_bytes
+        self.cleanup_interval = cleanup_interval
+        self._last_cleanup = 0.0
+        self._cleanup_lock = threading.Lock()
+
+    def __getstate__(self):
+        # 프로세스 풀로 넘길 수 있도록 Lock은 제외
+        state = self.__dict__.copy()
+        del state["_cleanup_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._cleanup_lock = threading.Lock()
+
+    def path_for(self, kind: str, key: str, format: str = "png") -> Path:
+        return self.root / f"{kind}_{key}.{format}"
+
+    def get_or_render(self, kind: str, data: dict, renderer, format: str = "png") -> Path:
+        """캐시된 차트 파일 경로 반환, 없으면 렌더링 후 저장"""
+        _check_format(format)
+        path = self.path_for(kind, chart_key(kind, data, format), format)
+
+        try:
+            os.utime(path)  # 최근 사용 시각 갱신 (정리 시 오래된 순서 기준)
+            return path
+        except FileNotFoundError:
+            pass  # 없거나 정리(cleanup)로 방금 지워진 경우 → 다시 렌더링
+
+        self.root.mkdir(parents=True, exist_ok=True)
+        # 임시 파일에 쓴 뒤 교체해 동시에 같은 차트를 만들어도 깨진 파일이 보이지 않도록 함
+        fd, tmp_path = tempfile.mkstemp(dir=self.root, prefix="tmp", suffix=f".{format}.tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                renderer.render(kind, data, f, format=format)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        self._maybe_cleanup()
+        return path
+
+    def _maybe_cleanup(self) -> None:
+        if time.monotonic() - self._last_cleanup < self.cleanup_interval:
+            return
+        # 프로세스 풀 워커는 매번 저장소 사본(_last_cleanup=0.0)을 받으므로 마커 파일 시각으로 판단
+        try:
+            elapsed = time.time() - (self.root / CLEANUP_MARKER).stat().st_mtime
+        except FileNotFoundError:
+            elapsed = None
+        if elapsed is not None and elapsed < self.cleanup_interval:
+            self._last_cleanup = time.monotonic() - max(elapsed, 0.0)
+            return
+        self.cleanup()
+
+    def cleanup(self) -> int:
+        """
+        보관 기간/용량 정책에 따라 오래된 차트 파일 삭제, 삭제한 파일 수 반환
+        - 이 저장소가 만든 이름({kind}_{hash}.{format})의 파일만 대상, 용량 계산도 이 파일들 기준
+        - STALE_TEMP_AGE보다 오래된 임시 파일도 함께 삭제
+        """
+        if not self._cleanup_lock.acquire(blocking=False):
+            return 0
+        try:
+            self._last_cleanup = time.monotonic()
+            if not self.root.exists():
+                return 0
+            (self.root / CLEANUP_MARKER).touch()
+
+            has_policy = self.max_age is not None or self.max_bytes is not None
+            now = time.time()
+            files, stale_temps = [], []
+            for path in self.root.iterdir():
+                is_temp = _TEMP_NAME.fullmatch(path.name) is not None
+                if not (is_temp or (has_policy and _ARTIFACT_NAME.fullmatch(path.name))):
+                    continue
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    continue
+                if is_temp:
+                    if now - stat.st_mtime > STALE_TEMP_AGE:
+                        stale_temps.append(path)
+                elif path.is_file():
+                    files.append((stat.st_mtime, stat.st_size, path))
+            files.sort()  # 오래된 파일부터
+
+            removed = 0
+            for path in stale_temps:
+                try:
+                    path.unlink()
+                    removed += 1
+                except FileNotFoundError:
+                    pass
+
+            total = sum(size for _, size, _ in files)
+            for mtime, size, path in files:
+                expired = self.max_age is not None and now - mtime > self.max_age
+                over_budget = self.max_bytes is not None and total > self.max_bytes
+                if not (expired or over_budget):
+                    continue
+                try:
+                    path.unlink()
+                except FileNotFoundError:
+                    pass
+                total -= size
+                removed += 1
+            return removed
+        finally:
+            self._cleanup_lock.release()
+
+
+class InMemoryChartStore:
+    """
+    차트를 파일 대신 bytes로 보관하는 저장소 (PNG/SVG)
+    - 같은 입력의 차트는 메모리 캐시에서 재사용
+
+    Attributes:
+        maxsize (int): 캐시할 최대 차트 수.
+        ttl (float): 캐시 유효 시간(초).
+    """
+
+    def __init__(self, maxsize: int = 256, ttl: float = 60 * 60):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    def get_or_render(self, kind: str, data: dict, renderer, format: str = "png") -> bytes:
+        _check_format(format)
+        key = (kind, chart_key(kind, data, format))
+        content = self._cache.get(key)
+        if content is None:
+            buffer = io.BytesIO()
+            renderer.render(kind, data, buffer, format=format)
+            content = buffer.getvalue()
+            self._cache.set(key, content)
+        return content
+
+
+def render_chart_locations(store, renderer, data: dict, format: str = "png") -> list:
+    """
+    차트 3종(pie, flow, score)을 저장소를 통해 만들고 위치 목록 반환
+    - 파일 저장소면 파일 경로, 메모리 저장소면 data URI
+    - renderer가 None이면 프로세스 공용 렌더러 사용 (프로세스 풀 워커에서도 템플릿 재사용)
+    - 모듈 최상위 함수라 ProcessPoolExecutor에서도 실행 가능
+    """
+    if renderer is None:
+        from .charts import default_renderer
+        renderer = default_renderer
+
+    locations = []
+    for kind in ("pie", "flow", "score"):
+        artifact = store.get_or_render(kind, data, renderer, format=format)
+        locations.append(to_data_uri(artifact, format) if isinstance(artifact, bytes) else str(artifact))
+    return locations
+
+
+# 차트 렌더링용 공용 프로세스 풀 (build_main_workflow의 기본값)
+CHART_POOL_WORKERS = 2
+_chart_pool: Optional[ProcessPoolExecutor] = None
+_chart_pool_lock = threading.Lock()
+
+
+def get_chart_process_pool() -> ProcessPoolExecutor:
+    """
+    차트 렌더링용 공용 ProcessPoolExecutor (처음 사용할 때 생성, 워커는 첫 작업 때 시작)
+    - spawn 방식: 그래프 실행 중인 부모 프로세스의 스레드 / 락 상태를 물려받지 않음
+    - 워커마다 처음 한 번 matplotlib import 비용이 있지만, 본문 생성과 동시에 실행되므로 대부분 가려짐
+    """
+    global _chart_pool
+    with _chart_pool_lock:
+        if _chart_pool is None:
+            _chart_pool = ProcessPoolExecutor(
+                max_workers=CHART_POOL_WORKERS, mp_context=multiprocessing.get_context("spawn")
+            )
+        return _chart_pool
@@ -0,0 +1,218 @@
+from collections import Counter
+from functools import lru_cache
+from typing import BinaryIO, List, Optional, Union
+import os
+import platform
+import threading
+
+from agents.core.models import DiaryEntry
+
+emotion_to_index = {
+    "분노": 0,
+    "슬픔": 1,
+    "두려움": 2,
+    "불쾌함": 3,
+    "평범함": 4,
+    "놀라움": 5,
+    "설렘": 6,
+    "기쁨": 7,
+}
+
+emotion_colors = {
+    "기쁨": "#FFD700",
+    "설렘": "#FFB6C1",
+    "평범함": "#C0C0C0",
+    "놀라움": "#87CEFA",
+    "불쾌함": "#8B0000",
+    "두려움": "#292B2E",
+    "슬픔": "#4682B4",
+    "분노": "#FF4500",
+}
+
+CHART_KINDS = ("pie", "flow", "score")
+
+
+@lru_cache(maxsize=1)
+def resolve_korean_font() -> Optional[str]:
+    """
+    OS별 한글 폰트 family 이름을 한 번만 찾아 캐시
+    - 찾지 못하면 None (matplotlib 기본 폰트 사용)
+    """
+    from matplotlib import font_manager as fm
+
+    current_os = platform.system()
+    if current_os == "Windows":
+        font_path = "C:/Windows/Fonts/malgun.ttf"
+        if os.path.exists(font_path):
+            fm.fontManager.addfont(font_path)
+            return fm.FontProperties(fname=font_path).get_name()
+        candidates = ["Malgun Gothic"]
+    elif current_os == "Darwin":
+        candidates = ["AppleGothic"]
+    else:
+        candidates = ["NanumGothic", "Noto Sans CJK KR", "Noto Sans KR"]
+
+    for family in candidates:
+        try:
+            fm.findfont(fm.FontProperties(family=family), fallback_to_default=False)
+            return family
+        except ValueError:
+            continue
+
+    print("한글 폰트를 찾을 수 없습니다. 시스템 기본 폰트를 사용합니다.")
+    return None
+
+
+def prepare_chart_data(entries: List[DiaryEntry]) -> dict:
+    """차트 3종에 필요한 값을 시간순으로 정리"""
+    sorted_entries = sorted(entries, key=lambda e: e.time_period)
+    emotion_counts = Counter(e.core_emotion for e in entries)
+    return {
+        "emotion_counts": emotion_counts,
+        "time_labels": [e.time_period.strftime("%H:%M") for e in sorted_entries],
+        "emotion_indices": [emotion_to_index[e.core_emotion] for e in sorted_entries],
+        "emotion_scores": [e.emotion_score for e in sorted_entries],
+    }
+
+
+class _ChartTemplate:
+    """한 종류의 차트를 위한 Figure/Axes/Agg 캔버스 (스레드마다 하나씩 만들어 재사용)"""
+
+    def __init__(self, figsize: tuple, dpi: int, family: Optional[str]):
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+
+        self.family = family
+        self.figure = Figure(figsize=figsize, dpi=dpi)
+        self.canvas = FigureCanvasAgg(self.figure)
+        self.ax = self.figure.add_subplot()
+
+    def text_kwargs(self, **kwargs) -> dict:
+        if self.family:
+            kwargs["fontfamily"] = self.family
+        return kwargs
+
+    def clear_data(self) -> None:
+        """제목/축 라벨은 남기고 이전 렌더링의 데이터 아티스트만 제거"""
+        for artist in list(self.ax.patches) + list(self.ax.lines) + list(self.ax.collections) + list(self.ax.texts):
+            artist.remove()
+
+    def apply_tick_font(self) -> None:
+        if self.family:
+            for label in self.ax.get_xticklabels() + self.ax.get_yticklabels():
+                label.set_fontfamily(self.family)
+
+    def save(self, fp: Union[str, os.PathLike, BinaryIO], format: str = "png") -> None:
+        self.figure.savefig(fp, format=format)
+
+
+class EmotionChartRenderer:
+    """
+    감정 차트 렌더러 (pyplot 전역 상태를 쓰지 않는 객체지향 방식)
+    - Figure + Agg 캔버스를 직접 사용하고 rcParams를 건드리지 않음
+    - 한글 폰트는 프로세스당 한 번만 찾음 (resolve_korean_font)
+    - pie/flow/score 차트 템플릿(제목, 축 라벨, 여백)을 스레드별로 한 번 만들어 재사용
+    - 스레드마다 별도의 Figure를 쓰므로 여러 스레드에서 동시에 호출해도 안전
+
+    Attributes:
+        dpi (int): 출력 해상도.
+    """
+
+    def __init__(self, dpi: int = 100):
+        self.dpi = dpi
+        self._local = threading.local()
+
+    def __getstate__(self):
+        # 스레드별 템플릿은 프로세스 간에 넘기지 않음 (받는 쪽에서 새로 생성)
+        return {"dpi": self.dpi}
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    def _template(self, kind: str) -> _ChartTemplate:
+        templates = getattr(self._local, "templates", None)
+        if templates is None:
+            templates = self._local.templates = {}
+
+        template = templates.get(kind)
+        if template is None:
+            template = templates[kind] = getattr(self, f"_build_{kind}_template")()
+        return template
+
+    # 템플릿 (처음 한 번만 생성)
+    def _build_pie_template(self) -> _ChartTemplate:
+        template = _ChartTemplate((6, 6), self.dpi, resolve_korean_font())
+        template.ax.set_title("감정 비율", **template.text_kwargs(fontsize=14, fontweight="bold"))
+        template.figure.subplots_adjust(left=0.05, right=0.95, bottom=0.05, top=0.92)
+        return template
+
+    def _build_line_template(self, ylabel: str, title: str) -> _ChartTemplate:
+        template = _ChartTemplate((8, 4), self.dpi, resolve_korean_font())
+        ax = template.ax
+        ax.set_xlabel("시간", **template.text_kwargs(fontsize=11))
+        ax.set_ylabel(ylabel, **template.text_kwargs(fontsize=11))
+        ax.set_title(title, **template.text_kwargs(fontsize=14, fontweight="bold"))
+        ax.grid(True, linestyle="--", alpha=0.5)
+        template.figure.subplots_adjust(left=0.12, right=0.97, bottom=0.15, top=0.88)
+        return template
+
+    def _build_flow_template(self) -> _ChartTemplate:
+        template = self._build_line_template("감정", "시간 흐름에 따른 감정 변화")
+        template.ax.set_yticks(list(emotion_to_index.values()), list(emotion_to_index.keys()))
+        template.ax.set_ylim(-0.5, len(emotion_to_index) - 0.5)
+        template.apply_tick_font()
+        return template
+
+    def _build_score_template(self) -> _ChartTemplate:
+        template = self._build_line_template("감정 점수 (0~100)", "시간 흐름에 따른 감정 점수")
+        template.ax.set_ylim(0, 100)
+        template.apply_tick_font()
+        return template
+
+    # 렌더링
+    def render_pie(self, data: dict, fp, format: str = "png") -> None:
+        """감정 비율 원형 차트"""
+        template = self._template("pie")
+        template.clear_data()
+
+        emotion_counts = data["emotion_counts"]
+        template.ax.pie(
+            list(emotion_counts.values()),
+            labels=list(emotion_counts.keys()),
+            colors=[emotion_colors[e] for e in emotion_counts.keys()],
+            autopct="%1.1f%%",
+            startangle=140,
+            textprops=template.text_kwargs(fontsize=12),
+        )
+        template.save(fp, format=format)
+
+    def _render_line(self, kind: str, values: list, line_color: str, fill_color: str, data: dict, fp, format: str) -> None:
+        template = self._template(kind)
+        template.clear_data()
+
+        ax = template.ax
+        # 문자열 x축(category)은 Axes를 재사용하면 범주가 누적되므로 위치 인덱스 + 라벨로 표시
+        xs = list(range(len(values)))
+        ax.plot(xs, values, marker="o", color=line_color, linewidth=2)
+        ax.fill_between(xs, values, color=fill_color, alpha=0.3)
+        ax.set_xticks(xs, data["time_labels"])
+        ax.set_xlim(-0.5, max(len(xs) - 0.5, 0.5))
+        template.apply_tick_font()
+        template.save(fp, format=format)
+
+    def render_flow(self, data: dict, fp, format: str = "png") -> None:
+        """감정 흐름 선형 그래프"""
+        self._render_line("flow", data["emotion_indices"], "#4169E1", "#ADD8E6", data, fp, format)
+
+    def render_score(self, data: dict, fp, format: str = "png") -> None:
+        """감정 점수 꺾은선 그래프"""
+        self._render_line("score", data["emotion_scores"], "#32CD32", "#98FB98", data, fp, format)
+
+    def render(self, kind: str, data: dict, fp, format: str = "png") -> None:
+        if kind not in CHART_KINDS:
+            raise ValueError(f"지원하지 않는 차트 종류입니다: {kind} (가능한 값: {', '.join(CHART_KINDS)})")
+        getattr(self, f"render_{kind}")(data, fp, format=format)
+
+
+# 프로세스 공용 렌더러
+default_renderer = EmotionChartRenderer()
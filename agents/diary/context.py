@@ -0,0 +1,139 @@
+from typing import Callable, List, Optional, Sequence
+
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage, ToolMessage
+from langchain_core.messages.utils import count_tokens_approximately
+
+from agents.core.models import DiaryEntry
+
+
+def _is_entry_commit(message: BaseMessage, entry_call_ids: set) -> bool:
+    """CreateEntryNode가 DiaryEntry 도구 호출에 응답한 ToolMessage인지 확인"""
+    return isinstance(message, ToolMessage) and message.tool_call_id in entry_call_ids
+
+
+def _shorten(text: str, limit: int) -> str:
+    text = " ".join(str(text).split())
+    return text if len(text) <= limit else text[: limit - 1] + "…"
+
+
+class InfoContextManager:
+    """
+    InfoNode 프롬프트에 넣을 대화 맥락을 일정 크기로 유지
+    - 이미 DiaryEntry로 기록된 사건의 대화는 entries 요약 한 블록으로 대체
+    - 진행 중인 사건의 대화는 최근 max_turns 턴만 그대로 두고, 그 이전 턴은 질문/답변만 요약 블록에 보관
+    - 전체 토큰 수가 max_tokens를 넘으면 오래된 턴부터 요약 블록으로 옮기고, 그래도 넘으면 요약을 줄임
+    - 턴은 HumanMessage 기준으로 나누므로 도구 호출(AIMessage)과 ToolMessage 쌍이 분리되지 않음
+
+    Attributes:
+        max_turns (int): 그대로 유지할 최근 턴 수.
+        max_tokens (int): 시스템 프롬프트를 포함한 전체 프롬프트 토큰 예산.
+        max_summary_chars (int): 요약 블록에 남길 질문/답변 1건당 최대 글자 수.
+    """
+
+    def __init__(
+        self,
+        max_turns: int = 6,
+        max_tokens: int = 4000,
+        max_summary_chars: int = 120,
+        token_counter: Optional[Callable[[Sequence[BaseMessage]], int]] = None,
+    ):
+        self.max_turns = max_turns
+        self.max_tokens = max_tokens
+        self.max_summary_chars = max_summary_chars
+        # 기본값은 글자 수 기반 근사치 (정확한 값이 필요하면 llm.get_num_tokens_from_messages 전달)
+        self.token_counter = token_counter or count_tokens_approximately
+
+    def _split(self, messages: List[BaseMessage]) -> tuple[List[BaseMessage], List[BaseMessage]]:
+        """(기록 완료된 사건의 대화, 진행 중인 대화)로 분리"""
+        entry_call_ids = {
+            call["id"]
+            for message in messages
+            if isinstance(message, AIMessage)
+            for call in (message.tool_calls or [])
+            if call.get("name") == "DiaryEntry"
+        }
+        boundary = 0
+        for index, message in enumerate(messages):
+            if _is_entry_commit(message, entry_call_ids):
+                boundary = index + 1
+        return messages[:boundary], messages[boundary:]
+
+    @staticmethod
+    def _split_turns(messages: List[BaseMessage]) -> List[List[BaseMessage]]:
+        turns: List[List[BaseMessage]] = []
+        for message in messages:
+            if isinstance(message, HumanMessage) or not turns:
+                turns.append([])
+            turns[-1].append(message)
+        return turns
+
+    def _entries_block(self, entries: List[DiaryEntry]) -> List[str]:
+        lines = []
+        for entry in sorted(entries, key=lambda e: e.time_period):
+            lines.append(
+                f"- {entry.time_period.strftime('%H:%M')} {entry.event_title} "
+                f"({entry.core_emotion}: {', '.join(entry.emotion_keywords)}, {entry.emotion_score}점) "
+                f"{_shorten(entry.summary, self.max_summary_chars)}"
+            )
+        return lines
+
+    def _folded_block(self, turns: List[List[BaseMessage]]) -> List[str]:
+        """접힌 턴에서 (직전 질문, 사용자 답변) 쌍만 짧게 남김"""
+        lines, question = [], ""
+        for message in (message for turn in turns for message in turn):
+            if isinstance(message, AIMessage) and str(message.content).strip():
+                question = _shorten(message.content, self.max_summary_chars)
+            elif isinstance(message, HumanMessage) and str(message.content).strip():
+                answer = _shorten(message.content, self.max_summary_chars)
+                lines.append(f"- Q: {question} / A: {answer}" if question else f"- A: {answer}")
+                question = ""
+        return lines
+
+    def _summary_message(self, entry_lines: List[str], folded_lines: List[str]) -> Optional[SystemMessage]:
+        sections = []
+        if entry_lines:
+            sections.append(
+                "[이미 기록이 끝난 사건 - 다시 묻지 말 것]\n" + "\n".join(entry_lines)
+            )
+        if folded_lines:
+            sections.append(
+                "[현재 사건에 대해 앞서 나눈 질문/답변 요약]\n" + "\n".join(folded_lines)
+            )
+        if not sections:
+            return None
+        return SystemMessage(content="\n\n".join(sections))
+
+    def build(
+        self,
+        system_message: SystemMessage,
+        messages: List[BaseMessage],
+        entries: Optional[List[DiaryEntry]] = None,
+    ) -> List[BaseMessage]:
+        """시스템 프롬프트 + 요약 블록 + 최근 대화로 구성된 프롬프트 반환"""
+        _, active = self._split(list(messages))
+        entry_lines = self._entries_block(entries or [])
+
+        turns = self._split_turns(active)
+        split_at = max(len(turns) - self.max_turns, 0)
+
+        def assemble(split_at: int, folded_limit: Optional[int] = None) -> List[BaseMessage]:
+            folded_lines = self._folded_block(turns[:split_at])
+            if folded_limit is not None:
+                folded_lines = folded_lines[len(folded_lines) - folded_limit:] if folded_limit else []
+            summary = self._summary_message(entry_lines, folded_lines)
+            recent = [message for turn in turns[split_at:] for message in turn]
+            return [system_message] + ([summary] if summary else []) + recent
+
+        prompt = assemble(split_at)
+        # 예산 초과 시 가장 오래된 턴부터 요약으로 이동 (마지막 턴은 항상 유지)
+        while self.token_counter(prompt) > self.max_tokens and split_at < len(turns) - 1:
+            split_at += 1
+            prompt = assemble(split_at)
+
+        # 그래도 넘으면 요약 블록의 오래된 질문/답변부터 제거
+        folded_count = len(self._folded_block(turns[:split_at]))
+        while self.token_counter(prompt) > self.max_tokens and folded_count > 0:
+            folded_count -= 1
+            prompt = assemble(split_at, folded_limit=folded_count)
+
+        return prompt
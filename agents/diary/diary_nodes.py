@@ -1,75 +1,145 @@
-from abc import ABC, abstractmethod
-from collections import Counter
+import asyncio
 from datetime import time
 from typing import List
 from pathlib import Path
-import os
-import platform
-import uuid
 
-import matplotlib.font_manager as fm
-import matplotlib.pyplot as plt
 from langchain_core.messages import SystemMessage, BaseMessage, ToolMessage, HumanMessage, AIMessage
-from langgraph.graph import END
-
-from agents.core import *
+from langchain_core.runnables import RunnableLambda, RunnableParallel
+from langgraph.constants import END
+
+from agents.core.models import DiaryEntry, DiaryRecord
+from agents.core.nodes import BaseNode
+from agents.core.ratelimit import rate_limited
+from agents.core.states import State
+from agents.core.streaming import astream_message, current_stream_writer, stream_message, with_stream_usage
+from agents.core.tools import suggest_keywords_tool
 from .prompts import *
 
 
-class BaseNode(ABC):
-    def __init__(self, **kwargs):
-        self.name = "BaseNode"
-        self.verbose = False
-        if "verbose" in kwargs:
-            self.verbose = kwargs["verbose"]
-
-    @abstractmethod
-    def execute(self, state: State) -> State:
-        pass
-
-    def logging(self, method_name, **kwargs):
-        if self.verbose:
-            print(f"[{self.name}] {method_name}")
-            for key, value in kwargs.items():
-                print(f"{key}: {value}")
-
-    def __call__(self, state: State):
-        return self.execute(state)
-
-
 class InfoNode(BaseNode):
-    def __init__(self, llm_with_tool, **kwargs):
+    """
+    - 사용자와 대화하며 일기 정보를 수집
+    - context_manager(InfoContextManager)가 주어지면 전체 대화 대신 요약 + 최근 턴만 프롬프트에 사용
+    - memory_index(DiaryMemoryIndex)가 주어지면 마지막 사용자 메시지와 관련된 과거 일기 기억을
+      시스템 프롬프트 바로 뒤에 덧붙임 (오늘 이전 일기만, 관련도가 낮으면 생략)
+    - stream_tokens=True이고 실행 config가 토큰 스트리밍을 요청하면(token_stream_config + stream_mode="custom")
+      응답을 스트리밍으로 받아 TokenStreamEvent(field="messages")로 내보냄, 도구 호출 턴은 텍스트로 내보내지 않음
+    """
+    MIN_RECALL_QUERY = 4  # 이보다 짧은 답변("응", "좋아")으로는 과거 일기를 찾지 않음
+
+    def __init__(
+        self,
+        llm_with_tool,
+        context_manager=None,
+        memory_index=None,
+        memory_k: int = 2,
+        stream_tokens: bool = True,
+        **kwargs,
+    ):
         super().__init__(**kwargs)
         self.name = "InfoNode"
-        self.llm = llm_with_tool
+        self.llm = rate_limited(llm_with_tool)
+        self.streaming_llm = with_stream_usage(self.llm)
+        self.context_manager = context_manager
+        self.memory_index = memory_index
+        self.memory_k = memory_k
+        self.stream_tokens = stream_tokens
+
+    def _recall(self, state: State) -> SystemMessage | None:
+        if self.memory_index is None:
+            return None
+        query = next((m.content for m in reversed(state["messages"]) if isinstance(m, HumanMessage)), "")
+        if not isinstance(query, str) or len(query.strip()) < self.MIN_RECALL_QUERY:
+            return None
+
+        hits = self.memory_index.search(
+            query, k=self.memory_k, before=state.get("today_date"), user_name=state.get("user_name")
+        )
+        if not hits:
+            return None
+        lines = [
+            f"- {memory.diary_date.isoformat()} {memory.title + ': ' if memory.title else ''}{memory.text}"
+            for _, memory in hits
+        ]
+        self.logging("_recall", query=query, hits=lines)
+        return SystemMessage(
+            content="[과거 일기에서 관련된 기억 (자연스럽게 이어질 때만 가볍게 언급하고, 없는 내용은 지어내지 마)]\n"
+            + "\n".join(lines)
+        )
 
-    def _build_prompt(self, messages: List[BaseMessage]) -> List[BaseMessage]:
-        return [SystemMessage(content=get_diary_system_prompt())] + messages
+    def _build_prompt(self, state: State) -> List[BaseMessage]:
+        system_message = SystemMessage(content=get_diary_system_prompt())
+        if self.context_manager is not None:
+            prompt = self.context_manager.build(system_message, state["messages"], state.get("entries", []))
+        else:
+            prompt = [system_message] + state["messages"]
+
+        memory = self._recall(state)
+        if memory is not None:
+            prompt = prompt[:1] + [memory] + prompt[1:]
+        return prompt
 
     def execute(self, state: State) -> State:
-        final_messages = self._build_prompt(state["messages"])
-        response = self.llm.invoke(final_messages)
+        final_messages = self._build_prompt(state)
+        writer = current_stream_writer() if self.stream_tokens else None
+        if writer is not None:
+            response = stream_message(self.streaming_llm, final_messages, writer, self.name, "messages")
+        else:
+            response = self.llm.invoke(final_messages)
+
+        return {"messages": [response]}
+
+    async def aexecute(self, state: State) -> State:
+        final_messages = self._build_prompt(state)
+        writer = current_stream_writer() if self.stream_tokens else None
+        if writer is not None:
+            response = await astream_message(self.streaming_llm, final_messages, writer, self.name, "messages")
+        else:
+            response = await self.llm.ainvoke(final_messages)
 
         return {"messages": [response]}
 
 
 class SuggestKeywordsNode(BaseNode):
-    def __init__(self, **kwargs):
+    """
+    suggest_keywords_tool 호출 처리
+    - direct_reply=True: 키워드 목록을 AIMessage로 바로 사용자에게 보여주고 다음 입력을 기다림
+      (모델이 <RAW> 내용을 그대로 다시 말하게 하는 LLM 호출 1회를 생략)
+    - direct_reply=False: 기존처럼 <RAW> ToolMessage만 남기고 info 노드에서 모델이 전달
+    """
+
+    def __init__(self, direct_reply: bool = True, **kwargs):
         super().__init__(**kwargs)
         self.name = "SuggestKeywordsNode"
         self.tool = suggest_keywords_tool
+        self.direct_reply = direct_reply
+
+    @staticmethod
+    def format_keywords(result: List[str]) -> str:
+        return f"추천된 감정 키워드는 다음과 같아: \n[{', '.join(result)}] \n이 중에서 1~3개를 골라줘."
+
+    def _build_messages(self, tool_call: dict, result: List[str]) -> List[BaseMessage]:
+        text = self.format_keywords(result)
+        if not self.direct_reply:
+            return [ToolMessage(content=f"<RAW>{text}</RAW>", tool_call_id=tool_call["id"])]
+
+        # 도구 호출에는 ToolMessage로 응답하고, 사용자에게 보일 턴은 AIMessage로 바로 추가
+        return [
+            ToolMessage(content=f"사용자에게 감정 키워드 목록을 보여줬어: [{', '.join(result)}]", tool_call_id=tool_call["id"]),
+            AIMessage(content=text),
+        ]
 
     def execute(self, state: State) -> State:
         tool_call = state["messages"][-1].tool_calls[0]
         result = self.tool.invoke(tool_call["args"])
-        
-        # ToolMessage 생성
-        tool_msg = ToolMessage(
-            content=f"<RAW>추천된 감정 키워드는 다음과 같아: \n[{', '.join(result)}] \n이 중에서 1~3개를 골라줘.</RAW>",
-            tool_call_id=tool_call["id"],
-        )
 
-        return State(messages=[tool_msg])
+        return State(messages=self._build_messages(tool_call, result))
+
+    async def aexecute(self, state: State) -> State:
+        tool_call = state["messages"][-1].tool_calls[0]
+        result = await self.tool.ainvoke(tool_call["args"])
+
+        return State(messages=self._build_messages(tool_call, result))
 
 
 class CreateEntryNode(BaseNode):
@@ -98,165 +168,163 @@ class CreateEntryNode(BaseNode):
 class GenerateDiaryBodyNode(BaseNode):
     """
     - state['entries']를 시간순으로 정렬해 요약(one_liner)과 줄글 본문(diary_body)을 생성
+    - 두 체인은 같은 entries만 읽으므로 동시에 실행 (대기 시간 ≈ 더 느린 쪽 한 번)
     - entries가 없으면 안내 메시지를 채우고 그대로 반환
+    - timeout: 비동기 실행 시 두 호출에 공통으로 적용되는 마감 시간(초), None이면 제한 없음
+    - stream_tokens=True이고 실행 config가 토큰 스트리밍을 요청하면 본문을 스트리밍으로 받아
+      TokenStreamEvent(field="diary_body")로 내보냄 (한줄 요약은 짧으므로 그대로 한 번에 생성)
     """
-    def __init__(self, llm, **kwargs):
+    def __init__(self, llm, timeout: float | None = None, stream_tokens: bool = True, **kwargs):
         super().__init__(**kwargs)
         self.name = "GenerateDiaryBodyNode"
-        self.llm = llm
+        self.llm = rate_limited(llm)
+        self.timeout = timeout
+        self.stream_tokens = stream_tokens
 
         # 프롬프트 템플릿 준비
         self.summary_prompt = get_summary_prompt()
         self.body_prompt = get_body_prompt()
 
+        self.summary_chain = self.summary_prompt | self.llm
+        self.body_chain = self.body_prompt | self.llm
+        self.streaming_body_chain = self.body_prompt | with_stream_usage(self.llm)
+
+        # 한줄 요약 + 줄글 본문을 병렬 실행하는 체인
+        self.parallel_chain = RunnableParallel(
+            one_liner=self.summary_chain,
+            diary_body=self.body_chain,
+        )
+        # 본문만 스트리밍하는 버전 (병렬 실행 스레드에서도 그래프 stream writer 사용 가능)
+        self.streaming_parallel_chain = RunnableParallel(
+            one_liner=self.summary_chain,
+            diary_body=RunnableLambda(self._stream_body),
+        )
+
+    def _stream_body(self, inputs: dict):
+        writer = current_stream_writer()
+        if writer is None:
+            return self.body_chain.invoke(inputs)
+        return stream_message(self.streaming_body_chain, inputs, writer, self.name, "diary_body")
+
+    def _empty_result(self) -> State:
+        return State(
+            one_liner="기록된 사건이 없습니다.",
+            diary_body="오늘의 일기를 작성할 수 없습니다.",
+        )
+
     def execute(self, state: State) -> State:
         entries: list[DiaryEntry] = state.get("entries", [])
 
         if not entries:
-            return State(
-                one_liner="기록된 사건이 없습니다.",
-                diary_body="오늘의 일기를 작성할 수 없습니다.",
-            )
+            return self._empty_result()
 
         # 시간순 정렬 (원본 로직 유지)
         sorted_entries = sorted(entries, key=lambda e: e.time_period)
 
-        # 한줄 요약 생성 (원본 로직 유지)
-        summary_chain = self.summary_prompt | self.llm
-        one_liner_msg = summary_chain.invoke({"entries": sorted_entries})
+        # 한줄 요약 / 줄글 본문 동시 생성
+        streaming = self.stream_tokens and current_stream_writer() is not None
+        chain = self.streaming_parallel_chain if streaming else self.parallel_chain
+        result = chain.invoke({"entries": sorted_entries})
 
-        # 줄글 본문 생성 (원본 로직 유지)
-        body_chain = self.body_prompt | self.llm
-        diary_body_msg = body_chain.invoke({"entries": sorted_entries})
+        return State(
+            one_liner=result["one_liner"].content,
+            diary_body=result["diary_body"].content,
+        )
+
+    async def aexecute(self, state: State) -> State:
+        entries: list[DiaryEntry] = state.get("entries", [])
+
+        if not entries:
+            return self._empty_result()
+
+        sorted_entries = sorted(entries, key=lambda e: e.time_period)
+        inputs = {"entries": sorted_entries}
+        writer = current_stream_writer() if self.stream_tokens else None
+        if writer is not None:
+            body_call = astream_message(self.streaming_body_chain, inputs, writer, self.name, "diary_body")
+        else:
+            body_call = self.body_chain.ainvoke(inputs)
+
+        # 두 호출을 동시에 시작하고 하나의 마감 시간을 공유
+        one_liner_msg, diary_body_msg = await asyncio.wait_for(
+            asyncio.gather(
+                self.summary_chain.ainvoke(inputs),
+                body_call,
+            ),
+            timeout=self.timeout,
+        )
 
         return State(
             one_liner=one_liner_msg.content,
             diary_body=diary_body_msg.content,
         )
-        
+
 
 # 그래프 이미지 저장 폴더 (Django 연동 시 MEDIA_ROOT 등으로 대체 가능)
 # CHART_OUTPUT_DIR = "./emotion_charts"
 # 현재 파일 기준 project_root 절대경로
 BASE_DIR = Path(__file__).resolve().parents[2]   # diary_nodes → diary → agents → project_root
 
-CHART_OUTPUT_DIR = BASE_DIR / "emotion_charts"
-CHART_OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
-
-emotion_to_index = {
-    "분노": 0,
-    "슬픔": 1,
-    "두려움": 2,
-    "불쾌함": 3,
-    "평범함": 4,
-    "놀라움": 5,
-    "설렘": 6,
-    "기쁨": 7,
-}
-
-emotion_colors = {
-    "기쁨": "#FFD700",
-    "설렘": "#FFB6C1",
-    "평범함": "#C0C0C0",
-    "놀라움": "#87CEFA",
-    "불쾌함": "#8B0000",
-    "두려움": "#292B2E",
-    "슬픔": "#4682B4",
-    "분노": "#FF4500",
-}
+CHART_OUTPUT_DIR = BASE_DIR / "emotion_charts"  # 첫 차트 생성 시 폴더 생성
 
 class GenerateEmotionChartsNode(BaseNode):
-    def __init__(self, **kwargs):
+    """
+    - 감정 비율 / 감정 흐름 / 감정 점수 차트 3종을 만들고 위치를 state에 기록
+    - 렌더링은 EmotionChartRenderer가 담당 (pyplot 전역 상태 미사용, 스레드 안전)
+    - store: 차트 저장소 (기본값: CHART_OUTPUT_DIR의 ChartArtifactStore)
+        - ChartArtifactStore: 입력 해시로 파일을 저장/재사용하고 파일 경로를 기록
+        - InMemoryChartStore: 파일 없이 bytes로 렌더링해 data URI를 기록 (Markdown에 바로 삽입 가능)
+    - format: "png" 또는 "svg"
+    - executor: 렌더링을 맡길 concurrent.futures Executor (예: ProcessPoolExecutor)
+        - 지정하지 않으면 execute는 현재 스레드, aexecute는 기본 스레드 풀에서 렌더링
+        - 프로세스 풀에서는 InMemoryChartStore의 캐시가 공유되지 않으므로 ChartArtifactStore 권장
+    """
+    def __init__(self, renderer=None, store=None, format: str = "png", executor=None, **kwargs):
         super().__init__(**kwargs)
         self.name = "GenerateEmotionChartsNode"
+        self.renderer = renderer
+        self.store = store
+        self.format = format
+        self.executor = executor
 
-    def execute(self, state: State) -> State:
-        entries = state["entries"]
+    def _get_store(self):
+        if self.store is None:
+            from .chart_store import ChartArtifactStore
+            self.store = ChartArtifactStore(CHART_OUTPUT_DIR)
+        return self.store
+
+    def _render_args(self, state: State) -> tuple:
+        from .charts import prepare_chart_data
 
         # 데이터 준비
-        emotion_counts = Counter(e.core_emotion for e in entries)
-        sorted_entries = sorted(entries, key=lambda e: e.time_period)
-        time_labels = [e.time_period.strftime("%H:%M") for e in sorted_entries]
-        emotion_names = [e.core_emotion for e in sorted_entries]
-        emotion_indices = [emotion_to_index[e] for e in emotion_names]
-        emotion_scores = [e.emotion_score for e in sorted_entries]
-
-        # 파일명 (UUID로 충돌 방지)
-        today_str = state["today_date"].strftime("%Y%m%d")
-        pie_filename = f"pie_{today_str}_{uuid.uuid4().hex}.png"
-        flow_filename = f"flow_{today_str}_{uuid.uuid4().hex}.png"
-        score_filename = f"score_{today_str}_{uuid.uuid4().hex}.png"
-
-        pie_path = os.path.join(CHART_OUTPUT_DIR, pie_filename)
-        flow_path = os.path.join(CHART_OUTPUT_DIR, flow_filename)
-        score_path = os.path.join(CHART_OUTPUT_DIR, score_filename)
-
-        # 한글 폰트 설정 (OS별)
-        current_os = platform.system()
-        if current_os == "Windows":
-            font_path = "C:/Windows/Fonts/malgun.ttf"
-            fontprop = fm.FontProperties(fname=font_path, size=12)
-            plt.rc("font", family=fontprop.get_name())
-        elif current_os == "Darwin":
-            plt.rcParams["font.family"] = "AppleGothic"
-        else:
-            try:
-                plt.rcParams["font.family"] = "NanumGothic"
-            except:
-                print("한글 폰트를 찾을 수 없습니다. 시스템 기본 폰트를 사용합니다.")
-
-        # 마이너스 폰트 깨짐 방지
-        plt.rcParams["axes.unicode_minus"] = False
-
-        # 감정 비율 원형 차트
-        plt.figure(figsize=(6, 6))
-        colors = [emotion_colors[e] for e in emotion_counts.keys()]
-        plt.pie(
-            emotion_counts.values(),
-            labels=emotion_counts.keys(),
-            colors=colors,
-            autopct="%1.1f%%",
-            startangle=140,
-            textprops={"fontsize": 12},
-        )
-        plt.title("감정 비율", fontsize=14, fontweight="bold")
-        plt.tight_layout()
-        plt.savefig(pie_path)
-        plt.close()
-
-        # 감정 흐름 선형 그래프
-        plt.figure(figsize=(8, 4))
-        _line_colors = [emotion_colors[e] for e in emotion_names]  # (원본 변수 유지용, 실제 사용 X)
-        plt.plot(time_labels, emotion_indices, marker="o", color="#4169E1", linewidth=2)
-        plt.fill_between(time_labels, emotion_indices, color="#ADD8E6", alpha=0.3)
-        plt.yticks(list(emotion_to_index.values()), list(emotion_to_index.keys()))
-        plt.xlabel("시간", fontsize=11)
-        plt.ylabel("감정", fontsize=11)
-        plt.title("시간 흐름에 따른 감정 변화", fontsize=14, fontweight="bold")
-        plt.grid(True, linestyle="--", alpha=0.5)
-        plt.tight_layout()
-        plt.savefig(flow_path)
-        plt.close()
-
-        # 감정 점수 꺾은선 그래프
-        plt.figure(figsize=(8, 4))
-        plt.plot(time_labels, emotion_scores, marker="o", color="#32CD32", linewidth=2)
-        plt.fill_between(time_labels, emotion_scores, color="#98FB98", alpha=0.3)
-        plt.ylim(0, 100)
-        plt.xlabel("시간", fontsize=11)
-        plt.ylabel("감정 점수 (0~100)", fontsize=11)
-        plt.title("시간 흐름에 따른 감정 점수", fontsize=14, fontweight="bold")
-        plt.grid(True, linestyle="--", alpha=0.5)
-        plt.tight_layout()
-        plt.savefig(score_path)
-        plt.close()
+        data = prepare_chart_data(state["entries"])
+        # renderer가 None이면 렌더링하는 쪽(스레드/프로세스)의 공용 렌더러 사용
+        return self._get_store(), self.renderer, data, self.format
 
+    def _to_state(self, locations: list) -> State:
+        pie, flow, score = locations
         return State(
-            emotion_pie_chart_url=pie_path,
-            emotion_timeline_chart_url=flow_path,
-            emotion_score_chart_url=score_path,
+            emotion_pie_chart_url=pie,
+            emotion_timeline_chart_url=flow,
+            emotion_score_chart_url=score,
         )
 
+    def execute(self, state: State) -> State:
+        from .chart_store import render_chart_locations
+
+        args = self._render_args(state)
+        if self.executor is not None:
+            return self._to_state(self.executor.submit(render_chart_locations, *args).result())
+        return self._to_state(render_chart_locations(*args))
+
+    async def aexecute(self, state: State) -> State:
+        from .chart_store import render_chart_locations
+
+        # 차트 렌더링은 CPU 작업이므로 이벤트 루프 밖(스레드/프로세스 풀)에서 실행
+        loop = asyncio.get_running_loop()
+        locations = await loop.run_in_executor(self.executor, render_chart_locations, *self._render_args(state))
+        return self._to_state(locations)
+
 
 class GenerateDiaryNode(BaseNode):
     def __init__(self, **kwargs):
@@ -342,6 +410,134 @@ class GenerateDiaryNode(BaseNode):
 
 
 
+class SaveDiaryNode(BaseNode):
+    """
+    완성된 일기(사건 목록, 한 줄, 본문, 차트 위치)를 DiaryStore에 저장
+    - 같은 날짜를 다시 생성하면 덮어씀
+    - stats가 주어지면 그날 통계 행도 함께 갱신
+      (UserEmotionStats = 저장한 사용자의 통계만, user_name이 지정된 EmotionStats = 그 사용자의 일기일 때만)
+    - memory_index(DiaryMemoryIndex)가 주어지면 다음 대화부터 검색되도록 그날 일기를 색인
+    """
+    def __init__(self, store, stats=None, memory_index=None, **kwargs):
+        super().__init__(**kwargs)
+        self.name = "SaveDiaryNode"
+        self.store = store
+        self.stats = stats
+        self.memory_index = memory_index
+        self.per_user_stats = False
+        if stats is not None:
+            from .stats import UserEmotionStats
+            self.per_user_stats = isinstance(stats, UserEmotionStats)
+            if not self.per_user_stats and stats.user_name is None:
+                # 날짜별 행 하나에 여러 사용자가 섞이면 다른 사용자의 저장이 그날 행 전체를 덮어씀
+                raise ValueError(
+                    "SaveDiaryNode의 stats는 UserEmotionStats 또는 user_name이 지정된 EmotionStats여야 합니다 "
+                    "(예: UserEmotionStats(diary_store), EmotionStats.from_store(diary_store, user_name=...))."
+                )
+
+    def _save(self, record: DiaryRecord) -> None:
+        self.store.save(record)
+        if self.per_user_stats:
+            self.stats.add_day(record.user_name, record.diary_date, record.entries)
+        elif self.stats is not None and self.stats.user_name == record.user_name:
+            self.stats.add_day(record.diary_date, record.entries)
+        if self.memory_index is not None:
+            self.memory_index.add_record(record)
+
+    @staticmethod
+    def to_record(state: State) -> DiaryRecord:
+        return DiaryRecord(
+            user_name=state.get("user_name", ""),
+            diary_date=state["today_date"],
+            written_at=state.get("written_at"),
+            one_liner=state.get("one_liner", ""),
+            diary_body=state.get("diary_body", ""),
+            entries=state.get("entries", []),
+            emotion_pie_chart_url=state.get("emotion_pie_chart_url", ""),
+            emotion_timeline_chart_url=state.get("emotion_timeline_chart_url", ""),
+            emotion_score_chart_url=state.get("emotion_score_chart_url", ""),
+        )
+
+    def execute(self, state: State) -> State:
+        self._save(self.to_record(state))
+        return State()
+
+    async def aexecute(self, state: State) -> State:
+        # SQLite 쓰기는 이벤트 루프 밖에서 실행
+        await asyncio.to_thread(self._save, self.to_record(state))
+        return State()
+
+
+class EntryRouterNode(BaseNode):
+    """
+    info 노드 앞에서 사용자 명령을 LLM 호출 없이 먼저 처리하는 라우터
+    - "q": 일기 생성 (generate_diary_body), 기록된 사건이 없으면 command 노드에서 안내
+    - "undo" / "status": command 노드
+    - 그 외 입력: info
+    """
+    COMMANDS = {
+        "q": "finish",
+        "undo": "undo",
+        "status": "status",
+    }
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.name = "EntryRouterNode"
+
+    @classmethod
+    def parse_command(cls, state: State) -> str | None:
+        messages = state.get("messages") or []
+        if not messages or not isinstance(messages[-1], HumanMessage):
+            return None
+        return cls.COMMANDS.get(str(messages[-1].content).strip().lower())
+
+    def execute(self, state):
+        command = self.parse_command(state)
+        if command is None:
+            return "info"
+        if command == "finish" and state.get("entries"):
+            return "generate_diary_body"
+        return "command"
+
+
+class CommandNode(BaseNode):
+    """EntryRouterNode가 넘긴 명령(undo, status, 사건 없이 q)에 LLM 없이 바로 응답"""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.name = "CommandNode"
+
+    @staticmethod
+    def _status_text(entries: List[DiaryEntry]) -> str:
+        if not entries:
+            return "아직 기록된 사건이 없어."
+        lines = [
+            f"- {entry.time_period.strftime('%H:%M')} {entry.event_title} ({entry.core_emotion}, {entry.emotion_score}점)"
+            for entry in sorted(entries, key=lambda e: e.time_period)
+        ]
+        return f"지금까지 기록된 사건은 {len(entries)}개야.\n" + "\n".join(lines)
+
+    def execute(self, state: State) -> State:
+        command = EntryRouterNode.parse_command(state)
+        entries = state.get("entries", [])
+
+        if command == "undo":
+            if not entries:
+                return State(messages=[AIMessage(content="지울 사건이 없어.")])
+            removed = entries[-1]
+            return State(
+                messages=[AIMessage(content=f"마지막으로 기록한 '{removed.event_title}'을(를) 지웠어. 다시 얘기해줄래?")],
+                entries=entries[:-1],
+            )
+
+        if command == "finish":
+            # 기록된 사건 없이 q를 입력한 경우
+            return State(messages=[AIMessage(content="아직 기록된 사건이 없어서 일기를 만들 수 없어. 오늘 있었던 일을 먼저 들려줄래?")])
+
+        return State(messages=[AIMessage(content=self._status_text(entries))])
+
+
 class RouterNode(BaseNode):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
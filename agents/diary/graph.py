@@ -0,0 +1,142 @@
+from langgraph.graph import END, START, StateGraph
+
+from agents.core.models import DiaryEntry
+from agents.core.states import State
+from agents.core.tools import suggest_keywords_tool
+from .chart_store import get_chart_process_pool
+from .context import InfoContextManager
+from .diary_nodes import (
+    CommandNode,
+    CreateEntryNode,
+    EntryRouterNode,
+    GenerateDiaryBodyNode,
+    GenerateDiaryNode,
+    GenerateEmotionChartsNode,
+    InfoNode,
+    RouterNode,
+    SaveDiaryNode,
+    SuggestKeywordsNode,
+)
+from .memory_index import DiaryMemoryIndex
+from .store import DiaryStore
+
+
+def build_main_workflow(
+    llm,
+    llm_with_tool=None,
+    chart_node: GenerateEmotionChartsNode | None = None,
+    parallel_charts: bool = True,
+    chart_executor="process",
+    context_manager: InfoContextManager | None = None,
+    direct_keywords: bool = True,
+    entry_router: bool = True,
+    diary_store: DiaryStore | None = None,
+    emotion_stats=None,
+    memory_index: DiaryMemoryIndex | None = None,
+    stream_tokens: bool = True,
+) -> StateGraph:
+    """
+    일기 작성 워크플로우(main_graph) 구성
+
+    Args:
+        llm: 일기 본문 생성용 LLM.
+        llm_with_tool: 대화용 LLM (None이면 llm에 DiaryEntry / suggest_keywords_tool을 바인딩).
+        chart_node: 감정 차트 노드 (None이면 기본 저장소와 chart_executor로 생성).
+        parallel_charts: True면 'q' 입력 시 본문 생성과 차트 렌더링을 동시에 시작하고
+            generate_diary에서 합류, False면 기존처럼 본문 → 차트 → 일기 순서로 실행.
+        chart_executor: chart_node를 만들 때 렌더링을 맡길 Executor.
+            "process"(기본값)면 공용 프로세스 풀(get_chart_process_pool)에서 렌더링해 이벤트 루프 / GIL과 경쟁하지 않음,
+            None이면 현재 스레드(aexecute는 기본 스레드 풀)에서 렌더링.
+        context_manager: InfoNode 프롬프트 크기 관리자 (None이면 기본 설정의 InfoContextManager 사용).
+        direct_keywords: True면 추천 키워드 목록을 바로 사용자에게 보여주고 다음 입력을 기다림,
+            False면 기존처럼 info 노드로 돌아가 모델이 <RAW> 내용을 전달.
+        entry_router: True면 info 앞에서 q / undo / status 명령을 LLM 호출 없이 처리,
+            False면 기존처럼 info 실행 후 RouterNode에서 'q'를 확인.
+        diary_store: 지정하면 generate_diary 다음에 완성된 일기를 저장 (예: DiaryStore("diary.sqlite")).
+        emotion_stats: diary_store와 함께 지정하면 저장할 때 사용자별 감정 통계도 갱신
+            (예: UserEmotionStats(diary_store), 한 사용자만 쓰면 EmotionStats.from_store(diary_store, user_name=...)).
+        memory_index: 지정하면 info 노드가 관련된 과거 일기를 프롬프트에 덧붙이고,
+            diary_store와 함께 지정하면 저장한 일기도 바로 색인 (예: DiaryMemoryIndex.from_store(diary_store)).
+        stream_tokens: True면 info 응답과 일기 본문을 LLM 스트리밍으로 받아 TokenStreamEvent로 내보냄
+            (graph.stream / astream에 token_stream_config(config)와 stream_mode="custom"을 함께 넘기면 받을 수 있음),
+            도구 호출 턴은 제외. 요청하지 않은 invoke / ainvoke는 스트리밍 없이 한 번에 호출.
+    """
+    if llm_with_tool is None:
+        # DiaryEntry 구조체와 suggest_keywords_tool을 바인딩
+        llm_with_tool = llm.bind_tools([DiaryEntry, suggest_keywords_tool])
+
+    if chart_node is None:
+        if chart_executor == "process":
+            chart_executor = get_chart_process_pool()
+        chart_node = GenerateEmotionChartsNode(executor=chart_executor)
+
+    if context_manager is None:
+        context_manager = InfoContextManager()
+
+    workflow = StateGraph(State)
+
+    # 노드 추가 (동기/비동기 실행 경로 모두 등록)
+    workflow.add_node(
+        "info",
+        InfoNode(
+            llm_with_tool, context_manager=context_manager, memory_index=memory_index, stream_tokens=stream_tokens
+        ).as_runnable(),
+    )
+    workflow.add_node("suggest_keywords_message", SuggestKeywordsNode(direct_reply=direct_keywords).as_runnable())
+    workflow.add_node("create_entry", CreateEntryNode().as_runnable())
+    workflow.add_node("generate_diary_body", GenerateDiaryBodyNode(llm, stream_tokens=stream_tokens).as_runnable())
+    workflow.add_node("generate_emotion_charts", chart_node.as_runnable())
+    workflow.add_node("generate_diary", GenerateDiaryNode().as_runnable())
+    if entry_router:
+        workflow.add_node("command", CommandNode().as_runnable())
+    if diary_store is not None:
+        workflow.add_node("save_diary", SaveDiaryNode(diary_store, stats=emotion_stats, memory_index=memory_index).as_runnable())
+
+    def with_parallel_charts(router):
+        def route(state: State):
+            destination = router(state)
+            # 차트는 entries / today_date만 필요하므로 본문 생성을 기다리지 않고 함께 시작
+            if parallel_charts and destination == "generate_diary_body":
+                return ["generate_diary_body", "generate_emotion_charts"]
+            return destination
+        return route
+
+    # 조건부 상태 전환 정의
+    workflow.add_conditional_edges(
+        "info",
+        with_parallel_charts(RouterNode()),
+        ["suggest_keywords_message", "create_entry", "generate_diary_body", "generate_emotion_charts", "info", END],
+    )
+
+    # 엣지 정의
+    if entry_router:
+        # 사용자 명령은 info(LLM 호출) 전에 처리
+        workflow.add_conditional_edges(
+            START,
+            with_parallel_charts(EntryRouterNode()),
+            ["info", "command", "generate_diary_body", "generate_emotion_charts"],
+        )
+        workflow.add_edge("command", END)
+    else:
+        workflow.add_edge(START, "info")
+    # 키워드 목록이 이미 assistant 턴으로 전달됐으면 LLM을 다시 부르지 않고 사용자 입력 대기
+    workflow.add_edge("suggest_keywords_message", END if direct_keywords else "info")
+    workflow.add_edge("create_entry", "info")
+    if parallel_charts:
+        # 본문과 차트가 모두 끝나야 generate_diary 실행
+        workflow.add_edge(["generate_diary_body", "generate_emotion_charts"], "generate_diary")
+    else:
+        workflow.add_edge("generate_diary_body", "generate_emotion_charts")
+        workflow.add_edge("generate_emotion_charts", "generate_diary")
+    if diary_store is not None:
+        workflow.add_edge("generate_diary", "save_diary")
+        workflow.add_edge("save_diary", END)
+    else:
+        workflow.add_edge("generate_diary", END)
+
+    return workflow
+
+
+def build_main_graph(llm, llm_with_tool=None, checkpointer=None, **kwargs):
+    """build_main_workflow로 구성한 그래프를 컴파일해 반환 (checkpointer: 예) SQLiteCheckpointSaver("diary.sqlite"), MemorySaver())"""
+    return build_main_workflow(llm, llm_with_tool, **kwargs).compile(checkpointer=checkpointer)
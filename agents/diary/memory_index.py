@@ -0,0 +1,251 @@
+from bisect import bisect_left
+from collections import Counter
+from datetime import date
+from typing import Iterable, List, Literal, Optional, Tuple
+import math
+import threading
+
+import numpy as np
+from pydantic import BaseModel, Field
+
+from agents.core.models import DiaryRecord
+from agents.core.text import char_ngrams
+
+
+class MemoryRecord(BaseModel):
+    """
+    과거 일기 검색 인덱스에 저장되는 기억 한 조각입니다.
+
+    Attributes:
+        user_name (str): 사용자 이름.
+        diary_date (date): 일기 날짜.
+        kind (str): "body"(일기 본문 문단) 또는 "entry"(사건의 생각/회고).
+        title (str): 사건 제목 (본문 문단이면 빈 문자열).
+        text (str): 검색/프롬프트에 쓰이는 텍스트.
+    """
+    user_name: str = Field(default="", description="사용자 이름")
+    diary_date: date = Field(..., description="일기 날짜")
+    kind: Literal["body", "entry"] = Field(..., description="기억 종류")
+    title: str = Field(default="", description="사건 제목")
+    text: str = Field(..., description="기억 텍스트")
+
+
+def split_record(record: DiaryRecord) -> List[MemoryRecord]:
+    """하루치 일기를 본문 문단 + 사건별(생각/회고) 기억으로 나눔"""
+    memories = [
+        MemoryRecord(user_name=record.user_name, diary_date=record.diary_date, kind="body", text=paragraph.strip())
+        for paragraph in record.diary_body.split("\n\n")
+        if paragraph.strip()
+    ]
+    for entry in record.entries:
+        memories.append(
+            MemoryRecord(
+                user_name=record.user_name,
+                diary_date=record.diary_date,
+                kind="entry",
+                title=entry.event_title,
+                text=f"{entry.summary} {entry.thoughts} {entry.reflection}".strip(),
+            )
+        )
+    return memories
+
+
+class _Postings:
+    """한 term의 (문서 id, tf) 목록, 검색 시 NumPy 배열로 변환 (새로 추가된 부분만 이어붙임)"""
+
+    __slots__ = ("ids", "tfs", "_ids", "_tfs")
+
+    def __init__(self):
+        self.ids: List[int] = []
+        self.tfs: List[int] = []
+        self._ids = np.zeros(0, dtype=np.int64)
+        self._tfs = np.zeros(0, dtype=np.float64)
+
+    def append(self, doc_id: int, tf: int) -> None:
+        self.ids.append(doc_id)
+        self.tfs.append(tf)
+
+    def discard(self, doc_id: int) -> None:
+        """삭제된 문서 제거 (문서 id는 추가 순서대로 커지므로 이진 탐색)"""
+        position = bisect_left(self.ids, doc_id)
+        if position == len(self.ids) or self.ids[position] != doc_id:
+            return
+        del self.ids[position]
+        del self.tfs[position]
+        if position < len(self._ids):
+            self._ids = np.delete(self._ids, position)
+            self._tfs = np.delete(self._tfs, position)
+
+    def arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+        converted = len(self._ids)
+        if converted < len(self.ids):
+            self._ids = np.concatenate((self._ids, np.asarray(self.ids[converted:], dtype=np.int64)))
+            self._tfs = np.concatenate((self._tfs, np.asarray(self.tfs[converted:], dtype=np.float64)))
+        return self._ids, self._tfs
+
+
+class DiaryMemoryIndex:
+    """
+    과거 일기(본문 문단, 사건의 생각/회고)를 검색하는 로컬 인덱스 (외부 서비스 없음)
+    - 글자 2-gram BM25 점수, 삽입 비용은 문서 길이에 비례
+    - 점수는 질의 term이 모두 최대로 맞았을 때를 1로 정규화해 min_score로 거름
+    - 같은 날짜를 다시 추가하거나 remove_day로 지우면 이전 기억을 역색인에서도 제거 (df는 남아 있는 기억 기준)
+
+    Attributes:
+        min_score (float): 검색 결과로 돌려줄 최소 정규화 점수 (0~1).
+        max_df_ratio (float): 이 비율보다 많은 문서에 나오는 흔한 term은 질의에서 제외
+            (기억이 MIN_DF_FILTER_DOCS개 이상일 때만, 적을 때는 모든 term이 "흔한" term이 되므로 적용하지 않음).
+    """
+
+    K1 = 1.2
+    B = 0.75
+    MIN_DF_FILTER_DOCS = 20
+
+    def __init__(self, min_score: float = 0.2, max_df_ratio: float = 0.5, capacity: int = 1024):
+        self.min_score = min_score
+        self.max_df_ratio = max_df_ratio
+        self._lock = threading.RLock()
+        self._postings: dict = {}
+        self._memories: List[MemoryRecord] = []
+        self._user_codes: dict = {}
+        self._by_day: dict = {}  # (user_name, diary_date) → 문서 id 목록
+        self._total_length = 0
+        self._n_alive = 0
+        # 문서별 길이 / 날짜(ordinal) / 사용자 코드 / 삭제 여부 (용량은 2배씩 확장)
+        self._lengths = np.zeros(capacity, dtype=np.float64)
+        self._ordinals = np.zeros(capacity, dtype=np.int64)
+        self._users = np.zeros(capacity, dtype=np.int64)
+        self._alive = np.zeros(capacity, dtype=bool)
+
+    _ARRAYS = ("_lengths", "_ordinals", "_users", "_alive")
+
+    def _grow(self) -> None:
+        for name in self._ARRAYS:
+            array = getattr(self, name)
+            grown = np.zeros(max(len(array) * 2, 1), dtype=array.dtype)
+            grown[: len(array)] = array
+            setattr(self, name, grown)
+
+    @classmethod
+    def from_store(cls, store, start: Optional[date] = None, end: Optional[date] = None, user_name: Optional[str] = None, **kwargs) -> "DiaryMemoryIndex":
+        """DiaryStore에 저장된 일기로 인덱스 생성"""
+        index = cls(**kwargs)
+        index.add_records(store.list_days(start, end, user_name=user_name))
+        return index
+
+    def __len__(self) -> int:
+        return self._n_alive
+
+    # 추가/삭제
+    def add_record(self, record: DiaryRecord) -> int:
+        return self.add_records([record])
+
+    def add_records(self, records: Iterable[DiaryRecord]) -> int:
+        """일기를 기억 단위로 나눠 추가하고 추가한 기억 수 반환"""
+        added = 0
+        with self._lock:
+            for record in records:
+                self._remove_day(record.user_name, record.diary_date)
+                doc_ids = []
+                for memory in split_record(record):
+                    doc_ids.append(self._add_memory(memory))
+                self._by_day[(record.user_name, record.diary_date)] = doc_ids
+                added += len(doc_ids)
+        return added
+
+    @staticmethod
+    def _terms(memory: MemoryRecord) -> Counter:
+        return Counter(char_ngrams(f"{memory.title} {memory.text}"))
+
+    def _add_memory(self, memory: MemoryRecord) -> int:
+        doc_id = len(self._memories)
+        terms = self._terms(memory)
+        for term, tf in terms.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = _Postings()
+            postings.append(doc_id, tf)
+
+        length = sum(terms.values())
+        if doc_id == len(self._alive):
+            self._grow()
+        self._memories.append(memory)
+        self._lengths[doc_id] = length
+        self._ordinals[doc_id] = memory.diary_date.toordinal()
+        self._users[doc_id] = self._user_codes.setdefault(memory.user_name, len(self._user_codes))
+        self._alive[doc_id] = True
+        self._total_length += length
+        self._n_alive += 1
+        return doc_id
+
+    def remove_day(self, diary_date: date, user_name: str = "") -> None:
+        with self._lock:
+            self._remove_day(user_name, diary_date)
+
+    def _remove_day(self, user_name: str, diary_date: date) -> None:
+        for doc_id in self._by_day.pop((user_name, diary_date), []):
+            if self._alive[doc_id]:
+                self._alive[doc_id] = False
+                self._total_length -= int(self._lengths[doc_id])
+                self._n_alive -= 1
+                for term in self._terms(self._memories[doc_id]):
+                    postings = self._postings.get(term)
+                    if postings is None:
+                        continue
+                    postings.discard(doc_id)
+                    if not postings.ids:
+                        del self._postings[term]
+
+    # 검색
+    def search(
+        self,
+        text: str,
+        k: int = 3,
+        before: Optional[date] = None,
+        user_name: Optional[str] = None,
+    ) -> List[Tuple[float, MemoryRecord]]:
+        """
+        text와 관련된 기억 상위 k개를 (정규화 점수, 기억)으로 반환
+        - before: 이 날짜 이전(당일 제외) 기억만 검색
+        - user_name: 해당 사용자의 기억만 검색
+        """
+        with self._lock:
+            n_docs = self._n_alive
+            if n_docs == 0:
+                return []
+            n_total = len(self._memories)
+            lengths, ordinals = self._lengths[:n_total], self._ordinals[:n_total]
+            users, alive = self._users[:n_total], self._alive[:n_total]
+            avg_length = self._total_length / n_docs
+
+            scores = np.zeros(n_total, dtype=np.float64)
+            max_score = 0.0
+            filter_common = n_docs >= self.MIN_DF_FILTER_DOCS
+            for term in set(char_ngrams(text)):
+                postings = self._postings.get(term)
+                if postings is None:
+                    continue
+                df = len(postings.ids)
+                if filter_common and df > self.max_df_ratio * n_docs:
+                    continue  # 거의 모든 기억에 나오는 term은 구분력이 없음
+                idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+                ids, tfs = postings.arrays()
+                norm = tfs + self.K1 * (1 - self.B + self.B * lengths[ids] / avg_length)
+                scores[ids] += idf * tfs * (self.K1 + 1) / norm
+                max_score += idf * (self.K1 + 1)
+
+            if max_score == 0.0:
+                return []
+            scores /= max_score
+
+            mask = alive & (scores >= self.min_score)
+            if before is not None:
+                mask &= ordinals < before.toordinal()
+            if user_name is not None:
+                mask &= users == self._user_codes.get(user_name, -1)
+
+            candidates = np.flatnonzero(mask)
+            if len(candidates) > k:
+                candidates = candidates[np.argpartition(-scores[candidates], k - 1)[:k]]
+            ranked = sorted(candidates, key=lambda doc_id: -scores[doc_id])
+            return [(float(scores[doc_id]), self._memories[doc_id]) for doc_id in ranked]
@@ -1,4 +1,4 @@
-from langchain.prompts import PromptTemplate
+from langchain_core.prompts import PromptTemplate
 
 # 일기 작성 시스템 프롬프트
 DIARY_SYSTEM_TEMPLATE = """Your job is to help the user reflect on their day by having a warm, friendly, and casual conversation — like a trusted friend.
@@ -32,6 +32,7 @@ Guidelines:
 Tool handling:
 - When you call `suggest_keywords_tool`, wait for a ToolMessage to be returned.
 - If the ToolMessage contains a `<RAW>...</RAW>` tag, return the content *exactly as it is* to the user without paraphrasing.
+- If the keyword list has already been shown to the user (an assistant message right after the ToolMessage), do not repeat it; continue with the user's choice.
 
 Handling multiple entries:
 - Users may want to write about *multiple events* in one day.
@@ -0,0 +1,300 @@
+from datetime import date, time
+from functools import wraps
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+import threading
+
+import numpy as np
+
+from agents.core.models import DiaryEntry
+from .charts import emotion_to_index
+
+# 배열 열 순서 = emotion_to_index 순서
+EMOTIONS = tuple(sorted(emotion_to_index, key=emotion_to_index.get))
+N_EMOTIONS = len(EMOTIONS)
+HOURS = 24
+ROLLUP_FREQS = ("day", "week", "month")
+
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+DateLike = Union[date, str]
+
+
+def _ordinal(value: DateLike) -> int:
+    return (value if isinstance(value, date) else date.fromisoformat(value)).toordinal()
+
+
+def _minute_of_day(value: Union[time, str]) -> int:
+    if isinstance(value, time):
+        return value.hour * 60 + value.minute
+    return int(value[:2]) * 60 + int(value[3:5])
+
+
+def _synchronized(method):
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+class EmotionStats:
+    """
+    날짜별 감정 통계를 NumPy 배열로 누적하는 통계 엔진 (일/주/월 단위 집계)
+    - 날짜마다 감정별 사건 수, 점수 합/제곱합, 시간대(0~23시)별 감정 수/점수 합,
+      하루 안에서 이어지는 사건 간 감정 전이 횟수를 한 행으로 보관
+    - 추가/조회는 lock으로 보호되어 여러 스레드에서 함께 사용 가능
+    - 하루 추가(add_day)는 그날 사건 수만큼만 계산하고, 같은 날짜를 다시 추가하면 그 행만 교체
+    - 기간 조회(summary, rollup)는 해당 날짜 구간의 행을 벡터 연산으로 합산
+    - 행은 날짜로만 구분하므로 한 사용자의 기록만 담아야 함 (여러 사용자는 UserEmotionStats로 사용자마다 하나씩)
+
+    Attributes:
+        days (int): 기록된 날짜 수.
+        user_name (str | None): 담고 있는 사용자 (None이면 지정하지 않음, SaveDiaryNode에서는 사용 불가).
+    """
+
+    def __init__(self, capacity: int = 366, user_name: Optional[str] = None):
+        self.user_name = user_name
+        self._origin: Optional[int] = None  # 0번 행의 날짜 (ordinal)
+        self._length = 0  # 사용 중인 행 수 (첫 날짜 ~ 마지막 날짜)
+        self._lock = threading.RLock()
+        self._alloc(capacity)
+
+    def _alloc(self, capacity: int) -> None:
+        self._counts = np.zeros((capacity, N_EMOTIONS), dtype=np.int32)
+        self._score_sum = np.zeros(capacity, dtype=np.float64)
+        self._score_sq = np.zeros(capacity, dtype=np.float64)
+        self._hour_counts = np.zeros((capacity, HOURS, N_EMOTIONS), dtype=np.int32)
+        self._hour_score = np.zeros((capacity, HOURS), dtype=np.float64)
+        self._transitions = np.zeros((capacity, N_EMOTIONS, N_EMOTIONS), dtype=np.int32)
+        self._recorded = np.zeros(capacity, dtype=bool)
+
+    _ARRAYS = ("_counts", "_score_sum", "_score_sq", "_hour_counts", "_hour_score", "_transitions", "_recorded")
+
+    @property
+    @_synchronized
+    def days(self) -> int:
+        return int(self._recorded[: self._length].sum())
+
+    def _ensure(self, first: int, last: int) -> None:
+        """ordinal first~last 날짜가 들어갈 수 있도록 원점 이동/용량 확장 (용량은 2배씩)"""
+        if self._origin is None:
+            self._origin = first
+        shift = max(self._origin - first, 0)
+        length = max(self._length + shift, last - self._origin + shift + 1)
+        capacity = len(self._recorded)
+        if shift == 0 and length <= capacity:
+            self._length = length
+            return
+
+        new_capacity = max(capacity, 1)
+        while new_capacity < length:
+            new_capacity *= 2
+        old = {name: getattr(self, name) for name in self._ARRAYS}
+        self._alloc(new_capacity)
+        for name, array in old.items():
+            getattr(self, name)[shift: shift + self._length] = array[: self._length]
+        self._origin -= shift
+        self._length = length
+
+    # 추가
+    @_synchronized
+    def add_day(self, diary_date: DateLike, entries: Iterable[DiaryEntry]) -> None:
+        """하루치 사건으로 해당 날짜 행을 다시 계산 (비용: 그날 사건 수에 비례)"""
+        rows = [(diary_date, entry.time_period, entry.core_emotion, entry.emotion_score) for entry in entries]
+        if rows:
+            self.add_rows(rows)
+            return
+
+        # 사건이 없는 날: 행을 비우고 '기록된 날'로만 표시
+        ordinal = _ordinal(diary_date)
+        self._ensure(ordinal, ordinal)
+        for name in self._ARRAYS:
+            getattr(self, name)[ordinal - self._origin] = 0
+        self._recorded[ordinal - self._origin] = True
+
+    @_synchronized
+    def add_rows(self, rows: Iterable[Tuple[DateLike, Union[time, str], str, int]]) -> None:
+        """
+        (날짜, 시각, 핵심 감정, 점수) 행을 한 번에 반영 (DiaryStore.entry_rows 결과를 그대로 사용 가능)
+        - 행에 포함된 날짜는 기존 값을 지우고 새로 계산
+        - 같은 날짜의 행은 시각순으로 이어진다고 보고 감정 전이를 셈
+        """
+        rows = list(rows)
+        if not rows:
+            return
+
+        ordinals = np.fromiter((_ordinal(r[0]) for r in rows), dtype=np.int64, count=len(rows))
+        minutes = np.fromiter((_minute_of_day(r[1]) for r in rows), dtype=np.int64, count=len(rows))
+        emotions = np.fromiter((emotion_to_index[r[2]] for r in rows), dtype=np.int64, count=len(rows))
+        scores = np.fromiter((r[3] for r in rows), dtype=np.float64, count=len(rows))
+        hours = minutes // 60
+
+        self._ensure(int(ordinals.min()), int(ordinals.max()))
+        idx = ordinals - self._origin
+
+        # 해당 날짜 행 초기화 후 누적
+        touched = np.unique(idx)
+        for name in self._ARRAYS:
+            getattr(self, name)[touched] = 0
+        self._recorded[touched] = True
+
+        np.add.at(self._counts, (idx, emotions), 1)
+        np.add.at(self._score_sum, idx, scores)
+        np.add.at(self._score_sq, idx, scores * scores)
+        np.add.at(self._hour_counts, (idx, hours, emotions), 1)
+        np.add.at(self._hour_score, (idx, hours), scores)
+
+        # 날짜/시각순 정렬 후 같은 날짜 안에서 연속된 두 사건의 감정 전이
+        order = np.lexsort((minutes, idx))
+        idx_sorted, emotions_sorted = idx[order], emotions[order]
+        same_day = idx_sorted[1:] == idx_sorted[:-1]
+        np.add.at(
+            self._transitions,
+            (idx_sorted[1:][same_day], emotions_sorted[:-1][same_day], emotions_sorted[1:][same_day]),
+            1,
+        )
+
+    @classmethod
+    def from_store(cls, store, start: Optional[date] = None, end: Optional[date] = None, user_name: Optional[str] = None) -> "EmotionStats":
+        """
+        DiaryStore의 기록으로 통계 생성
+        - user_name을 지정하면 그 사용자의 기록만 담은 통계 (저장할 때 갱신하려면 지정해야 함)
+        - 지정하지 않으면 모든 사용자의 기록을 날짜별로 합친 조회 전용 통계
+        """
+        stats = cls(user_name=user_name)
+        stats.add_rows(store.entry_rows(start, end, user_name=user_name))
+        return stats
+
+    # 조회
+    def _slice(self, start: Optional[DateLike], end: Optional[DateLike]) -> slice:
+        if self._origin is None:
+            return slice(0, 0)
+        lo = 0 if start is None else max(_ordinal(start) - self._origin, 0)
+        hi = self._length if end is None else min(_ordinal(end) - self._origin + 1, self._length)
+        return slice(lo, max(lo, hi))
+
+    @staticmethod
+    def _moments(counts: np.ndarray, score_sum: np.ndarray, score_sq: np.ndarray) -> dict:
+        n = counts.sum(axis=-1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = np.where(n > 0, score_sum / n, np.nan)
+            var = np.where(n > 0, score_sq / n - mean * mean, np.nan)
+            distribution = np.where(n[..., None] > 0, counts / n[..., None], 0.0)
+        return {
+            "n": n,
+            "counts": counts,
+            "distribution": distribution,
+            "score_mean": mean,
+            "score_var": np.maximum(var, 0.0),  # 부동소수 오차로 생기는 음수 제거
+        }
+
+    @_synchronized
+    def summary(self, start: Optional[DateLike] = None, end: Optional[DateLike] = None) -> dict:
+        """
+        기간 전체 통계
+        - n / counts / distribution: 사건 수, 감정별 사건 수(EMOTIONS 순서), 감정 비율
+        - score_mean / score_var: 감정 점수 평균/분산
+        - transitions: (이전 감정, 다음 감정) 전이 횟수 행렬
+        - hourly_counts / hourly_score_mean: 시간대(0~23시)별 감정 수, 평균 점수
+        """
+        window = self._slice(start, end)
+        result = self._moments(
+            self._counts[window].sum(axis=0),
+            self._score_sum[window].sum(),
+            self._score_sq[window].sum(),
+        )
+        hourly_counts = self._hour_counts[window].sum(axis=0)
+        hourly_n = hourly_counts.sum(axis=1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            hourly_mean = np.where(hourly_n > 0, self._hour_score[window].sum(axis=0) / hourly_n, np.nan)
+        result.update(
+            n=int(result["n"]),
+            score_mean=float(result["score_mean"]),
+            score_var=float(result["score_var"]),
+            days=int(self._recorded[window].sum()),
+            transitions=self._transitions[window].sum(axis=0),
+            hourly_counts=hourly_counts,
+            hourly_score_mean=hourly_mean,
+        )
+        return result
+
+    @_synchronized
+    def rollup(self, freq: str = "week", start: Optional[DateLike] = None, end: Optional[DateLike] = None) -> dict:
+        """
+        일/주(월요일 시작)/월 단위 통계
+        - period_start: 각 기간의 시작 날짜 (datetime64[D] 배열, 주는 월요일 / 월은 1일, 기록이 그 뒤부터 있어도 같음)
+        - n / counts / distribution / score_mean / score_var: 기간별 값 (첫 축 = 기간)
+        """
+        if freq not in ROLLUP_FREQS:
+            raise ValueError(f"지원하지 않는 집계 단위입니다: {freq} (가능한 값: {', '.join(ROLLUP_FREQS)})")
+
+        window = self._slice(start, end)
+        days = np.arange(window.start, window.stop) + (self._origin or 0) - _EPOCH_ORDINAL
+        dates = days.astype("datetime64[D]")
+        if freq == "day":
+            keys = days
+        elif freq == "week":
+            keys = (days + 3) // 7  # 1970-01-01은 목요일 → 월요일 기준 주 번호
+        else:
+            keys = dates.astype("datetime64[M]").astype(np.int64)
+
+        if len(keys) == 0:
+            empty = np.zeros((0, N_EMOTIONS), dtype=np.int32)
+            return {"period_start": dates, **self._moments(empty, np.zeros(0), np.zeros(0))}
+
+        starts = np.concatenate(([0], np.flatnonzero(np.diff(keys)) + 1))
+        result = self._moments(
+            np.add.reduceat(self._counts[window], starts, axis=0),
+            np.add.reduceat(self._score_sum[window], starts),
+            np.add.reduceat(self._score_sq[window], starts),
+        )
+        result["period_start"] = self._period_start(freq, keys[starts])
+        return result
+
+    @staticmethod
+    def _period_start(freq: str, keys: np.ndarray) -> np.ndarray:
+        """기간 번호 → 기간 시작 날짜 (rollup의 keys 계산을 거꾸로)"""
+        if freq == "day":
+            return keys.astype("datetime64[D]")
+        if freq == "week":
+            return (keys * 7 - 3).astype("datetime64[D]")
+        return keys.astype("datetime64[M]").astype("datetime64[D]")
+
+
+class UserEmotionStats:
+    """
+    사용자별 EmotionStats 모음 (SaveDiaryNode / build_main_workflow의 emotion_stats로 사용)
+    - 사용자를 처음 조회할 때 store(DiaryStore)가 있으면 그 사용자의 기록으로 통계를 만들고, 없으면 빈 통계
+    - 같은 날짜에 여러 사용자가 일기를 저장해도 서로의 통계 행을 덮어쓰지 않음
+
+    예)
+        stats = UserEmotionStats(diary_store)
+        stats.for_user("예리").rollup("week")
+    """
+
+    def __init__(self, store=None, capacity: int = 366):
+        self.store = store
+        self.capacity = capacity
+        self._stats: Dict[str, EmotionStats] = {}
+        self._lock = threading.Lock()
+
+    def for_user(self, user_name: str) -> EmotionStats:
+        with self._lock:
+            stats = self._stats.get(user_name)
+            if stats is None:
+                if self.store is not None:
+                    stats = EmotionStats.from_store(self.store, user_name=user_name)
+                else:
+                    stats = EmotionStats(self.capacity, user_name=user_name)
+                self._stats[user_name] = stats
+            return stats
+
+    @property
+    def users(self) -> List[str]:
+        """지금까지 불러온 사용자 목록"""
+        with self._lock:
+            return list(self._stats)
+
+    def add_day(self, user_name: str, diary_date: DateLike, entries: Iterable[DiaryEntry]) -> None:
+        """user_name의 하루치 통계 행만 다시 계산"""
+        self.for_user(user_name).add_day(diary_date, entries)
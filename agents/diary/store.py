@@ -0,0 +1,277 @@
+from datetime import date, time
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Tuple, Union
+import json
+import sqlite3
+import threading
+import time as _time
+
+from agents.core.models import CoreEmotionType, DiaryEntry, DiaryRecord
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS diaries (
+    user_name TEXT NOT NULL,
+    diary_date TEXT NOT NULL,         -- YYYY-MM-DD (문자열 정렬 = 날짜 정렬)
+    written_at TEXT,
+    one_liner TEXT NOT NULL DEFAULT '',
+    diary_body TEXT NOT NULL DEFAULT '',
+    emotion_pie_chart_url TEXT NOT NULL DEFAULT '',
+    emotion_timeline_chart_url TEXT NOT NULL DEFAULT '',
+    emotion_score_chart_url TEXT NOT NULL DEFAULT '',
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (user_name, diary_date)
+);
+CREATE INDEX IF NOT EXISTS diaries_date ON diaries (diary_date);
+
+CREATE TABLE IF NOT EXISTS entries (
+    user_name TEXT NOT NULL,
+    diary_date TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    time_period TEXT NOT NULL,
+    event_title TEXT NOT NULL,
+    core_emotion TEXT NOT NULL,
+    emotion_score INTEGER NOT NULL,
+    emotion_keywords TEXT NOT NULL,  -- JSON
+    companions TEXT NOT NULL,        -- JSON
+    thoughts TEXT NOT NULL,
+    reflection TEXT NOT NULL,
+    summary TEXT NOT NULL,
+    PRIMARY KEY (user_name, diary_date, position)
+);
+CREATE INDEX IF NOT EXISTS entries_date ON entries (diary_date);
+CREATE INDEX IF NOT EXISTS entries_emotion ON entries (core_emotion, diary_date);
+CREATE INDEX IF NOT EXISTS entries_score ON entries (emotion_score, diary_date);
+"""
+
+_DIARY_COLUMNS = (
+    "user_name, diary_date, written_at, one_liner, diary_body, "
+    "emotion_pie_chart_url, emotion_timeline_chart_url, emotion_score_chart_url"
+)
+_ENTRY_COLUMNS = (
+    "user_name, diary_date, position, time_period, event_title, core_emotion, emotion_score, "
+    "emotion_keywords, companions, thoughts, reflection, summary"
+)
+
+
+def _entry_to_row(user_name: str, diary_date: str, position: int, entry: DiaryEntry) -> tuple:
+    return (
+        user_name,
+        diary_date,
+        position,
+        entry.time_period.isoformat(),
+        entry.event_title,
+        entry.core_emotion,
+        entry.emotion_score,
+        json.dumps(entry.emotion_keywords, ensure_ascii=False),
+        json.dumps([c.model_dump() for c in entry.companions], ensure_ascii=False),
+        entry.thoughts,
+        entry.reflection,
+        entry.summary,
+    )
+
+
+def _row_to_entry(row: tuple) -> DiaryEntry:
+    # row: _ENTRY_COLUMNS에서 user_name, diary_date, position을 뺀 나머지
+    time_period, title, emotion, score, keywords, companions, thoughts, reflection, summary = row
+    return DiaryEntry.model_validate(
+        {
+            "event_title": title,
+            "time_period": time_period,
+            "core_emotion": emotion,
+            "emotion_keywords": json.loads(keywords),
+            "emotion_score": score,
+            "companions": json.loads(companions),
+            "thoughts": thoughts,
+            "reflection": reflection,
+            "summary": summary,
+        }
+    )
+
+
+class DiaryStore:
+    """
+    하루치 일기(DiaryRecord)를 저장하는 SQLite 저장소
+    - 일기 본문/한 줄/차트 위치는 diaries, 사건(DiaryEntry)은 entries 테이블에 한 행씩 저장
+    - diary_date / core_emotion / emotion_score 인덱스로 기간·감정·점수 조회
+    - 같은 날짜를 다시 저장하면 덮어씀 (save_many는 한 트랜잭션으로 일괄 저장)
+    - 통계용으로 DiaryEntry를 만들지 않고 (날짜, 시각, 감정, 점수)만 읽는 entry_rows 제공
+
+    Attributes:
+        path (str | Path): SQLite 파일 경로 (":memory:" 가능).
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = path
+        self._lock = threading.RLock()
+        self.conn = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+        if str(path) != ":memory:":
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self.conn.close()
+
+    def __enter__(self) -> "DiaryStore":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    # 저장
+    def save(self, record: DiaryRecord) -> None:
+        self.save_many([record])
+
+    def save_many(self, records: Iterable[DiaryRecord]) -> int:
+        """
+        여러 날의 일기를 한 트랜잭션으로 저장하고 저장한 일수 반환
+        - 같은 (사용자, 날짜)가 여러 번 있으면 마지막 기록만 저장 (save를 순서대로 호출한 것과 같음)
+        """
+        latest = {}
+        for record in records:
+            key = (record.user_name, record.diary_date.isoformat())
+            latest.pop(key, None)  # 마지막으로 나온 순서 유지
+            latest[key] = record
+
+        diary_rows, entry_rows, keys = [], [], []
+        now = _time.time()
+        for (user_name, diary_date), record in latest.items():
+            keys.append((user_name, diary_date))
+            diary_rows.append(
+                (
+                    record.user_name,
+                    diary_date,
+                    record.written_at.isoformat() if record.written_at else None,
+                    record.one_liner,
+                    record.diary_body,
+                    record.emotion_pie_chart_url,
+                    record.emotion_timeline_chart_url,
+                    record.emotion_score_chart_url,
+                    now,
+                )
+            )
+            entries = sorted(record.entries, key=lambda e: e.time_period)
+            entry_rows.extend(
+                _entry_to_row(record.user_name, diary_date, position, entry) for position, entry in enumerate(entries)
+            )
+
+        with self._lock, self.conn:
+            self.conn.execute("BEGIN")
+            self.conn.executemany("DELETE FROM entries WHERE user_name = ? AND diary_date = ?", keys)
+            self.conn.executemany(
+                f"INSERT OR REPLACE INTO diaries ({_DIARY_COLUMNS}, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                diary_rows,
+            )
+            self.conn.executemany(
+                f"INSERT INTO entries ({_ENTRY_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", entry_rows
+            )
+        return len(diary_rows)
+
+    def delete(self, diary_date: date, user_name: str = "") -> None:
+        key = (user_name, diary_date.isoformat())
+        with self._lock, self.conn:
+            self.conn.execute("BEGIN")
+            self.conn.execute("DELETE FROM entries WHERE user_name = ? AND diary_date = ?", key)
+            self.conn.execute("DELETE FROM diaries WHERE user_name = ? AND diary_date = ?", key)
+
+    # 조회
+    @staticmethod
+    def _range_clause(start: Optional[date], end: Optional[date], user_name: Optional[str], prefix: str = "") -> Tuple[List[str], list]:
+        clauses, params = [], []
+        if user_name is not None:
+            clauses.append(f"{prefix}user_name = ?")
+            params.append(user_name)
+        if start is not None:
+            clauses.append(f"{prefix}diary_date >= ?")
+            params.append(start.isoformat())
+        if end is not None:
+            clauses.append(f"{prefix}diary_date <= ?")
+            params.append(end.isoformat())
+        return clauses, params
+
+    @staticmethod
+    def _where(clauses: List[str]) -> str:
+        return f"WHERE {' AND '.join(clauses)} " if clauses else ""
+
+    def get(self, diary_date: date, user_name: str = "") -> Optional[DiaryRecord]:
+        records = self.list_days(diary_date, diary_date, user_name=user_name)
+        return records[0] if records else None
+
+    def list_days(self, start: Optional[date] = None, end: Optional[date] = None, user_name: Optional[str] = None) -> List[DiaryRecord]:
+        """기간(start~end, 양 끝 포함)의 일기를 날짜순으로 반환"""
+        clauses, params = self._range_clause(start, end, user_name)
+        where = self._where(clauses)
+        with self._lock:
+            diary_rows = self.conn.execute(
+                f"SELECT {_DIARY_COLUMNS} FROM diaries {where}ORDER BY diary_date, user_name", params
+            ).fetchall()
+            entry_rows = self.conn.execute(
+                f"SELECT {_ENTRY_COLUMNS} FROM entries {where}ORDER BY user_name, diary_date, position", params
+            ).fetchall()
+
+        entries_by_day: dict = {}
+        for row in entry_rows:
+            entries_by_day.setdefault((row[0], row[1]), []).append(_row_to_entry(row[3:]))
+
+        return [
+            DiaryRecord(
+                user_name=user_name_,
+                diary_date=date.fromisoformat(diary_date),
+                written_at=time.fromisoformat(written_at) if written_at else None,
+                one_liner=one_liner,
+                diary_body=diary_body,
+                entries=entries_by_day.get((user_name_, diary_date), []),
+                emotion_pie_chart_url=pie,
+                emotion_timeline_chart_url=timeline,
+                emotion_score_chart_url=score,
+            )
+            for user_name_, diary_date, written_at, one_liner, diary_body, pie, timeline, score in diary_rows
+        ]
+
+    def find_entries(
+        self,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        core_emotion: Optional[CoreEmotionType] = None,
+        min_score: Optional[int] = None,
+        max_score: Optional[int] = None,
+        user_name: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[Tuple[date, DiaryEntry]]:
+        """조건에 맞는 사건을 (날짜, DiaryEntry)로 날짜/시각순 반환"""
+        clauses, params = self._range_clause(start, end, user_name)
+        if core_emotion is not None:
+            clauses.append("core_emotion = ?")
+            params.append(core_emotion)
+        if min_score is not None:
+            clauses.append("emotion_score >= ?")
+            params.append(min_score)
+        if max_score is not None:
+            clauses.append("emotion_score <= ?")
+            params.append(max_score)
+        query = f"SELECT {_ENTRY_COLUMNS} FROM entries {self._where(clauses)}ORDER BY diary_date, position"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+
+        with self._lock:
+            rows = self.conn.execute(query, params).fetchall()
+        return [(date.fromisoformat(row[1]), _row_to_entry(row[3:])) for row in rows]
+
+    def entry_rows(
+        self, start: Optional[date] = None, end: Optional[date] = None, user_name: Optional[str] = None
+    ) -> Iterator[Tuple[str, str, str, int]]:
+        """통계용 경량 조회: (diary_date, time_period, core_emotion, emotion_score) 문자열/정수 튜플"""
+        clauses, params = self._range_clause(start, end, user_name)
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT diary_date, time_period, core_emotion, emotion_score FROM entries "
+                f"{self._where(clauses)}ORDER BY diary_date, position",
+                params,
+            ).fetchall()
+        return iter(rows)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self.conn.execute("SELECT count(*) FROM diaries").fetchone()[0]
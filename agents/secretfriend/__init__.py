@@ -1,19 +1,39 @@
-from .secretfriend_nodes import (
-    MusicRecommendationNode,
-    QuoteRecommendationNode,
-    PraiseNode,
-    MBTIFeedbackNode,
-    StartNodeCheck,
-    LetterMarkdownNode,
-)
-
-from .prompts import (
-    get_music_prompt,
-    get_quote_prompt,
-    get_praise_prompt,
-    get_f_feedback_prompt,
-    get_t_feedback_prompt,
-)
+# secretfriend 패키지: 비밀친구 편지 노드 / 프롬프트
+from importlib import import_module
+
+# export 이름 → 실제로 정의된 모듈 (지연 import)
+_EXPORTS = {
+    # Nodes
+    "MusicRecommendationNode": ".secretfriend_nodes",
+    "QuoteRecommendationNode": ".secretfriend_nodes",
+    "PraiseNode": ".secretfriend_nodes",
+    "MBTIFeedbackNode": ".secretfriend_nodes",
+    "StartNodeCheck": ".secretfriend_nodes",
+    "LetterMarkdownNode": ".secretfriend_nodes",
+    # Quote index
+    "QuoteIndex": ".quote_index",
+    "QuoteRecord": ".quote_index",
+    # Graph
+    "build_letter_workflow": ".graph",
+    "build_letter_graph": ".graph",
+    # Batch
+    "LetterBatchRunner": ".batch",
+    "LetterBatchProgress": ".batch",
+    "LetterBatchResult": ".batch",
+    # Stream
+    "LetterStreamEvent": ".stream",
+    "astream_letter": ".stream",
+    "stream_letter": ".stream",
+    # Prompts
+    "get_music_prompt": ".prompts",
+    "get_quote_prompt": ".prompts",
+    "get_praise_prompt": ".prompts",
+    "get_f_feedback_prompt": ".prompts",
+    "get_t_feedback_prompt": ".prompts",
+    "get_mbti_feedback_prompt": ".prompts",
+    "get_music_keywords_prompt": ".prompts",
+    "get_music_reason_prompt": ".prompts",
+}
 
 __all__ = [
     # Nodes
@@ -23,11 +43,46 @@ __all__ = [
     "MBTIFeedbackNode",
     "StartNodeCheck",
     "LetterMarkdownNode",
-    
+
+    # Quote index
+    "QuoteIndex",
+    "QuoteRecord",
+
+    # Graph
+    "build_letter_workflow",
+    "build_letter_graph",
+
+    # Batch
+    "LetterBatchRunner",
+    "LetterBatchProgress",
+    "LetterBatchResult",
+
+    # Stream
+    "LetterStreamEvent",
+    "astream_letter",
+    "stream_letter",
+
     # Prompts
     "get_music_prompt",
     "get_quote_prompt", 
     "get_praise_prompt",
     "get_f_feedback_prompt",
     "get_t_feedback_prompt",
-]
\ No newline at end of file
+    "get_mbti_feedback_prompt",
+    "get_music_keywords_prompt",
+    "get_music_reason_prompt",
+]
+
+
+def __getattr__(name: str):
+    # 처음 접근할 때 해당 모듈을 import (import 시점 비용/부작용 최소화)
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,212 @@
+from pathlib import Path
+from typing import AsyncIterator, Iterable, List, Mapping, Optional, Set, Tuple, Union
+import asyncio
+import sqlite3
+import threading
+import time
+
+from pydantic import BaseModel, Field
+
+from agents.core.batching import MicroBatchLLM
+from .graph import build_letter_graph
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS letter_jobs (
+    job_id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,              -- done / failed
+    letter_markdown TEXT NOT NULL DEFAULT '',
+    error TEXT,
+    elapsed REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS letter_jobs_status ON letter_jobs (status);
+"""
+
+Jobs = Union[Mapping[str, str], Iterable[Tuple[str, str]]]
+
+
+class LetterBatchResult(BaseModel):
+    """
+    일괄 편지 생성에서 일기 한 건의 결과입니다.
+
+    Attributes:
+        job_id (str): 작업 ID (예: 사용자 ID + 날짜).
+        letter_markdown (str): 완성된 편지 (실패 시 빈 문자열).
+        error (str | None): 실패 사유 (성공 시 None).
+        elapsed (float): 일기 한 건 처리에 걸린 시간(초).
+    """
+    job_id: str = Field(..., description="작업 ID")
+    letter_markdown: str = Field(default="", description="완성된 편지 마크다운")
+    error: Optional[str] = Field(default=None, description="실패 사유")
+    elapsed: float = Field(default=0.0, description="처리 시간(초)")
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class LetterBatchProgress:
+    """
+    일괄 편지 생성 진행 상황을 기록하는 SQLite 저장소 (중단 후 이어서 실행하기 위함)
+    - 일기 한 건이 끝날 때마다 결과를 한 행으로 저장 (같은 job_id는 덮어씀)
+    - 완료(done)된 작업은 다시 실행할 때 건너뛰고, 실패(failed)한 작업은 다시 시도
+
+    Attributes:
+        path (str | Path): SQLite 파일 경로 (":memory:" 가능).
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = path
+        self._lock = threading.RLock()
+        self.conn = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+        if str(path) != ":memory:":
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self.conn.close()
+
+    def __enter__(self) -> "LetterBatchProgress":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def record(self, result: LetterBatchResult) -> None:
+        with self._lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO letter_jobs (job_id, status, letter_markdown, error, elapsed, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    result.job_id,
+                    "done" if result.ok else "failed",
+                    result.letter_markdown,
+                    result.error,
+                    result.elapsed,
+                    time.time(),
+                ),
+            )
+
+    def done_ids(self) -> Set[str]:
+        with self._lock:
+            return {row[0] for row in self.conn.execute("SELECT job_id FROM letter_jobs WHERE status = 'done'")}
+
+    def results(self, status: Optional[str] = None) -> List[LetterBatchResult]:
+        query = "SELECT job_id, letter_markdown, error, elapsed FROM letter_jobs"
+        params: tuple = ()
+        if status is not None:
+            query += " WHERE status = ?"
+            params = (status,)
+        with self._lock:
+            rows = self.conn.execute(query + " ORDER BY updated_at", params).fetchall()
+        return [
+            LetterBatchResult(job_id=job_id, letter_markdown=letter, error=error, elapsed=elapsed)
+            for job_id, letter, error, elapsed in rows
+        ]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self.conn.execute("SELECT count(*) FROM letter_jobs").fetchone()[0]
+
+
+class LetterBatchRunner:
+    """
+    많은 일기를 letter_graph로 한꺼번에 처리하는 일괄 실행기 (야간 배치용)
+    - 동시에 처리하는 일기 수를 max_concurrency로 제한 (입력은 필요한 만큼만 순서대로 읽음)
+    - PraiseNode / MBTIFeedbackNode (music_mode="direct"면 음악 키워드 / 이유 포함)의 LLM 호출은
+      MicroBatchLLM으로 여러 일기를 모아 llm.abatch로 전송
+    - 결과는 끝나는 순서대로 바로 내보냄 (astream)
+    - progress(LetterBatchProgress 또는 파일 경로)가 주어지면 결과를 기록하고, 다시 실행할 때 완료된 작업은 건너뜀
+
+    Attributes:
+        max_concurrency (int): 동시에 처리할 최대 일기 수.
+        batch_llm (MicroBatchLLM): 칭찬 / MBTI 피드백 호출을 모으는 LLM 래퍼.
+        skipped (int): 마지막 실행에서 이미 완료돼 건너뛴 작업 수.
+    """
+
+    def __init__(
+        self,
+        llm,
+        music_agent_executor,
+        quote_agent_executor,
+        quote_index=None,
+        progress: Union[LetterBatchProgress, str, Path, None] = None,
+        max_concurrency: int = 32,
+        batch_size: int = 16,
+        batch_wait: float = 0.02,
+        llm_concurrency: Optional[int] = None,
+        mbti_mode: str = "batch",
+        music_mode: str = "agent",
+    ):
+        self.max_concurrency = max_concurrency
+        self.batch_llm = MicroBatchLLM(llm, max_batch_size=batch_size, max_wait=batch_wait, max_concurrency=llm_concurrency)
+        self.graph = build_letter_graph(
+            self.batch_llm,
+            music_agent_executor,
+            quote_agent_executor,
+            quote_index=quote_index,
+            mbti_mode=mbti_mode,
+            music_mode=music_mode,
+        )
+        if isinstance(progress, (str, Path)):
+            progress = LetterBatchProgress(progress)
+        self.progress = progress
+        self.skipped = 0
+
+    async def _run_one(self, job_id: str, diary_body: str) -> LetterBatchResult:
+        start = time.perf_counter()
+        try:
+            state = await self.graph.ainvoke({"diary_body": diary_body})
+            result = LetterBatchResult(job_id=job_id, letter_markdown=state["letter_markdown"])
+        except Exception as exc:
+            # 한 건의 실패가 전체 배치를 멈추지 않도록 결과로 기록
+            result = LetterBatchResult(job_id=job_id, error=f"{type(exc).__name__}: {exc}")
+        result.elapsed = time.perf_counter() - start
+
+        if self.progress is not None:
+            # SQLite 쓰기는 이벤트 루프 밖에서 실행
+            await asyncio.to_thread(self.progress.record, result)
+        return result
+
+    async def astream(self, jobs: Jobs) -> AsyncIterator[LetterBatchResult]:
+        """(job_id, diary_body) 목록을 처리하며 끝나는 순서대로 결과를 내보냄"""
+        done_ids = self.progress.done_ids() if self.progress is not None else set()
+        self.skipped = 0
+
+        pending_jobs = iter(jobs.items() if isinstance(jobs, Mapping) else jobs)
+        running: set = set()
+
+        def fill() -> None:
+            while len(running) < self.max_concurrency:
+                job = next(pending_jobs, None)
+                if job is None:
+                    return
+                job_id, diary_body = job
+                if job_id in done_ids:
+                    self.skipped += 1
+                    continue
+                running.add(asyncio.ensure_future(self._run_one(job_id, diary_body)))
+
+        try:
+            fill()
+            while running:
+                finished, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                running.difference_update(finished)
+                fill()
+                for task in finished:
+                    yield task.result()
+        finally:
+            # 중단되면 진행 중인 작업 취소 (완료된 결과는 이미 기록됨)
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+
+    async def arun(self, jobs: Jobs) -> List[LetterBatchResult]:
+        return [result async for result in self.astream(jobs)]
+
+    def run(self, jobs: Jobs) -> List[LetterBatchResult]:
+        """동기 실행 (내부에서 이벤트 루프 생성)"""
+        return asyncio.run(self.arun(jobs))
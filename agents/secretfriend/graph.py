@@ -0,0 +1,72 @@
+from langgraph.graph import END, START, StateGraph
+
+from agents.core.states import SecretFriendState
+from .secretfriend_nodes import (
+    LetterMarkdownNode,
+    MBTIFeedbackNode,
+    MusicRecommendationNode,
+    PraiseNode,
+    QuoteRecommendationNode,
+    StartNodeCheck,
+)
+
+# 편지의 각 항목을 만드는 병렬 분기
+LETTER_BRANCHES = ("music", "quote", "praise", "mbti_feedback")
+
+
+def build_letter_workflow(
+    llm,
+    music_agent_executor,
+    quote_agent_executor,
+    quote_index=None,
+    mbti_mode: str = "batch",
+    music_mode: str = "agent",
+    music_reason: str = "llm",
+    spotify_tool=None,
+) -> StateGraph:
+    """
+    비밀친구 편지 워크플로우(letter_graph) 구성
+    start_node_check → (music / quote / praise / mbti_feedback 병렬) → letter_markdown
+
+    Args:
+        llm: 칭찬 / MBTI 피드백 (music_mode="direct"면 음악 키워드 / 추천 이유까지) 생성용 LLM
+            (일괄 처리 시 MicroBatchLLM으로 감싸서 전달).
+        music_agent_executor: 음악 추천 에이전트 (music_mode="direct"면 곡을 못 찾았을 때만 사용, None 가능).
+        quote_agent_executor: 명언 추천(웹 검색) 에이전트.
+            두 에이전트의 LLM도 create_tool_calling_agent(llm=rate_limited(llm), ...)로 만들면 같은 "openai" 제한기 사용.
+        quote_index: 지정하면 명언을 로컬 인덱스에서 먼저 찾음 (예: QuoteIndex.load()).
+        mbti_mode: MBTIFeedbackNode 호출 방식 ("sequential" / "batch" / "combined").
+        music_mode: MusicRecommendationNode 실행 방식 ("agent" / "direct").
+        music_reason: direct 모드의 추천 이유 작성 방식 ("llm" / "template").
+        spotify_tool: direct 모드에서 곡을 검색할 SpotifyTool (None이면 기본 설정으로 생성).
+    """
+    workflow = StateGraph(SecretFriendState)
+
+    # 노드 추가 (동기/비동기 실행 경로 모두 등록)
+    workflow.add_node("start_node_check", StartNodeCheck().as_runnable())
+    workflow.add_node(
+        "music",
+        MusicRecommendationNode(
+            music_agent_executor, llm=llm, spotify_tool=spotify_tool, mode=music_mode, reason=music_reason
+        ).as_runnable(),
+    )
+    workflow.add_node("quote", QuoteRecommendationNode(quote_agent_executor, quote_index=quote_index).as_runnable())
+    workflow.add_node("praise", PraiseNode(llm).as_runnable())
+    workflow.add_node("mbti_feedback", MBTIFeedbackNode(llm, mode=mbti_mode).as_runnable())
+    workflow.add_node("letter_markdown", LetterMarkdownNode().as_runnable())
+
+    # 엣지 정의: 네 분기를 동시에 시작하고 모두 끝나면 편지 작성
+    workflow.add_edge(START, "start_node_check")
+    for branch in LETTER_BRANCHES:
+        workflow.add_edge("start_node_check", branch)
+    workflow.add_edge(list(LETTER_BRANCHES), "letter_markdown")
+    workflow.add_edge("letter_markdown", END)
+
+    return workflow
+
+
+def build_letter_graph(llm, music_agent_executor, quote_agent_executor, checkpointer=None, **kwargs):
+    """build_letter_workflow로 구성한 그래프를 컴파일해 반환"""
+    return build_letter_workflow(llm, music_agent_executor, quote_agent_executor, **kwargs).compile(
+        checkpointer=checkpointer
+    )
@@ -1,4 +1,4 @@
-from langchain.prompts import ChatPromptTemplate, PromptTemplate
+from langchain_core.prompts import ChatPromptTemplate, PromptTemplate
 
 def get_music_prompt_base() -> ChatPromptTemplate:
     """음악 추천을 위한 프롬프트 템플릿 반환"""
@@ -50,6 +50,7 @@ def get_quote_prompt_base() -> ChatPromptTemplate:
             "명언은 반드시 출처(말한 사람)를 포함해야 하고, 'Unknown'이나 출처 불분명한 명언은 절대 추천하지 마.\n"
             "검색할 땐 반드시 '명언' 또는 'quote'가 포함된 쿼리로 검색해야 해. 예: '사랑 명언', '성장 quote'\n"
             "검색에는 tavily_search_results_json 도구를 사용해야 해.\n"
+            "검색 결과에 명언 / 저자 후보(candidates)가 있으면 그중에서 일기에 가장 어울리는 것을 골라.\n"
             "왜 이 명언이 어울리는지에 대한 이유는 친구처럼 다정한 반말로, 따뜻하게 설명해줘.\n"
             "결과는 반드시 아래 JSON 형식 가이드에 따라 구조화해야 해.\n"
             "{format_instructions}"
@@ -113,4 +114,62 @@ def get_t_feedback_prompt() -> PromptTemplate:
             "- 범죄, 자해, 혐오 등은 절대 정당화하지 않고, 책임감 있는 조언으로 유도할 것\n\n"
             "📝 사용자 일기: '''{diary_body}'''"
         )
-    )
\ No newline at end of file
+    )
+
+def get_mbti_feedback_prompt(format_instructions: str) -> PromptTemplate:
+    """F/T 유형 피드백을 한 번에 생성하기 위한 프롬프트 반환"""
+    return PromptTemplate(
+        input_variables=["diary_body"],
+        partial_variables={"format_instructions": format_instructions},
+        template=(
+            "다음 일기를 읽고, MBTI의 F 유형과 T 유형 친구에게 각각 전할 메시지를 한 번에 작성해줘.\n\n"
+            "1. F_feedback: F(Function: Feeling) 유형을 위한 위로 메시지\n"
+            "   - F 유형은 타인의 감정에 민감하고, 진심 어린 공감과 인정에 큰 가치를 둬.\n"
+            "   - 사용자의 감정을 존중하며, 고통이나 혼란 속에서도 잘 견뎌낸 점을 부각할 것\n"
+            "   - 따뜻하고 진심 어린 친구 같은 반말로 위로하며, 무조건적인 긍정보다는 현실적인 공감을 우선할 것\n\n"
+            "2. T_feedback: T(Function: Thinking) 유형을 위한 조언 메시지\n"
+            "   - T 유형은 문제 해결 중심이며, 감정보다 사실과 효율을 중요시해.\n"
+            "   - 감정적인 언급은 최소화하되, 지나치게 차갑지 않도록 친근한 반말 톤으로 균형을 유지할 것\n"
+            "   - 사용자의 선택이나 행동 중 개선하거나 성장의 여지가 있는 부분을 정중하게 짚어줄 것\n\n"
+            "✅ 공통 기준:\n"
+            "- 각 메시지는 한 문단으로 작성할 것\n"
+            "- 폭력, 범죄, 자해, 우울감 등 부정적 사건은 미화하거나 정당화하지 말고, 신중하고 책임감 있게 접근할 것\n\n"
+            "아래 JSON 형식으로만 응답해:\n"
+            "{format_instructions}\n\n"
+            "📝 사용자 일기: '''{diary_body}'''"
+        )
+    )
+
+
+def get_music_keywords_prompt(format_instructions: str) -> PromptTemplate:
+    """음악 추천 빠른 경로: Spotify 검색 키워드 여러 개를 한 번에 뽑기 위한 프롬프트 반환"""
+    return PromptTemplate(
+        input_variables=["diary_body"],
+        partial_variables={"format_instructions": format_instructions},
+        template=(
+            "너는 사용자의 일기를 읽고 어울리는 음악을 찾아주는 비밀 친구야.\n"
+            "Spotify에서 곡을 검색할 키워드를 어울리는 순서대로 3~5개 골라줘.\n\n"
+            "✅ 기준:\n"
+            "- 긍정적이거나 따뜻한 느낌의 키워드를 고를 것\n"
+            "- 각 키워드는 한 단어, 명사 형태로 작성할 것\n"
+            "- 일기 분위기가 우울하면 '위로', '평화' 같은 키워드를 사용해도 좋아\n"
+            "- 서로 다른 키워드를 고를 것 (앞의 키워드로 곡을 못 찾으면 다음 키워드로 검색함)\n\n"
+            "아래 JSON 형식으로만 응답해:\n"
+            "{format_instructions}\n\n"
+            "📝 사용자 일기: '''{diary_body}'''"
+        )
+    )
+
+
+def get_music_reason_prompt() -> PromptTemplate:
+    """음악 추천 빠른 경로: 고른 곡의 추천 이유를 쓰기 위한 프롬프트 반환"""
+    return PromptTemplate(
+        input_variables=["diary_body", "keyword", "title", "artist"],
+        template=(
+            "너는 사용자의 일기를 읽고 음악을 추천해주는 비밀 친구야.\n"
+            "일기의 '{keyword}' 분위기에 맞춰 {artist}의 '{title}'을(를) 골랐어.\n"
+            "이 곡을 추천하는 이유를 친구가 해주는 듯한 따뜻한 반말로, 공감하며 한두 문장으로 작성해줘.\n"
+            "이유 외의 다른 문장이나 설명은 출력하지 마.\n\n"
+            "📝 사용자 일기: '''{diary_body}'''"
+        )
+    )
@@ -0,0 +1,211 @@
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+import json
+import math
+import threading
+
+from pydantic import BaseModel, Field
+
+from agents.core.models import CoreEmotionType, QuoteResponse, emotion_keyword_map
+from agents.core.text import TOKEN_PATTERN, char_ngrams
+
+# 기본 명언 코퍼스 (출처가 분명한 명언만 수록)
+DEFAULT_QUOTES_PATH = Path(__file__).resolve().parent / "data" / "quotes.json"
+
+# 키워드 추출 시 떼어낼 조사/어미 (긴 것부터 검사)
+_SUFFIXES = sorted(
+    ["에서", "에게", "으로", "이랑", "하고", "했다", "였다", "이다", "은", "는", "이", "가", "을", "를",
+     "에", "와", "과", "도", "로", "의", "랑", "만"],
+    key=len,
+    reverse=True,
+)
+_STOPWORDS = {"오늘", "정말", "너무", "그리고", "하지만", "그래서", "나는", "내가", "있었다", "했다", "같다", "들었다", "느꼈다", "것", "수", "때"}
+
+
+def _sublinear_tf(tf: float) -> float:
+    return 1 + math.log(tf) if tf >= 1 else tf
+
+
+def _strip_suffix(token: str) -> str:
+    for suffix in _SUFFIXES:
+        if len(token) > len(suffix) + 1 and token.endswith(suffix):
+            return token[: -len(suffix)]
+    return token
+
+
+def extract_keywords(text: str, top_k: int = 8) -> List[str]:
+    """일기 본문에서 자주 등장하는 어절(조사 제거)을 키워드로 추출"""
+    counts = Counter(
+        stem
+        for stem in (_strip_suffix(token) for token in TOKEN_PATTERN.findall(text))
+        if len(stem) >= 2 and stem not in _STOPWORDS
+    )
+    return [word for word, _ in counts.most_common(top_k)]
+
+
+def detect_emotions(text: str) -> List[CoreEmotionType]:
+    """emotion_keyword_map의 키워드 어간이 본문에 등장하는 핵심 감정 목록 반환"""
+    detected = []
+    for emotion, keywords in emotion_keyword_map.items():
+        stems = [emotion] + [keyword[:-1] if len(keyword) > 2 else keyword for keyword in keywords]
+        if any(stem in text for stem in stems):
+            detected.append(emotion)
+    return detected
+
+
+class QuoteRecord(BaseModel):
+    """
+    명언 인덱스에 저장되는 항목입니다.
+
+    Attributes:
+        quote (str): 명언 텍스트.
+        author (str): 명언을 남긴 사람의 이름 (출처).
+        explanation (str): 명언에 대한 따뜻한 설명.
+        emotions (List[CoreEmotionType]): 명언이 어울리는 핵심 감정 목록.
+        keywords (List[str]): 명언이 어울리는 상황 키워드 목록.
+    """
+    quote: str = Field(..., description="명언")
+    author: str = Field(..., description="명언 출처(말한 사람)")
+    explanation: str = Field(default="", description="명언에 대한 설명")
+    emotions: List[CoreEmotionType] = Field(default_factory=list, description="어울리는 핵심 감정")
+    keywords: List[str] = Field(default_factory=list, description="어울리는 상황 키워드")
+
+    def to_response(self) -> QuoteResponse:
+        return QuoteResponse(quote=self.quote, author=self.author, explanation=self.explanation)
+
+
+class QuoteIndex:
+    """
+    감정/키워드 기반 로컬 명언 인덱스 (TF-IDF + 역색인)
+    - 각 명언의 키워드와 감정 키워드를 글자 2-gram으로 쪼개 역색인에 저장
+    - 일기 본문과의 코사인 유사도로 후보를 정렬하고, min_score 이상일 때만 '확신 있는 매칭'으로 판단
+    - 검증된 QuoteResponse를 add_response로 계속 추가해 코퍼스를 키워나갈 수 있음
+
+    Attributes:
+        min_score (float): best_match가 결과를 반환하기 위한 최소 유사도.
+    """
+
+    # 감정 키워드는 상황 키워드보다 낮은 가중치로 반영
+    EMOTION_TERM_WEIGHT = 0.5
+
+    def __init__(self, records: Iterable[QuoteRecord] = (), min_score: float = 0.35):
+        self.min_score = min_score
+        self._records: List[QuoteRecord] = []
+        self._seen: set = set()
+        self._lock = threading.Lock()
+        self._build([])
+        self.extend(records)
+
+    @classmethod
+    def load(cls, path: str | Path = DEFAULT_QUOTES_PATH, **kwargs) -> "QuoteIndex":
+        """JSON 파일(QuoteRecord 리스트)에서 인덱스 생성"""
+        with open(path, encoding="utf-8") as f:
+            records = [QuoteRecord.model_validate(item) for item in json.load(f)]
+        return cls(records, **kwargs)
+
+    def save(self, path: str | Path) -> None:
+        with self._lock:
+            payload = [record.model_dump() for record in self._records]
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(payload, f, ensure_ascii=False, indent=2)
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    @staticmethod
+    def _normalize(quote: str) -> str:
+        return "".join(TOKEN_PATTERN.findall(quote.lower()))
+
+    def _record_terms(self, record: QuoteRecord) -> Counter:
+        terms = Counter()
+        for keyword in record.keywords:
+            terms.update(char_ngrams(keyword))
+        for emotion in record.emotions:
+            for gram in char_ngrams(" ".join([emotion] + emotion_keyword_map.get(emotion, []))):
+                terms[gram] += self.EMOTION_TERM_WEIGHT
+        return terms
+
+    def _build(self, records: List[QuoteRecord]) -> None:
+        """전체 레코드로 역색인/IDF/문서 노름을 다시 계산"""
+        record_terms = [self._record_terms(record) for record in records]
+
+        doc_freq = Counter()
+        for terms in record_terms:
+            doc_freq.update(terms.keys())
+
+        n_docs = len(records)
+        idf = {term: math.log((1 + n_docs) / (1 + df)) + 1.0 for term, df in doc_freq.items()}
+
+        postings = defaultdict(list)
+        norms = []
+        for doc_id, terms in enumerate(record_terms):
+            weights = {term: _sublinear_tf(tf) * idf[term] for term, tf in terms.items()}
+            norms.append(math.sqrt(sum(w * w for w in weights.values())) or 1.0)
+            for term, weight in weights.items():
+                postings[term].append((doc_id, weight))
+
+        self._idf = idf
+        self._postings = dict(postings)
+        self._norms = norms
+
+    def add(self, record: QuoteRecord) -> bool:
+        """명언 추가 (같은 명언이 이미 있으면 무시하고 False 반환)"""
+        return self.extend([record]) > 0
+
+    def extend(self, records: Iterable[QuoteRecord]) -> int:
+        with self._lock:
+            added = 0
+            for record in records:
+                key = self._normalize(record.quote)
+                if not key or key in self._seen or not record.author.strip():
+                    continue
+                self._seen.add(key)
+                self._records.append(record)
+                added += 1
+            if added:
+                self._build(self._records)
+            return added
+
+    def add_response(self, response: QuoteResponse, diary: str) -> bool:
+        """검증된 QuoteResponse를 해당 일기의 감정/키워드로 태깅해 인덱스에 추가"""
+        return self.add(
+            QuoteRecord(
+                quote=response.quote,
+                author=response.author,
+                explanation=response.explanation,
+                emotions=detect_emotions(diary),
+                keywords=extract_keywords(diary),
+            )
+        )
+
+    def search(self, text: str, k: int = 3) -> List[Tuple[float, QuoteRecord]]:
+        """일기 본문과 유사한 명언 상위 k개를 (유사도, 명언) 형태로 반환"""
+        with self._lock:
+            postings, idf, norms, records = self._postings, self._idf, self._norms, list(self._records)
+
+        query = Counter(gram for gram in char_ngrams(text) if gram in postings)
+        if not query:
+            return []
+
+        query_weights = {term: _sublinear_tf(tf) * idf[term] for term, tf in query.items()}
+        query_norm = math.sqrt(sum(w * w for w in query_weights.values()))
+
+        scores = defaultdict(float)
+        for term, q_weight in query_weights.items():
+            for doc_id, d_weight in postings[term]:
+                scores[doc_id] += q_weight * d_weight
+
+        ranked = sorted(
+            ((score / (query_norm * norms[doc_id]), records[doc_id]) for doc_id, score in scores.items()),
+            key=lambda item: item[0],
+            reverse=True,
+        )
+        return ranked[:k]
+
+    def best_match(self, text: str) -> Optional[QuoteResponse]:
+        """유사도가 min_score 이상인 가장 좋은 명언을 반환, 없으면 None"""
+        results = self.search(text, k=1)
+        if results and results[0][0] >= self.min_score:
+            return results[0][1].to_response()
+        return None
@@ -1,39 +1,63 @@
-from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+import asyncio
+import random
+
+from langchain_core.exceptions import OutputParserException
 from langchain_core.output_parsers import PydanticOutputParser
-from langchain.prompts import ChatPromptTemplate
 
 from .prompts import *
 
-from agents.core import *
-
-class BaseNode(ABC):
-    def __init__(self, **kwargs):
-        self.name = "BaseNode"
-        self.verbose = False
-        if "verbose" in kwargs:
-            self.verbose = kwargs["verbose"]
-
-    @abstractmethod
-    def execute(self, state: SecretFriendState) -> SecretFriendState:
-        pass
-
-    def logging(self, method_name, **kwargs):
-        if self.verbose:
-            print(f"[{self.name}] {method_name}")
-            for key, value in kwargs.items():
-                print(f"{key}: {value}")
-
-    def __call__(self, state: SecretFriendState):
-        return self.execute(state)
-
+from agents.core.models import MusicKeywords, MusicResponse, QuoteResponse, MBTIFeedbackResponse
+from agents.core.nodes import BaseNode
+from agents.core.ratelimit import rate_limited
+from agents.core.states import SecretFriendState
 
 class MusicRecommendationNode(BaseNode):
-    """음악 추천을 담당하는 노드"""
-    
-    def __init__(self, music_agent_executor, **kwargs):
+    """
+    음악 추천을 담당하는 노드
+
+    mode:
+        - "agent": music_agent_executor가 키워드 선택 → spotify_recommender_tool → JSON 작성을 여러 라운드로 반복 (기존 방식)
+        - "direct": LLM 한 번으로 순위가 매겨진 키워드 여러 개를 받고, Spotify(또는 캐시)에서 모두 동시에 검색한 뒤
+          가장 순위가 높은 키워드의 곡을 고르고, 추천 이유를 LLM 한 번(reason="llm") 또는 템플릿(reason="template")으로 작성
+          → LLM 호출은 최대 2회, Spotify 검색은 한 번에 동시 실행이라 지연 시간 상한이 정해짐
+          (키워드 응답을 파싱하지 못하거나 모든 키워드로 곡을 못 찾으면 에이전트가 있을 때만 에이전트로 다시 시도,
+           에이전트가 없으면 파싱 실패 시 FALLBACK_KEYWORD만으로 검색)
+    """
+
+    MODES = ("agent", "direct")
+    REASONS = ("llm", "template")
+    FALLBACK_KEYWORD = "힐링"  # LLM 키워드로 곡을 못 찾을 때를 대비해 함께 검색하는 키워드
+    REASON_TEMPLATE = "오늘 일기 속 '{keyword}' 느낌이랑 잘 어울리는 곡이라 골라봤어. {artist}의 '{title}' 들으면서 편하게 하루 마무리해!"
+
+    def __init__(
+        self,
+        music_agent_executor=None,
+        llm=None,
+        spotify_tool=None,
+        mode: str = "agent",
+        reason: str = "llm",
+        max_keywords: int = 3,
+        **kwargs,
+    ):
         super().__init__(**kwargs)
         self.name = "MusicRecommendationNode"
         self.music_agent_executor = music_agent_executor
+
+        if mode not in self.MODES:
+            raise ValueError(f"지원하지 않는 mode입니다: {mode} (가능한 값: {', '.join(self.MODES)})")
+        if reason not in self.REASONS:
+            raise ValueError(f"지원하지 않는 reason입니다: {reason} (가능한 값: {', '.join(self.REASONS)})")
+        if mode == "agent" and music_agent_executor is None:
+            raise ValueError("agent 모드에는 music_agent_executor가 필요합니다.")
+        if mode == "direct" and llm is None:
+            raise ValueError("direct 모드에는 llm이 필요합니다.")
+        self.mode = mode
+        self.reason = reason
+        self.max_keywords = max_keywords
+        self.llm = rate_limited(llm) if llm is not None else None
+        self.spotify_tool = spotify_tool
         
         # Pydantic 파서 초기화
         self.music_parser = PydanticOutputParser(pydantic_object=MusicResponse)
@@ -43,16 +67,141 @@ class MusicRecommendationNode(BaseNode):
             format_instructions=self.music_parser.get_format_instructions()
         )
 
-    def execute(self, state: SecretFriendState) -> SecretFriendState:
-        """음악 추천 실행""" 
+        # direct 모드용 파서 / 프롬프트
+        self.keywords_parser = PydanticOutputParser(pydantic_object=MusicKeywords)
+        self.keywords_prompt = get_music_keywords_prompt(
+            format_instructions=self.keywords_parser.get_format_instructions()
+        )
+        self.reason_prompt = get_music_reason_prompt()
+
+    def _get_spotify_tool(self):
+        if self.spotify_tool is None:
+            # Spotify 클라이언트 설정은 direct 모드를 처음 실행할 때 로드
+            from agents.core.tools import SpotifyTool
+            self.spotify_tool = SpotifyTool()
+        return self.spotify_tool
+
+    def _keywords(self, response) -> Optional[list]:
+        """LLM이 준 키워드를 순서대로 정리 (중복 / 빈 값 제거) + 대비용 키워드, 응답을 파싱하지 못하면 None"""
+        try:
+            parsed = self.keywords_parser.parse(response.content)
+        except OutputParserException as exc:
+            self.logging("keywords parse error", error=exc)
+            return None
+
+        keywords = []
+        for keyword in parsed.keywords:
+            keyword = keyword.strip()
+            if keyword and keyword not in keywords:
+                keywords.append(keyword)
+        keywords = keywords[:self.max_keywords]
+        if self.FALLBACK_KEYWORD not in keywords:
+            keywords.append(self.FALLBACK_KEYWORD)
+        self.logging("keywords", keywords=keywords)
+        return keywords
+
+    @staticmethod
+    def _choose(keywords: list, results: list):
+        """순위가 가장 높은, 곡이 있는 키워드에서 무작위로 한 곡 선택 (검색 실패한 키워드는 건너뜀)"""
+        for keyword, candidates in zip(keywords, results):
+            if isinstance(candidates, BaseException) or not candidates:
+                continue
+            return keyword, random.choice(candidates)
+        return None, None
+
+    def _build_reason_input(self, diary: str, keyword: str, track: dict) -> list:
+        return [self.reason_prompt.format(diary_body=diary, keyword=keyword, title=track["title"], artist=track["artist"])]
+
+    def _to_state(self, track: dict, reason: str) -> SecretFriendState:
+        return SecretFriendState(
+            music=MusicResponse(title=track["title"], artist=track["artist"], url=track["url"], reason=reason.strip()),
+        )
+
+    @staticmethod
+    def _no_track_error(keywords: list) -> ValueError:
+        return ValueError(f"추천할 곡을 찾지 못했습니다. (키워드: {', '.join(keywords)})")
+
+    def _execute_agent(self, diary: str) -> SecretFriendState:
         # music_agent_executor를 사용하여 음악 추천 실행
-        raw = self.music_agent_executor.invoke({"input": state['diary_body']})
+        raw = self.music_agent_executor.invoke({"input": diary})
         # 추천 결과 파싱
         music_resp = self.music_parser.parse(raw['output'])
         return SecretFriendState(
             music=music_resp,
         )
 
+    async def _aexecute_agent(self, diary: str) -> SecretFriendState:
+        raw = await self.music_agent_executor.ainvoke({"input": diary})
+        music_resp = self.music_parser.parse(raw['output'])
+        return SecretFriendState(
+            music=music_resp,
+        )
+
+    def _execute_direct(self, diary: str) -> SecretFriendState:
+        keywords = self._keywords(self.llm.invoke([self.keywords_prompt.format(diary_body=diary)]))
+        if keywords is None:
+            if self.music_agent_executor is not None:
+                return self._execute_agent(diary)
+            keywords = [self.FALLBACK_KEYWORD]
+
+        # 모든 키워드를 동시에 검색 (캐시에 있는 키워드는 바로 반환)
+        tool = self._get_spotify_tool()
+
+        def search(keyword: str):
+            try:
+                return tool.search_candidates(keyword)
+            except Exception as exc:
+                return exc
+
+        with ThreadPoolExecutor(max_workers=len(keywords)) as executor:
+            results = list(executor.map(search, keywords))
+
+        keyword, track = self._choose(keywords, results)
+        if track is None:
+            if self.music_agent_executor is not None:
+                return self._execute_agent(diary)
+            raise self._no_track_error(keywords)
+
+        if self.reason == "template":
+            reason = self.REASON_TEMPLATE.format(keyword=keyword, **track)
+        else:
+            reason = self.llm.invoke(self._build_reason_input(diary, keyword, track)).content
+        return self._to_state(track, reason)
+
+    async def _aexecute_direct(self, diary: str) -> SecretFriendState:
+        keywords = self._keywords(await self.llm.ainvoke([self.keywords_prompt.format(diary_body=diary)]))
+        if keywords is None:
+            if self.music_agent_executor is not None:
+                return await self._aexecute_agent(diary)
+            keywords = [self.FALLBACK_KEYWORD]
+
+        tool = self._get_spotify_tool()
+        results = await asyncio.gather(*(tool.asearch_candidates(keyword) for keyword in keywords), return_exceptions=True)
+
+        keyword, track = self._choose(keywords, results)
+        if track is None:
+            if self.music_agent_executor is not None:
+                return await self._aexecute_agent(diary)
+            raise self._no_track_error(keywords)
+
+        if self.reason == "template":
+            reason = self.REASON_TEMPLATE.format(keyword=keyword, **track)
+        else:
+            reason = (await self.llm.ainvoke(self._build_reason_input(diary, keyword, track))).content
+        return self._to_state(track, reason)
+
+    def execute(self, state: SecretFriendState) -> SecretFriendState:
+        """음악 추천 실행""" 
+        if self.mode == "direct":
+            return self._execute_direct(state['diary_body'])
+        return self._execute_agent(state['diary_body'])
+
+    async def aexecute(self, state: SecretFriendState) -> SecretFriendState:
+        """음악 추천 비동기 실행"""
+        if self.mode == "direct":
+            return await self._aexecute_direct(state['diary_body'])
+        return await self._aexecute_agent(state['diary_body'])
+
     def get_prompt(self):
         """프롬프트 반환 (외부에서 사용할 때)"""
         return self.music_chat_prompt
@@ -63,12 +212,18 @@ class MusicRecommendationNode(BaseNode):
 
 
 class QuoteRecommendationNode(BaseNode):
-    """명언 추천을 담당하는 노드"""
+    """
+    명언 추천을 담당하는 노드
+    - quote_index가 주어지면 로컬 명언 인덱스에서 먼저 찾고, 확신 있는 매칭이 없을 때만 웹 검색 에이전트 사용
+    - learn=True이면 웹 검색으로 얻은(파싱 검증된) 명언을 인덱스에 추가
+    """
     
-    def __init__(self, quote_agent_executor, **kwargs):
+    def __init__(self, quote_agent_executor, quote_index=None, learn: bool = True, **kwargs):
         super().__init__(**kwargs)
         self.name = "QuoteRecommendationNode"
         self.quote_agent_executor = quote_agent_executor
+        self.quote_index = quote_index
+        self.learn = learn
         
         # Pydantic 파서 초기화
         self.quote_parser = PydanticOutputParser(pydantic_object=QuoteResponse)
@@ -78,12 +233,45 @@ class QuoteRecommendationNode(BaseNode):
             format_instructions=self.quote_parser.get_format_instructions()
         )
 
+    def _lookup(self, diary: str):
+        if self.quote_index is None:
+            return None
+        quote_resp = self.quote_index.best_match(diary)
+        if quote_resp is not None:
+            self.logging("local quote index hit", author=quote_resp.author)
+        return quote_resp
+
+    def _remember(self, quote_resp: QuoteResponse, diary: str) -> None:
+        if self.quote_index is not None and self.learn:
+            self.quote_index.add_response(quote_resp, diary)
+
     def execute(self, state: SecretFriendState) -> SecretFriendState:
         """명언 추천 실행"""
-        # quote_agent_executor를 사용하여 명언 추천 실행
-        raw = self.quote_agent_executor.invoke({"input": state['diary_body']})
-        # 추천 결과 파싱
-        quote_resp = self.quote_parser.parse(raw['output'])
+        diary = state['diary_body']
+
+        # 로컬 인덱스에서 확신 있는 매칭이 있으면 웹 검색 생략
+        quote_resp = self._lookup(diary)
+        if quote_resp is None:
+            # quote_agent_executor를 사용하여 명언 추천 실행
+            raw = self.quote_agent_executor.invoke({"input": diary})
+            # 추천 결과 파싱
+            quote_resp = self.quote_parser.parse(raw['output'])
+            self._remember(quote_resp, diary)
+
+        return SecretFriendState(
+            quote=quote_resp,
+        )
+
+    async def aexecute(self, state: SecretFriendState) -> SecretFriendState:
+        """명언 추천 비동기 실행"""
+        diary = state['diary_body']
+
+        quote_resp = self._lookup(diary)
+        if quote_resp is None:
+            raw = await self.quote_agent_executor.ainvoke({"input": diary})
+            quote_resp = self.quote_parser.parse(raw['output'])
+            self._remember(quote_resp, diary)
+
         return SecretFriendState(
             quote=quote_resp,
         )
@@ -103,7 +291,7 @@ class PraiseNode(BaseNode):
     def __init__(self, llm, **kwargs):
         super().__init__(**kwargs)
         self.name = "PraiseNode"
-        self.llm = llm
+        self.llm = rate_limited(llm)
         
         self.praise_prompt = get_praise_prompt()
 
@@ -118,27 +306,77 @@ class PraiseNode(BaseNode):
             praise=response.content.strip(),
         )
 
+    async def aexecute(self, state: SecretFriendState) -> SecretFriendState:
+        """칭찬 생성 비동기 실행"""
+        diary = state['diary_body']
+
+        response = await self.llm.ainvoke([self.praise_prompt.format(diary_body=diary)])
+
+        return SecretFriendState(
+            praise=response.content.strip(),
+        )
+
     def get_prompt(self):
         """프롬프트 반환 (외부에서 사용할 때)"""
         return self.praise_prompt
 
 
 class MBTIFeedbackNode(BaseNode):
-    """MBTI 성향별 피드백 생성을 담당하는 노드"""
+    """
+    MBTI 성향별 피드백 생성을 담당하는 노드
+
+    mode:
+        - "sequential": F → T 순서로 LLM을 두 번 호출 (기존 방식)
+        - "batch": 두 프롬프트를 llm.batch로 동시에 호출 (기본값)
+        - "combined": 한 번의 호출로 F/T 피드백을 JSON으로 함께 생성
+    """
+
+    MODES = ("sequential", "batch", "combined")
     
-    def __init__(self, llm, **kwargs):
+    def __init__(self, llm, mode: str = "batch", **kwargs):
         super().__init__(**kwargs)
         self.name = "MBTIFeedbackNode"
-        self.llm = llm
+        self.llm = rate_limited(llm)
+
+        if mode not in self.MODES:
+            raise ValueError(f"지원하지 않는 mode입니다: {mode} (가능한 값: {', '.join(self.MODES)})")
+        self.mode = mode
         
         # MBTI 피드백 프롬프트 템플릿들
         self.f_feedback_prompt = get_f_feedback_prompt()
         self.t_feedback_prompt = get_t_feedback_prompt()
 
+        # combined 모드용 파서 / 프롬프트
+        self.feedback_parser = PydanticOutputParser(pydantic_object=MBTIFeedbackResponse)
+        self.feedback_prompt = get_mbti_feedback_prompt(
+            format_instructions=self.feedback_parser.get_format_instructions()
+        )
+
+    def _build_inputs(self, diary: str) -> list:
+        return [
+            [self.f_feedback_prompt.format(diary_body=diary)],
+            [self.t_feedback_prompt.format(diary_body=diary)],
+        ]
+
+    def _to_state(self, f_feedback: str, t_feedback: str) -> SecretFriendState:
+        return SecretFriendState(
+            F_feedback=f_feedback.strip(),
+            T_feedback=t_feedback.strip(),
+        )
+
     def execute(self, state: SecretFriendState) -> SecretFriendState:
         """MBTI 피드백 생성 실행"""
         
         diary = state['diary_body']
+
+        if self.mode == "combined":
+            response = self.llm.invoke([self.feedback_prompt.format(diary_body=diary)])
+            feedback = self.feedback_parser.parse(response.content)
+            return self._to_state(feedback.F_feedback, feedback.T_feedback)
+
+        if self.mode == "batch":
+            f_resp, t_resp = self.llm.batch(self._build_inputs(diary))
+            return self._to_state(f_resp.content, t_resp.content)
         
         # F 유형 위로 메시지 생성
         f_resp = self.llm.invoke([self.f_feedback_prompt.format(diary_body=diary)])
@@ -146,10 +384,25 @@ class MBTIFeedbackNode(BaseNode):
         # T 유형 조언 메시지 생성
         t_resp = self.llm.invoke([self.t_feedback_prompt.format(diary_body=diary)])
         
-        return SecretFriendState(
-            F_feedback=f_resp.content.strip(),
-            T_feedback=t_resp.content.strip(),
-        )
+        return self._to_state(f_resp.content, t_resp.content)
+
+    async def aexecute(self, state: SecretFriendState) -> SecretFriendState:
+        """MBTI 피드백 비동기 실행"""
+        diary = state['diary_body']
+
+        if self.mode == "combined":
+            response = await self.llm.ainvoke([self.feedback_prompt.format(diary_body=diary)])
+            feedback = self.feedback_parser.parse(response.content)
+            return self._to_state(feedback.F_feedback, feedback.T_feedback)
+
+        if self.mode == "batch":
+            f_resp, t_resp = await self.llm.abatch(self._build_inputs(diary))
+            return self._to_state(f_resp.content, t_resp.content)
+
+        f_resp = await self.llm.ainvoke([self.f_feedback_prompt.format(diary_body=diary)])
+        t_resp = await self.llm.ainvoke([self.t_feedback_prompt.format(diary_body=diary)])
+
+        return self._to_state(f_resp.content, t_resp.content)
 
     def get_f_prompt(self):
         """F 유형 피드백 프롬프트 반환"""
@@ -159,6 +412,10 @@ class MBTIFeedbackNode(BaseNode):
         """T 유형 피드백 프롬프트 반환"""
         return self.t_feedback_prompt
 
+    def get_parser(self):
+        """combined 모드 파서 반환 (외부에서 사용할 때)"""
+        return self.feedback_parser
+
 
 class StartNodeCheck(BaseNode):
     """워크플로우 시작 시 상태 검증을 담당하는 노드"""
@@ -179,71 +436,70 @@ class StartNodeCheck(BaseNode):
 
 
 class LetterMarkdownNode(BaseNode):
-    """비밀친구 편지를 마크다운 형식으로 생성하는 노드"""
-    
-    def __init__(self, **kwargs):
-        super().__init__(**kwargs)
-        self.name = "LetterMarkdownNode"
-
-    def execute(self, state: SecretFriendState) -> SecretFriendState:
-        """마크다운 편지 생성"""
-        
-        # 구조 분해
-        music = state['music']
-        quote = state['quote']
-        praise = state['praise']
-        F_feedback = state['F_feedback']
-        T_feedback = state['T_feedback']
-
-        markdown_content = f"""# 💌 비밀친구의 편지
+    """
+    비밀친구 편지를 마크다운 형식으로 생성하는 노드
+    - 편지는 머리말 + 항목(SECTIONS 순서) + 맺음말을 구분선으로 이은 것
+    - render_section으로 항목 하나만 따로 만들 수 있음 (분기가 끝나는 대로 보여주는 스트리밍용)
+    """
+    # 편지에 들어가는 항목 순서 (SecretFriendState 키)
+    SECTIONS = ("praise", "music", "quote", "F_feedback", "T_feedback")
+    SEPARATOR = "\n---\n\n"
+    HEADER = """# 💌 비밀친구의 편지
 
 너를 위해 작지만 따뜻한 편지를 준비했어.
+"""
+    FOOTER = """비밀친구가 여기 있다는 걸 잊지 마.  
+내일도 네 편이 되어줄게.
 
----
-
-## 🌟 오늘의 칭찬
-
-> {praise}
-
----
-
-## 🎵 오늘의 음악 추천
-
-**{music.title}** - *{music.artist}*  
-🔗 [음악 들으러 가기]({music.url})  
-_👉 {music.reason}_
-
----
-
-## 📝 오늘의 명언
-
-> “{quote.quote}”  
-> — *{quote.author}*  
-{quote.explanation}
-
----
-
-## 🌷 F의 위로
+다 잘 될 거야! ☁️
+잘 자.
 
-{F_feedback}
+— 너의 비밀친구가 -
+"""
 
----
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.name = "LetterMarkdownNode"
 
-## 🧭 T의 조언
+    @staticmethod
+    def render_section(key: str, value) -> str:
+        """편지 항목 하나를 마크다운으로 변환 (key는 SECTIONS 중 하나)"""
+        if key == "praise":
+            return f"""## 🌟 오늘의 칭찬
 
-{T_feedback}
+> {value}
+"""
+        if key == "music":
+            return f"""## 🎵 오늘의 음악 추천
 
----
+**{value.title}** - *{value.artist}*  
+🔗 [음악 들으러 가기]({value.url})  
+_👉 {value.reason}_
+"""
+        if key == "quote":
+            return f"""## 📝 오늘의 명언
 
-비밀친구가 여기 있다는 걸 잊지 마.  
-내일도 네 편이 되어줄게.
+> “{value.quote}”  
+> — *{value.author}*  
+{value.explanation}
+"""
+        if key == "F_feedback":
+            return f"""## 🌷 F의 위로
 
-다 잘 될 거야! ☁️
-잘 자.
+{value}
+"""
+        if key == "T_feedback":
+            return f"""## 🧭 T의 조언
 
-— 너의 비밀친구가 -
+{value}
 """
+        raise KeyError(f"알 수 없는 편지 항목입니다: {key}")
+
+    def execute(self, state: SecretFriendState) -> SecretFriendState:
+        """마크다운 편지 생성"""
+        sections = [self.render_section(key, state[key]) for key in self.SECTIONS]
+        markdown_content = self.SEPARATOR.join([self.HEADER, *sections, self.FOOTER])
 
         return SecretFriendState(
             letter_markdown=markdown_content,
-        )
\ No newline at end of file
+        )
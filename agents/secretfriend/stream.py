@@ -0,0 +1,69 @@
+from typing import Any, AsyncIterator, Dict, Iterator, Optional
+import time
+
+from langchain_core.runnables import RunnableConfig
+from pydantic import BaseModel, Field
+
+from .secretfriend_nodes import LetterMarkdownNode
+
+LETTER_KEY = "letter_markdown"
+
+
+class LetterStreamEvent(BaseModel):
+    """
+    편지 스트리밍에서 내보내는 항목 하나입니다.
+
+    Attributes:
+        key (str): 항목 이름 ("praise" / "music" / "quote" / "F_feedback" / "T_feedback",
+            마지막은 완성된 편지 "letter_markdown").
+        markdown (str): 항목 마크다운 (마지막 이벤트는 편지 전체).
+        elapsed (float): 실행 시작 후 이 항목이 나오기까지 걸린 시간(초).
+    """
+    key: str = Field(..., description="항목 이름")
+    markdown: str = Field(..., description="항목 마크다운")
+    elapsed: float = Field(..., description="시작 후 경과 시간(초)")
+
+    @property
+    def is_final(self) -> bool:
+        return self.key == LETTER_KEY
+
+
+def _events(update: Dict[str, Any], start: float) -> Iterator[LetterStreamEvent]:
+    """노드별 상태 변경(stream_mode="updates")에서 편지 항목 이벤트 추출"""
+    elapsed = time.perf_counter() - start
+    for values in update.values():
+        if not values:
+            continue
+        # mbti_feedback 분기는 F / T 두 항목을 함께 반환하므로 편지 순서대로 내보냄
+        for key in LetterMarkdownNode.SECTIONS:
+            if key in values:
+                yield LetterStreamEvent(
+                    key=key, markdown=LetterMarkdownNode.render_section(key, values[key]), elapsed=elapsed
+                )
+        if LETTER_KEY in values:
+            yield LetterStreamEvent(key=LETTER_KEY, markdown=values[LETTER_KEY], elapsed=elapsed)
+
+
+async def astream_letter(
+    letter_graph, diary_body: str, config: Optional[RunnableConfig] = None
+) -> AsyncIterator[LetterStreamEvent]:
+    """
+    letter_graph를 실행하며 분기(music / quote / praise / mbti_feedback)가 끝나는 대로 편지 항목을 내보냄
+    - 보통 칭찬이 가장 먼저 나오고, 웹 검색 / Spotify 에이전트 항목이 뒤따름
+    - 마지막 이벤트는 완성된 편지 (key="letter_markdown", is_final=True)
+
+    예)
+        async for event in astream_letter(letter_graph, diary_body):
+            show(event.markdown)  # 항목은 도착 순서대로, 최종 편지는 SECTIONS 순서로 정렬됨
+    """
+    start = time.perf_counter()
+    async for update in letter_graph.astream({"diary_body": diary_body}, config, stream_mode="updates"):
+        for event in _events(update, start):
+            yield event
+
+
+def stream_letter(letter_graph, diary_body: str, config: Optional[RunnableConfig] = None) -> Iterator[LetterStreamEvent]:
+    """astream_letter의 동기 버전 (분기는 스레드에서 병렬 실행)"""
+    start = time.perf_counter()
+    for update in letter_graph.stream({"diary_body": diary_body}, config, stream_mode="updates"):
+        yield from _events(update, start)
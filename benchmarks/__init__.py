@@ -0,0 +1 @@
+# 외부 API 키 없이 실행 가능한 성능 측정 스크립트 모음
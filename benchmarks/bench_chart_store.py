@@ -0,0 +1,163 @@
+"""
+ChartArtifactStore 동작 확인 (가짜 렌더러, 임시 폴더)
+
+- protect:  저장소 폴더에 다른 파일(커밋된 emotion_charts/*.png 복사본 등)이 섞여 있어도
+            cleanup은 저장소가 만든 {kind}_{hash}.{format} 파일만 삭제
+- defaults: 기본 설정(max_age / max_bytes 없음)에서는 오래된 차트도 삭제하지 않음
+            (저장된 일기의 emotion_*_chart_url이 계속 유효해야 함)
+- temps:    렌더링 도중 워커가 죽어 남은 임시 파일은 STALE_TEMP_AGE가 지나면 cleanup이 삭제
+            (아직 쓰고 있을 수 있는 새 임시 파일은 유지)
+- pool:     프로세스 풀(get_chart_process_pool)에서 캐시 미스 렌더링 N건 → 워커가 받는 저장소 사본도
+            cleanup_interval을 지켜 폴더를 다시 정리하지 않음 (정리 마커 파일 시각이 그대로)
+- race:     get_or_render를 여러 스레드에서 돌리는 동안 다른 스레드가 계속 cleanup(max_age=0)
+            → 캐시 적중 직후 파일이 지워져도 FileNotFoundError 없이 다시 렌더링
+각 항목은 조건을 assert로 확인하고, 실패하면 예외로 종료
+
+실행: python -m benchmarks.bench_chart_store [ITERATIONS]
+"""
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from agents import ChartArtifactStore, get_chart_process_pool
+from agents.diary.chart_store import CLEANUP_MARKER, STALE_TEMP_AGE, render_chart_locations
+from agents.diary.diary_nodes import CHART_OUTPUT_DIR
+
+ITERATIONS = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+THREADS = 4
+COMMITTED_CHARTS = CHART_OUTPUT_DIR
+
+
+class CountingRenderer:
+    """렌더링 대신 작은 bytes를 쓰고 호출 수만 세는 렌더러"""
+
+    def __init__(self):
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def render(self, kind, data, fp, format="png"):
+        with self._lock:
+            self.calls += 1
+        fp.write(f"{kind}:{format}".encode())
+
+
+class BytesRenderer:
+    """프로세스 풀로 넘길 수 있는(Lock 없는) 가짜 렌더러"""
+
+    def render(self, kind, data, fp, format="png"):
+        fp.write(f"{kind}:{format}".encode())
+
+
+def chart_data(i: int) -> dict:
+    return {
+        "emotion_counts": {"기쁨": i % 3 + 1, "슬픔": 1},
+        "time_labels": ["09:00", "12:00"],
+        "emotion_indices": [0, 1],
+        "emotion_scores": [i % 5, 3],
+    }
+
+
+def check_protect() -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        root = Path(directory)
+        committed = sorted(COMMITTED_CHARTS.glob("*.png"))
+        for path in committed:
+            shutil.copy(path, root / path.name)
+        (root / "notes.txt").write_text("keep")
+
+        store = ChartArtifactStore(root, max_age=0, cleanup_interval=float("inf"))
+        renderer = CountingRenderer()
+        for i in range(3):
+            store.get_or_render("pie", chart_data(i), renderer)
+        removed = store.cleanup()
+        left = sorted(p.name for p in root.iterdir() if p.name != CLEANUP_MARKER)
+        print(f"protect committed={len(committed)} rendered={renderer.calls} removed={removed} left={left}")
+        assert removed == renderer.calls
+        assert left == sorted([p.name for p in committed] + ["notes.txt"])
+
+
+def check_defaults() -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        store = ChartArtifactStore(directory)
+        renderer = CountingRenderer()
+        paths = [store.get_or_render("score", chart_data(i), renderer) for i in range(3)]
+        year_ago = time.time() - 60 * 60 * 24 * 365
+        for path in paths:
+            os.utime(path, (year_ago, year_ago))
+        removed = store.cleanup()
+        print(f"defaults max_age={store.max_age} max_bytes={store.max_bytes} year-old charts={len(paths)} removed={removed}")
+        assert removed == 0 and all(path.exists() for path in paths)
+
+
+def check_temps() -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        root = Path(directory)
+        stale, fresh = root / "tmpk1l2m3n4.png.tmp", root / "tmpa5b6c7d8.svg.tmp"
+        stale.write_bytes(b"half")
+        fresh.write_bytes(b"half")
+        old = time.time() - STALE_TEMP_AGE - 60
+        os.utime(stale, (old, old))
+        removed = ChartArtifactStore(root).cleanup()
+        print(f"temps   stale={stale.exists()} fresh={fresh.exists()} removed={removed}")
+        assert removed == 1 and not stale.exists() and fresh.exists()
+
+
+def check_pool() -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        store = ChartArtifactStore(directory, max_age=60 * 60, cleanup_interval=300)
+        ChartArtifactStore(directory).cleanup()  # 다른 프로세스가 방금 정리한 상태 (store 자신은 정리한 적 없음)
+        marker = Path(directory) / CLEANUP_MARKER
+        before = marker.stat().st_mtime_ns
+        time.sleep(0.05)
+        pool = get_chart_process_pool()
+        renders = 0
+        for i in range(ITERATIONS // 100):
+            locations = pool.submit(render_chart_locations, store, BytesRenderer(), chart_data(i)).result()
+            renders += len(locations)
+        after = marker.stat().st_mtime_ns
+        print(f"pool    {renders} cache-miss renders in spawn workers → marker {'unchanged' if after == before else 'touched'}")
+        assert after == before
+
+
+def check_race() -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        store = ChartArtifactStore(directory, max_age=0, cleanup_interval=float("inf"))
+        renderer = CountingRenderer()
+        data = chart_data(0)
+        done = threading.Event()
+        cleanups = 0
+
+        def clean_forever():
+            nonlocal cleanups
+            while not done.is_set():
+                store.cleanup()
+                cleanups += 1
+
+        cleaner = threading.Thread(target=clean_forever)
+        cleaner.start()
+        try:
+            with ThreadPoolExecutor(THREADS) as pool:
+                paths = list(pool.map(lambda _: store.get_or_render("flow", data, renderer), range(ITERATIONS)))
+        finally:
+            done.set()
+            cleaner.join()
+        print(f"race    {ITERATIONS} get_or_render calls, {cleanups} cleanups → renders={renderer.calls}")
+        assert len(paths) == ITERATIONS and len(set(paths)) == 1
+
+
+def main() -> None:
+    check_protect()
+    check_defaults()
+    check_temps()
+    check_pool()
+    check_race()
+    print("ok")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+감정 차트 렌더링 시간 측정 (차트 종류별, pyplot 방식 vs EmotionChartRenderer)
+
+실행: python -m benchmarks.bench_charts
+"""
+import io
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import matplotlib
+
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+
+from agents.diary.charts import EmotionChartRenderer, emotion_colors, emotion_to_index, prepare_chart_data
+from benchmarks.bench_diary_body import make_entries
+
+ROUNDS = 20
+THREADS = 4
+
+
+def legacy_render(kind: str, data: dict, fp) -> None:
+    """기존 GenerateEmotionChartsNode의 pyplot 기반 렌더링 (폰트 설정 포함)"""
+    plt.rcParams["font.family"] = "NanumGothic"
+    plt.rcParams["axes.unicode_minus"] = False
+
+    if kind == "pie":
+        counts = data["emotion_counts"]
+        plt.figure(figsize=(6, 6))
+        plt.pie(counts.values(), labels=counts.keys(), colors=[emotion_colors[e] for e in counts],
+                autopct="%1.1f%%", startangle=140, textprops={"fontsize": 12})
+        plt.title("감정 비율", fontsize=14, fontweight="bold")
+    else:
+        values = data["emotion_indices"] if kind == "flow" else data["emotion_scores"]
+        plt.figure(figsize=(8, 4))
+        plt.plot(data["time_labels"], values, marker="o", linewidth=2)
+        plt.fill_between(data["time_labels"], values, alpha=0.3)
+        if kind == "flow":
+            plt.yticks(list(emotion_to_index.values()), list(emotion_to_index.keys()))
+        else:
+            plt.ylim(0, 100)
+        plt.xlabel("시간", fontsize=11)
+        plt.title("감정", fontsize=14, fontweight="bold")
+        plt.grid(True, linestyle="--", alpha=0.5)
+    plt.tight_layout()
+    plt.savefig(fp)
+    plt.close()
+
+
+def measure(fn) -> float:
+    fn()  # 워밍업 (폰트 캐시/템플릿 생성)
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        fn()
+    return (time.perf_counter() - start) / ROUNDS
+
+
+def main() -> None:
+    data = prepare_chart_data(make_entries(5))
+    renderer = EmotionChartRenderer()
+
+    print(f"{'chart':<8}{'pyplot':>12}{'renderer':>12}")
+    for kind in ("pie", "flow", "score"):
+        legacy = measure(lambda: legacy_render(kind, data, io.BytesIO()))
+        new = measure(lambda: renderer.render(kind, data, io.BytesIO()))
+        print(f"{kind:<8}{legacy * 1000:>10.1f}ms{new * 1000:>10.1f}ms")
+
+    # 여러 스레드에서 동시에 렌더링 (세션 동시 처리 상황)
+    def render_all(_):
+        for kind in ("pie", "flow", "score"):
+            renderer.render(kind, data, io.BytesIO())
+
+    with ThreadPoolExecutor(THREADS) as pool:
+        start = time.perf_counter()
+        list(pool.map(render_all, range(ROUNDS * THREADS)))
+        elapsed = time.perf_counter() - start
+    print(f"{THREADS} threads: {ROUNDS * THREADS} chart sets in {elapsed:.2f}s ({elapsed / (ROUNDS * THREADS) * 1000:.1f}ms/set)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+체크포인터별 메모리/디스크 사용량 비교 (MemorySaver vs SQLiteCheckpointSaver)
+
+State 그래프(info 노드 1개 + 작성 완료 노드)로 세션마다 TURNS번 대화하고,
+절반은 final_markdown을 기록해 '작성 완료' 상태로 끝내는 세션을 SESSIONS개 실행
+- 설정마다 별도 프로세스에서 실행해 RSS 증가량(ru_maxrss)을 비교
+- 가짜 시계를 세션마다 1분씩 진행시켜 TTL 정리가 동작하도록 함
+
+실행: python -m benchmarks.bench_checkpointer [SESSIONS] [TURNS]
+"""
+import os
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.graph import END, START, StateGraph
+
+from agents.core.checkpoint import SQLiteCheckpointSaver
+from agents.core.states import State
+
+SESSIONS = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+TURNS = int(sys.argv[2]) if len(sys.argv) > 2 else 12
+
+USER_TEXT = "번째 답변이야. 오늘은 아침부터 이런저런 일이 있었고, 친구랑 점심을 먹으면서 얘기를 많이 했더니 기분이 꽤 좋아졌어."
+AI_TEXT = "그랬구나! 그때 어떤 기분이 제일 컸는지, 누구랑 함께 있었는지 조금 더 자세히 얘기해줄래?"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_700_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def build_graph(checkpointer):
+    def info(state: State):
+        return {"messages": [AIMessage(content=AI_TEXT)]}
+
+    def finish(state: State):
+        return {"final_markdown": "# 일기\n" + "\n".join(str(m.content) for m in state["messages"][-4:])}
+
+    def route(state: State):
+        return "finish" if state["messages"][-1].content == "q" else "info"
+
+    workflow = StateGraph(State)
+    workflow.add_node("info", info)
+    workflow.add_node("finish", finish)
+    workflow.add_conditional_edges(START, route, ["info", "finish"])
+    workflow.add_edge("info", END)
+    workflow.add_edge("finish", END)
+    return workflow.compile(checkpointer=checkpointer)
+
+
+def make_checkpointer(name: str, path: str, clock: FakeClock):
+    if name == "MemorySaver":
+        return MemorySaver()
+    options = {
+        "sqlite full snapshots": dict(delta_channels=(), keep_last=None, ttl=None, finished_ttl=None),
+        "sqlite delta": dict(keep_last=None, ttl=None, finished_ttl=None),
+        "sqlite delta+compact": dict(keep_last=5, ttl=None, finished_ttl=None),
+        "sqlite delta+compact+ttl": dict(keep_last=5, ttl=6 * 60 * 60, finished_ttl=60 * 60),
+    }[name]
+    return SQLiteCheckpointSaver(path, timer=clock, maintenance_interval=30 * 60, **options)
+
+
+def run(name: str, path: str) -> dict:
+    """별도 프로세스에서 실행: 세션 시뮬레이션 후 (시간, RSS 증가량, 디스크 크기, 남은 스레드 수) 반환"""
+    clock = FakeClock()
+    checkpointer = make_checkpointer(name, path, clock)
+    graph = build_graph(checkpointer)
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    start = time.perf_counter()
+    for session in range(SESSIONS):
+        config = {"configurable": {"thread_id": f"session-{session}"}}
+        for turn in range(TURNS):
+            graph.invoke({"messages": [HumanMessage(content=f"{turn}{USER_TEXT}")]}, config=config)
+        if session % 2 == 0:
+            graph.invoke({"messages": [HumanMessage(content="q")]}, config=config)
+        clock.now += 60
+    elapsed = time.perf_counter() - start
+
+    result = {
+        "time": elapsed,
+        "rss": (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss_before) / 1024,
+        "disk": None,
+        "threads": SESSIONS,
+    }
+    if isinstance(checkpointer, SQLiteCheckpointSaver):
+        checkpointer.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        checkpointer.vacuum()
+        result["disk"] = os.path.getsize(path) / 1024 / 1024
+        result["threads"] = checkpointer.conn.execute("SELECT count(*) FROM threads").fetchone()[0]
+        checkpointer.close()
+    return result
+
+
+def main() -> None:
+    tmpdir = tempfile.mkdtemp()
+    print(f"sessions={SESSIONS}  turns/session={TURNS}")
+    for index, name in enumerate(
+        ["MemorySaver", "sqlite full snapshots", "sqlite delta", "sqlite delta+compact", "sqlite delta+compact+ttl"]
+    ):
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            result = executor.submit(run, name, os.path.join(tmpdir, f"{index}.sqlite")).result()
+        disk = f"  disk={result['disk']:7.2f}MB" if result["disk"] is not None else " " * 17
+        print(
+            f"{name:<26} time={result['time']:6.1f}s  rss+={result['rss']:7.1f}MB{disk}  threads={result['threads']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+GenerateDiaryBodyNode 지연 시간 비교 (순차 호출 vs 동시 호출)
+
+실행: python -m benchmarks.bench_diary_body
+"""
+import asyncio
+import time
+from datetime import time as dtime
+
+from agents import DiaryEntry, GenerateDiaryBodyNode
+from benchmarks.fakes import FakeChatModel
+
+LATENCY = 0.5  # LLM 호출 1회당 가짜 지연 시간(초)
+ROUNDS = 3
+
+
+def make_entries(n: int = 3) -> list[DiaryEntry]:
+    return [
+        DiaryEntry(
+            event_title=f"사건 {i}",
+            time_period=dtime(hour=8 + i),
+            core_emotion="기쁨",
+            emotion_keywords=["기쁜"],
+            emotion_score=70,
+            companions=[],
+            thoughts="좋았다",
+            reflection="잘했다",
+            summary="좋은 하루였다.",
+        )
+        for i in range(n)
+    ]
+
+
+def run_sequential(node: GenerateDiaryBodyNode, entries: list[DiaryEntry]) -> None:
+    # 기존 구현과 동일한 순차 호출
+    inputs = {"entries": sorted(entries, key=lambda e: e.time_period)}
+    node.summary_chain.invoke(inputs)
+    node.body_chain.invoke(inputs)
+
+
+def measure(label: str, fn) -> None:
+    elapsed = []
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        fn()
+        elapsed.append(time.perf_counter() - start)
+    print(f"{label:<12} mean={sum(elapsed) / len(elapsed):.3f}s  min={min(elapsed):.3f}s")
+
+
+def main() -> None:
+    node = GenerateDiaryBodyNode(FakeChatModel(responses=["한 줄", "본문"], latency=LATENCY))
+    state = {"entries": make_entries()}
+
+    print(f"LLM latency per call: {LATENCY:.3f}s")
+    measure("sequential", lambda: run_sequential(node, state["entries"]))
+    measure("execute", lambda: node.execute(state))
+    measure("aexecute", lambda: asyncio.run(node.aexecute(state)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+DiaryStore 일괄 저장 / 기간·감정·점수 조회 시간 측정
+
+하루 1~5개 사건을 가진 YEARS년치 가상 일기를 저장한 뒤 조회 시간을 측정
+
+실행: python -m benchmarks.bench_diary_store [YEARS]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, time as dtime, timedelta
+
+from agents import DiaryEntry, DiaryRecord, DiaryStore
+from agents.diary.charts import emotion_to_index
+
+YEARS = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+ROUNDS = 20
+START = date(2016, 1, 1)
+
+
+def make_records(years: int, seed: int = 0) -> list[DiaryRecord]:
+    rng = random.Random(seed)
+    emotions = list(emotion_to_index)
+    records = []
+    for offset in range(365 * years):
+        entries = [
+            DiaryEntry(
+                event_title=f"사건 {i}",
+                time_period=dtime(hour=rng.randint(7, 23), minute=rng.choice([0, 15, 30, 45])),
+                core_emotion=rng.choice(emotions),
+                emotion_keywords=["잔잔한"],
+                emotion_score=rng.randint(0, 100),
+                companions=[{"name": "지연", "relationship": "친구"}] if rng.random() < 0.3 else [],
+                thoughts="생각보다 즐거웠다.",
+                reflection="다음에는 더 일찍 준비하자.",
+                summary="평범하지만 괜찮은 하루였다.",
+            )
+            for i in range(rng.randint(1, 5))
+        ]
+        records.append(
+            DiaryRecord(
+                user_name="예리",
+                diary_date=START + timedelta(days=offset),
+                written_at=dtime(23, 0),
+                one_liner="오늘도 수고했어.",
+                diary_body="오늘은 이런저런 일이 있었다. " * 20,
+                entries=entries,
+            )
+        )
+    return records
+
+
+def measure(label: str, fn) -> None:
+    elapsed = []
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        result = fn()
+        elapsed.append(time.perf_counter() - start)
+    size = len(result) if hasattr(result, "__len__") else ""
+    print(f"{label:<34} mean={sum(elapsed) / len(elapsed) * 1000:8.2f}ms  min={min(elapsed) * 1000:8.2f}ms  rows={size}")
+
+
+def main() -> None:
+    records = make_records(YEARS)
+    n_entries = sum(len(r.entries) for r in records)
+    path = os.path.join(tempfile.mkdtemp(), "diary.sqlite")
+
+    with DiaryStore(path) as store:
+        start = time.perf_counter()
+        store.save_many(records)
+        print(f"save_many: {len(records)} days / {n_entries} entries in {time.perf_counter() - start:.2f}s "
+              f"(file {os.path.getsize(path) / 1024 / 1024:.1f}MB)")
+
+        last = records[-1].diary_date
+        month = (last - timedelta(days=30), last)
+        year = (last - timedelta(days=365), last)
+        measure("get (1 day)", lambda: [store.get(last, "예리")])
+        measure("list_days (30 days)", lambda: store.list_days(*month, user_name="예리"))
+        measure("list_days (1 year)", lambda: store.list_days(*year, user_name="예리"))
+        measure("find_entries emotion=슬픔 (1 year)", lambda: store.find_entries(*year, core_emotion="슬픔"))
+        measure("find_entries score<=20 (all)", lambda: store.find_entries(max_score=20))
+        measure("entry_rows (1 year)", lambda: list(store.entry_rows(*year)))
+        measure(f"entry_rows ({YEARS} years)", lambda: list(store.entry_rows()))
+
+
+if __name__ == "__main__":
+    main()
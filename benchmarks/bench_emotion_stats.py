@@ -0,0 +1,94 @@
+"""
+EmotionStats 성능 측정 (YEARS년치 가상 일기)
+
+- 전체 생성: DiaryStore.entry_rows → EmotionStats.from_store
+- 하루 추가: add_day(증분) vs 매번 전체 사건을 Counter/리스트로 다시 계산
+- 조회: 전체 요약, 월/주 단위 집계
+
+실행: python -m benchmarks.bench_emotion_stats [YEARS]
+"""
+import statistics
+import sys
+import time
+from collections import Counter
+
+from agents import DiaryStore, EmotionStats
+
+from .bench_diary_store import make_records
+
+YEARS = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+ROUNDS = 20
+NEW_DAYS = 30
+
+
+def python_recompute(entries: list) -> dict:
+    """기존 방식: 전체 사건 목록을 Counter/리스트 컴프리헨션으로 매번 다시 집계"""
+    sorted_entries = sorted(entries, key=lambda e: (e[0], e[1].time_period))
+    scores = [e.emotion_score for _, e in sorted_entries]
+    transitions = Counter(
+        (a.core_emotion, b.core_emotion)
+        for (day_a, a), (day_b, b) in zip(sorted_entries, sorted_entries[1:])
+        if day_a == day_b
+    )
+    return {
+        "counts": Counter(e.core_emotion for _, e in sorted_entries),
+        "mean": statistics.fmean(scores),
+        "var": statistics.pvariance(scores),
+        "transitions": transitions,
+        "hourly": Counter((e.time_period.hour, e.core_emotion) for _, e in sorted_entries),
+    }
+
+
+def measure(label: str, fn, rounds: int = ROUNDS) -> float:
+    elapsed = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn()
+        elapsed.append(time.perf_counter() - start)
+    mean = sum(elapsed) / len(elapsed)
+    print(f"{label:<40} mean={mean * 1000:9.3f}ms  min={min(elapsed) * 1000:9.3f}ms")
+    return mean
+
+
+def main() -> None:
+    records = make_records(YEARS)
+    history, new_days = records[:-NEW_DAYS], records[-NEW_DAYS:]
+    print(f"{len(records)} days / {sum(len(r.entries) for r in records)} entries")
+
+    store = DiaryStore(":memory:")
+    store.save_many(history)
+    measure("from_store (all history)", lambda: EmotionStats.from_store(store), rounds=5)
+
+    # 하루 추가 후 전체 통계를 얻는 비용
+    stats = EmotionStats.from_store(store)
+    all_entries = [(r.diary_date, e) for r in history for e in r.entries]
+    days = iter(new_days * ROUNDS)
+
+    def add_incremental():
+        record = next(days)
+        stats.add_day(record.diary_date, record.entries)
+        stats.summary()
+
+    def add_recompute():
+        record = next(days)
+        python_recompute(all_entries + [(record.diary_date, e) for e in record.entries])
+
+    def add_only():
+        record = next(days)
+        stats.add_day(record.diary_date, record.entries)
+
+    measure("add_day only", add_only)
+    incremental = measure("add_day + summary (incremental)", add_incremental)
+    days = iter(new_days * ROUNDS)
+    recompute = measure("add day + recompute (Counter, python)", add_recompute)
+    print(f"{'speedup':<40} {recompute / incremental:9.1f}x")
+
+    measure("summary (all)", stats.summary)
+    measure("summary (last 30 days)", lambda: stats.summary(new_days[0].diary_date, new_days[-1].diary_date))
+    measure("rollup month (all)", lambda: stats.rollup("month"))
+    measure("rollup week (all)", lambda: stats.rollup("week"))
+    measure("rollup day (all)", lambda: stats.rollup("day"))
+
+
+if __name__ == "__main__":
+    main()
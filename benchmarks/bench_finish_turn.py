@@ -0,0 +1,60 @@
+"""
+'q'(일기 생성) 턴의 지연 시간 비교 (info 실행 후 RouterNode 판단 vs EntryRouterNode 선처리)
+
+사건 3개가 기록된 상태에서 'q'를 입력하고 main_graph가 끝날 때까지의
+소요 시간과 대화용 LLM 호출 수를 측정 (차트는 메모리 저장소 사용)
+
+실행: python -m benchmarks.bench_finish_turn
+"""
+import time
+import uuid
+from datetime import date, datetime
+
+from langchain_core.messages import HumanMessage
+
+from agents import GenerateEmotionChartsNode, InMemoryChartStore, build_main_graph
+
+from .bench_diary_body import make_entries
+from .fakes import FakeChatModel
+
+LATENCY = 0.5
+ROUNDS = 3
+
+
+def measure(label: str, entry_router: bool) -> None:
+    chat_model = FakeChatModel(responses=["좋아, 일기를 만들어볼게!"], latency=LATENCY)
+    graph = build_main_graph(
+        FakeChatModel(responses=["한 줄", "본문"], latency=LATENCY),
+        llm_with_tool=chat_model,
+        chart_node=GenerateEmotionChartsNode(store=InMemoryChartStore()),
+        entry_router=entry_router,
+    )
+    state = {
+        "messages": [HumanMessage(content="q")],
+        "entries": make_entries(3),
+        "user_name": "예리",
+        "today_date": date.today(),
+        "written_at": datetime.now().time(),
+    }
+
+    elapsed = []
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        result = graph.invoke(state)
+        elapsed.append(time.perf_counter() - start)
+        assert result.get("final_markdown")
+
+    print(
+        f"{label:<8} mean={sum(elapsed) / len(elapsed):.3f}s  min={min(elapsed):.3f}s  "
+        f"chat llm calls/turn={chat_model.call_count / ROUNDS:.0f}"
+    )
+
+
+def main() -> None:
+    print(f"LLM latency per call: {LATENCY:.3f}s")
+    measure("router", entry_router=False)
+    measure("entry", entry_router=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+agents 패키지 cold start(import) 시간 측정
+
+각 시나리오를 새 파이썬 프로세스에서 실행해 import 시간과
+무거운 하위 시스템(matplotlib, spotipy, langchain_tavily, langgraph) 로드 여부를 출력
+
+실행: python -m benchmarks.bench_import
+"""
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROUNDS = 5
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+
+SCENARIOS = {
+    "import agents": "import agents",
+    "letter worker": "from agents import PraiseNode, MBTIFeedbackNode, LetterMarkdownNode",
+    "diary worker": "from agents import InfoNode, GenerateDiaryBodyNode, RouterNode",
+    "star import": "from agents import *",
+}
+
+HEAVY_MODULES = ["matplotlib", "spotipy", "langchain_tavily", "langgraph.graph"]
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"elapsed": elapsed, "loaded": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def run_once(statement: str) -> dict:
+    code = PROBE.format(statement=statement, heavy=HEAVY_MODULES)
+    output = subprocess.run(
+        [sys.executable, "-c", code], cwd=PROJECT_ROOT, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main() -> None:
+    for label, statement in SCENARIOS.items():
+        results = [run_once(statement) for _ in range(ROUNDS)]
+        median = statistics.median(r["elapsed"] for r in results)
+        loaded = ", ".join(results[-1]["loaded"]) or "-"
+        print(f"{label:<15} median={median * 1000:7.1f}ms  heavy modules: {loaded}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+InfoNode 턴별 프롬프트 크기 비교 (전체 대화 vs InfoContextManager)
+
+10개 사건을 기록하는 세션을 시뮬레이션하고, InfoNode가 호출될 때마다
+프롬프트 토큰 수(근사치)를 측정
+
+실행: python -m benchmarks.bench_info_context
+"""
+from datetime import time as dtime
+
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage
+from langchain_core.messages.utils import count_tokens_approximately
+
+from agents import DiaryEntry, InfoContextManager, get_diary_system_prompt
+
+N_ENTRIES = 10
+QUESTIONS_PER_ENTRY = 8
+
+
+def make_entry(i: int) -> DiaryEntry:
+    return DiaryEntry(
+        event_title=f"사건 {i}",
+        time_period=dtime(hour=8 + i),
+        core_emotion="기쁨",
+        emotion_keywords=["기쁜", "뿌듯한"],
+        emotion_score=70,
+        companions=[],
+        thoughts="생각보다 즐거웠고 다음에도 또 하고 싶다는 생각이 들었다.",
+        reflection="미리 준비한 덕분에 여유가 있었다.",
+        summary=f"{i}번째 사건을 즐겁게 마무리했다.",
+    )
+
+
+def simulate_session():
+    """InfoNode 호출 직전마다 (messages, entries)를 yield"""
+    messages, entries = [], []
+    for i in range(N_ENTRIES):
+        for q in range(QUESTIONS_PER_ENTRY):
+            messages.append(HumanMessage(content=f"{i}번째 사건 {q}번째 답변이야. 오늘 있었던 일을 조금 더 자세히 얘기하자면 이런저런 일이 있었어."))
+            yield messages, entries
+            if q == 2:
+                # 감정 키워드 추천 도구 호출
+                call_id = f"kw-{i}"
+                messages.append(AIMessage(content="", tool_calls=[{"name": "suggest_keywords_tool", "args": {"core_emotion": "기쁨"}, "id": call_id}]))
+                messages.append(ToolMessage(content="<RAW>추천된 감정 키워드는 다음과 같아: [기분좋은, 즐거운, 고마운] 이 중에서 1~3개를 골라줘.</RAW>", tool_call_id=call_id))
+                yield messages, entries
+            messages.append(AIMessage(content=f"그랬구나! 그때 기분은 어땠어? 조금 더 이야기해 줄래? ({q})"))
+
+        # DiaryEntry 기록
+        entry = make_entry(i)
+        call_id = f"entry-{i}"
+        messages.append(AIMessage(content="", tool_calls=[{"name": "DiaryEntry", "args": entry.model_dump(mode="json"), "id": call_id}]))
+        messages.append(ToolMessage(content="혹시 오늘 다른 기억에 남는 일도 있었어?", tool_call_id=call_id))
+        entries = entries + [entry]
+        yield messages, entries
+        messages.append(AIMessage(content="혹시 오늘 다른 기억에 남는 일도 있었어?"))
+
+
+def main() -> None:
+    system_message = SystemMessage(content=get_diary_system_prompt())
+    manager = InfoContextManager()
+
+    full_sizes, bounded_sizes = [], []
+    for messages, entries in simulate_session():
+        full_sizes.append(count_tokens_approximately([system_message] + messages))
+        bounded_sizes.append(count_tokens_approximately(manager.build(system_message, messages, entries)))
+
+    print(f"{'turn':>5}{'full':>10}{'bounded':>10}")
+    step = max(len(full_sizes) // 15, 1)
+    for turn in list(range(0, len(full_sizes), step)) + [len(full_sizes) - 1]:
+        print(f"{turn + 1:>5}{full_sizes[turn]:>10}{bounded_sizes[turn]:>10}")
+
+    print(f"\nInfoNode calls: {len(full_sizes)}")
+    print(f"max prompt tokens:   full={max(full_sizes)}  bounded={max(bounded_sizes)}")
+    print(f"total prompt tokens: full={sum(full_sizes)}  bounded={sum(bounded_sizes)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+감정 키워드 추천 턴의 지연 시간 비교 (info 재호출 vs 키워드 목록 직접 응답)
+
+사용자가 핵심 감정을 말하면 모델이 suggest_keywords_tool을 호출하는 턴을
+main_graph로 실행하고, 턴당 LLM 호출 수와 소요 시간을 측정
+
+실행: python -m benchmarks.bench_keyword_turn
+"""
+import time
+import uuid
+
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from langchain_core.runnables import RunnableLambda
+from langgraph.checkpoint.memory import MemorySaver
+
+from agents import build_main_graph
+
+from .fakes import FakeChatModel
+
+LATENCY = 0.5
+ROUNDS = 3
+
+
+class ScriptedToolModel:
+    """마지막 메시지가 사용자 입력이면 suggest_keywords_tool 호출, ToolMessage면 <RAW> 내용을 그대로 반환"""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.call_count = 0
+
+    def __call__(self, messages):
+        self.call_count += 1
+        time.sleep(self.latency)
+        last = messages[-1]
+        if isinstance(last, ToolMessage):
+            return AIMessage(content=str(last.content).removeprefix("<RAW>").removesuffix("</RAW>"))
+        call_id = f"call_{uuid.uuid4().hex[:8]}"
+        return AIMessage(
+            content="",
+            tool_calls=[{"name": "suggest_keywords_tool", "args": {"core_emotion": "기쁨"}, "id": call_id}],
+        )
+
+
+def measure(label: str, direct_keywords: bool) -> None:
+    model = ScriptedToolModel(LATENCY)
+    graph = build_main_graph(
+        FakeChatModel(),
+        llm_with_tool=RunnableLambda(model),
+        checkpointer=MemorySaver(),
+        direct_keywords=direct_keywords,
+    )
+
+    elapsed = []
+    for _ in range(ROUNDS):
+        config = {"configurable": {"thread_id": str(uuid.uuid4())}}
+        start = time.perf_counter()
+        result = graph.invoke({"messages": [HumanMessage(content="기쁨이었어")]}, config=config)
+        elapsed.append(time.perf_counter() - start)
+
+    print(
+        f"{label:<8} mean={sum(elapsed) / len(elapsed):.3f}s  "
+        f"llm calls/turn={model.call_count / ROUNDS:.0f}  last={result['messages'][-1].content!r}"
+    )
+
+
+def main() -> None:
+    print(f"LLM latency per call: {LATENCY:.3f}s")
+    measure("echo", direct_keywords=False)
+    measure("direct", direct_keywords=True)
+
+
+if __name__ == "__main__":
+    main()
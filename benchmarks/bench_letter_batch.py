@@ -0,0 +1,93 @@
+"""
+LetterBatchRunner 일괄 편지 생성 처리량 측정 (가짜 LLM / 에이전트)
+
+- 순차: 기존처럼 letter_graph.ainvoke를 일기마다 하나씩 실행 (SEQUENTIAL_SAMPLE건으로 측정 후 환산)
+- 일괄: 동시 처리 수 제한 + 칭찬 / MBTI 피드백 호출 묶음 (batch_size=1이면 묶지 않음)
+- 이어서 실행: 절반 처리 후 중단 → 같은 진행 파일로 다시 실행
+
+실행: python -m benchmarks.bench_letter_batch [N_DIARIES]
+"""
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+
+from agents import LetterBatchRunner, build_letter_graph
+from benchmarks.fakes import FakeAgentExecutor, FakeChatModel
+
+N_DIARIES = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+LLM_LATENCY = 0.2
+AGENT_LATENCY = 0.5
+SEQUENTIAL_SAMPLE = 5
+
+MUSIC_OUTPUT = json.dumps(
+    {"title": "밤편지", "artist": "아이유", "url": "https://open.spotify.com/track/x", "reason": "잔잔한 밤에 어울려"},
+    ensure_ascii=False,
+)
+QUOTE_OUTPUT = json.dumps(
+    {"quote": "천천히 가도 괜찮다.", "author": "누군가", "explanation": "오늘도 충분히 잘했어."}, ensure_ascii=False
+)
+
+
+def make_fakes():
+    llm = FakeChatModel(responses=["오늘도 잘했어", "F 위로", "T 조언"], latency=LLM_LATENCY)
+    return llm, FakeAgentExecutor(MUSIC_OUTPUT, AGENT_LATENCY), FakeAgentExecutor(QUOTE_OUTPUT, AGENT_LATENCY)
+
+
+def jobs(n: int) -> list:
+    return [(f"user-{i:05d}", f"{i}번째 사용자의 일기. 오늘은 발표가 있었다. 떨렸지만 잘 끝냈다.") for i in range(n)]
+
+
+async def sequential(n: int) -> float:
+    llm, music, quote = make_fakes()
+    graph = build_letter_graph(llm, music, quote)
+    start = time.perf_counter()
+    for _, diary in jobs(n):
+        await graph.ainvoke({"diary_body": diary})
+    return time.perf_counter() - start
+
+
+async def batched(n: int, concurrency: int, batch_size: int, progress=None, stop_after=None) -> tuple:
+    llm, music, quote = make_fakes()
+    runner = LetterBatchRunner(llm, music, quote, progress=progress, max_concurrency=concurrency, batch_size=batch_size)
+    start = time.perf_counter()
+    first = None
+    count = failed = 0
+    async for result in runner.astream(jobs(n)):
+        first = first or time.perf_counter() - start
+        count += 1
+        failed += not result.ok
+        if stop_after is not None and count >= stop_after:
+            break
+    elapsed = time.perf_counter() - start
+    return elapsed, first, count, failed, runner
+
+
+def main() -> None:
+    print(f"{N_DIARIES} diaries, LLM {LLM_LATENCY}s / agent {AGENT_LATENCY}s per call")
+
+    per_diary = asyncio.run(sequential(SEQUENTIAL_SAMPLE)) / SEQUENTIAL_SAMPLE
+    print(f"{'sequential (estimated)':<32} total={per_diary * N_DIARIES:8.1f}s  ({per_diary:.3f}s/diary)")
+
+    for concurrency, batch_size in [(64, 1), (64, 16), (256, 32)]:
+        elapsed, first, count, failed, runner = asyncio.run(batched(N_DIARIES, concurrency, batch_size))
+        print(
+            f"{f'concurrency={concurrency} batch={batch_size}':<32} total={elapsed:8.1f}s  first={first:.3f}s  "
+            f"done={count} failed={failed}  llm batches={runner.batch_llm.batch_count} "
+            f"(requests={runner.batch_llm.request_count})"
+        )
+
+    # 중단 후 이어서 실행
+    path = os.path.join(tempfile.mkdtemp(), "letters.sqlite")
+    half = N_DIARIES // 2
+    elapsed, _, count, _, _ = asyncio.run(batched(N_DIARIES, 256, 32, progress=path, stop_after=half))
+    print(f"{'interrupted run':<32} total={elapsed:8.1f}s  done={count}")
+    elapsed, _, count, _, runner = asyncio.run(batched(N_DIARIES, 256, 32, progress=path))
+    print(f"{'resumed run':<32} total={elapsed:8.1f}s  done={count} skipped={runner.skipped}")
+    print(f"{'progress rows':<32} {len(runner.progress)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+편지 스트리밍(astream_letter / stream_letter)의 첫 항목까지 걸리는 시간 측정 (가짜 LLM / 에이전트)
+
+- invoke:  기존처럼 네 분기가 모두 끝난 뒤 편지 전체를 한 번에 받음
+- stream:  분기가 끝나는 대로 항목을 받음 (첫 항목 = 가장 빠른 분기)
+
+분기 지연: 칭찬 / MBTI LLM LLM_LATENCY초, 음악 에이전트 MUSIC_LATENCY초, 명언 에이전트 QUOTE_LATENCY초
+
+실행: python -m benchmarks.bench_letter_stream
+"""
+import asyncio
+import time
+
+from agents import astream_letter, build_letter_graph, stream_letter
+from benchmarks.bench_letter_batch import MUSIC_OUTPUT, QUOTE_OUTPUT
+from benchmarks.fakes import FakeAgentExecutor, FakeChatModel
+
+LLM_LATENCY = 0.3
+MUSIC_LATENCY = 1.5
+QUOTE_LATENCY = 2.0
+DIARY = "오늘은 친구와 산책을 하고 카페에서 오래 이야기를 나눴다. 조금 피곤했지만 마음이 편안했다."
+
+
+def build_graph():
+    return build_letter_graph(
+        FakeChatModel(responses=["오늘도 정말 잘했어!", "F 위로", "T 조언"], latency=LLM_LATENCY),
+        FakeAgentExecutor(MUSIC_OUTPUT, MUSIC_LATENCY),
+        FakeAgentExecutor(QUOTE_OUTPUT, QUOTE_LATENCY),
+    )
+
+
+def report(label: str, events: list) -> None:
+    order = " → ".join(f"{event.key}@{event.elapsed:.2f}s" for event in events)
+    print(f"{label:<14} first={events[0].elapsed:.2f}s  letter={events[-1].elapsed:.2f}s  {order}")
+
+
+async def run_async() -> None:
+    graph = build_graph()
+    start = time.perf_counter()
+    await graph.ainvoke({"diary_body": DIARY})
+    print(f"{'ainvoke':<14} first={time.perf_counter() - start:.2f}s  (편지 전체)")
+
+    events = [event async for event in astream_letter(graph, DIARY)]
+    report("astream_letter", events)
+
+
+def main() -> None:
+    print(f"latency: llm={LLM_LATENCY}s music={MUSIC_LATENCY}s quote={QUOTE_LATENCY}s")
+    asyncio.run(run_async())
+    report("stream_letter", list(stream_letter(build_graph(), DIARY)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""
+MBTIFeedbackNode 모드별 지연 시간 비교 (sequential / batch / combined)
+
+실행: python -m benchmarks.bench_mbti_feedback
+"""
+import asyncio
+import json
+import time
+
+from agents import MBTIFeedbackNode
+from benchmarks.fakes import FakeChatModel
+
+LATENCY = 0.5  # LLM 호출 1회당 가짜 지연 시간(초)
+ROUNDS = 3
+
+COMBINED_RESPONSE = json.dumps(
+    {"F_feedback": "오늘 정말 고생 많았어.", "T_feedback": "내일은 미리 준비해보자."},
+    ensure_ascii=False,
+)
+
+
+def measure(label: str, fn) -> None:
+    elapsed = []
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        fn()
+        elapsed.append(time.perf_counter() - start)
+    print(f"{label:<22} mean={sum(elapsed) / len(elapsed):.3f}s  min={min(elapsed):.3f}s")
+
+
+def main() -> None:
+    state = {"diary_body": "오늘은 발표가 있었다. 떨렸지만 잘 끝냈다."}
+
+    print(f"LLM latency per call: {LATENCY:.3f}s")
+    for mode in MBTIFeedbackNode.MODES:
+        responses = [COMBINED_RESPONSE] if mode == "combined" else ["F 피드백", "T 피드백"]
+        node = MBTIFeedbackNode(FakeChatModel(responses=responses, latency=LATENCY), mode=mode)
+        measure(f"{mode} (execute)", lambda: node.execute(state))
+        measure(f"{mode} (aexecute)", lambda: asyncio.run(node.aexecute(state)))
+
+
+if __name__ == "__main__":
+    main()
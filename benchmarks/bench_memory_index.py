@@ -0,0 +1,105 @@
+"""
+DiaryMemoryIndex 생성 / 증분 추가 / 검색 시간 측정 (YEARS년치 가상 일기)
+
+- make_records의 사건 내용을 주제별 문장으로 바꿔 검색 결과가 의미 있도록 구성
+- 검색: InfoNode가 매 턴 호출하는 search(k=2, before=오늘)
+- 비교: 매번 모든 기억을 Counter로 다시 만들어 겹치는 2-gram 수를 세는 방식
+
+실행: python -m benchmarks.bench_memory_index [YEARS]
+"""
+import random
+import sys
+import time
+from collections import Counter
+
+from agents import DiaryMemoryIndex
+from agents.core.text import char_ngrams
+from agents.diary.memory_index import split_record
+
+from .bench_diary_store import make_records
+
+YEARS = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+ROUNDS = 50
+
+TOPICS = [
+    ("헬스장", "퇴근하고 헬스장에서 하체 운동을 했다.", "몸은 힘들었지만 개운했다.", "꾸준히 나가 보자."),
+    ("엄마와 통화", "엄마랑 오랜만에 길게 통화했다.", "목소리를 들으니 마음이 놓였다.", "주말에 집에 내려가야겠다."),
+    ("팀 회의", "팀 회의에서 발표를 맡았는데 질문이 많았다.", "준비가 부족해서 긴장했다.", "자료를 미리 정리해 두자."),
+    ("고양이", "고양이가 아파서 동물병원에 다녀왔다.", "별일 아니라서 다행이었다.", "사료를 바꿔 봐야겠다."),
+    ("시험 공부", "도서관에서 자격증 시험 공부를 했다.", "집중이 잘 안 돼서 답답했다.", "공부 시간을 나눠서 계획하자."),
+    ("친구 생일", "지연이 생일이라 케이크를 사서 만났다.", "오랜만에 크게 웃었다.", "친구들에게 더 자주 연락하자."),
+    ("비 오는 산책", "비가 와서 우산을 쓰고 한강을 걸었다.", "빗소리가 차분하게 느껴졌다.", "혼자만의 시간이 필요했나 보다."),
+    ("야근", "마감 때문에 늦게까지 야근을 했다.", "지치고 예민해졌다.", "일정을 조금 더 여유 있게 잡자."),
+]
+QUERIES = [
+    "오늘 헬스장 가서 운동했어",
+    "엄마한테 전화가 왔어",
+    "회의에서 발표했는데 너무 떨렸어",
+    "우리 고양이가 밥을 안 먹어",
+    "비 오는데 산책했어",
+]
+
+
+def make_memory_records(years: int, seed: int = 0) -> list:
+    rng = random.Random(seed)
+    records = make_records(years, seed)
+    for record in records:
+        record.diary_body = "\n\n".join(rng.choice(TOPICS)[1] for _ in range(3))
+        for entry in record.entries:
+            title, summary, thoughts, reflection = rng.choice(TOPICS)
+            entry.event_title, entry.summary, entry.thoughts, entry.reflection = title, summary, thoughts, reflection
+    return records
+
+
+def naive_search(memories: list, query: str, k: int = 2) -> list:
+    """기존 방식에 해당하는 전수 비교: 매 질의마다 모든 기억의 2-gram Counter를 다시 만듦"""
+    query_terms = Counter(char_ngrams(query))
+    scored = [
+        (sum((query_terms & Counter(char_ngrams(f"{m.title} {m.text}"))).values()), m) for m in memories
+    ]
+    scored.sort(key=lambda pair: -pair[0])
+    return scored[:k]
+
+
+def measure(label: str, fn, rounds: int = ROUNDS) -> float:
+    elapsed = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn()
+        elapsed.append(time.perf_counter() - start)
+    mean = sum(elapsed) / len(elapsed)
+    print(f"{label:<36} mean={mean * 1000:9.3f}ms  min={min(elapsed) * 1000:9.3f}ms")
+    return mean
+
+
+def main() -> None:
+    records = make_memory_records(YEARS)
+    history, new_days = records[:-ROUNDS], records[-ROUNDS:]
+
+    start = time.perf_counter()
+    index = DiaryMemoryIndex()
+    index.add_records(history)
+    print(f"build: {len(history)} days / {len(index)} memories in {time.perf_counter() - start:.2f}s")
+
+    days = iter(new_days)
+    measure("add_record (1 day, incremental)", lambda: index.add_record(next(days)))
+
+    today = new_days[-1].diary_date
+    queries = iter(QUERIES * ROUNDS)
+    indexed = measure("search k=2 (before=today)", lambda: index.search(next(queries), k=2, before=today))
+    queries = iter(QUERIES * ROUNDS)
+    measure("search k=2 (after 1 new day)", lambda: (index.add_record(new_days[-1]), index.search(next(queries), k=2)))
+
+    memories = [m for r in records for m in split_record(r)]
+    queries = iter(QUERIES * ROUNDS)
+    naive = measure("naive scan (Counter per memory)", lambda: naive_search(memories, next(queries)), rounds=3)
+    print(f"{'speedup':<36} {naive / indexed:9.1f}x")
+
+    print()
+    for query in QUERIES:
+        hits = index.search(query, k=2, before=today)
+        print(f"{query} → " + " | ".join(f"{score:.2f} {m.title or '본문'}: {m.text[:20]}" for score, m in hits))
+
+
+if __name__ == "__main__":
+    main()
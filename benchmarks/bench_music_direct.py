@@ -0,0 +1,94 @@
+"""
+MusicRecommendationNode 실행 방식별 지연 시간 / 호출 수 비교 (가짜 LLM / Spotify, 비동기 경로)
+
+- agent:            AgentExecutor (키워드 → spotify_recommender_tool → 최종 JSON), LLM 2회 + Spotify 1회
+- agent (miss):     첫 키워드로 곡을 못 찾아 다른 키워드로 다시 검색, LLM 3회 + Spotify 2회 (못 찾을수록 늘어남)
+- direct:           키워드 여러 개를 LLM 1회로 받고 Spotify 동시 검색 후 이유 작성, LLM 2회 (상한 고정)
+- direct (miss):    1순위 키워드가 없어도 같은 동시 검색 결과에서 다음 순위 사용, LLM 2회
+- direct+template:  이유를 템플릿으로 작성, LLM 1회
+- direct (bad json):        키워드 응답을 파싱하지 못하면 FALLBACK_KEYWORD로만 검색 (예외로 분기가 끝나지 않음)
+- direct+agent (bad json):  같은 상황에서 에이전트가 있으면 에이전트로 다시 시도 (호출 수는 direct LLM 기준)
+
+실행: python -m benchmarks.bench_music_direct
+"""
+import asyncio
+import json
+import time
+
+from langchain.agents import AgentExecutor, create_tool_calling_agent
+from langchain_core.messages import AIMessage
+from langchain_core.output_parsers import PydanticOutputParser
+
+from agents import MusicRecommendationNode, MusicResponse, SpotifyTool, get_music_prompt
+from agents.core.cache import TTLCache
+from benchmarks.bench_letter_batch import MUSIC_OUTPUT
+from benchmarks.fakes import FakeChatModel, FakeSpotifyClient
+
+LLM_LATENCY = 0.8
+SPOTIFY_LATENCY = 0.3
+RUNS = 3
+DIARY = "오늘은 친구와 산책을 하고 카페에서 오래 이야기를 나눴다. 조금 피곤했지만 마음이 편안했다."
+
+
+def tool_call(keyword: str, call_id: str) -> AIMessage:
+    return AIMessage(content="", tool_calls=[{"name": "spotify_recommender_tool", "args": {"diary": DIARY, "keyword": keyword}, "id": call_id}])
+
+
+def spotify_tool(misses=()) -> tuple:
+    client = FakeSpotifyClient(latency=SPOTIFY_LATENCY, misses=misses)
+    return SpotifyTool(async_client=client, cache=TTLCache()), client
+
+
+def agent_node(miss: bool) -> tuple:
+    tool, client = spotify_tool(misses={"산책"} if miss else ())
+    rounds = [tool_call("산책", "1")] + ([tool_call("휴식", "2")] if miss else []) + [AIMessage(content=MUSIC_OUTPUT)]
+    llm = FakeChatModel(responses=rounds, latency=LLM_LATENCY)
+    prompt = get_music_prompt(PydanticOutputParser(pydantic_object=MusicResponse).get_format_instructions())
+    executor = AgentExecutor(agent=create_tool_calling_agent(llm, [tool], prompt), tools=[tool])
+    return MusicRecommendationNode(executor), llm, client
+
+
+def direct_node(miss: bool, reason: str = "llm") -> tuple:
+    tool, client = spotify_tool(misses={"산책"} if miss else ())
+    keywords = json.dumps({"keywords": ["산책", "휴식", "카페"]}, ensure_ascii=False)
+    llm = FakeChatModel(responses=[keywords, "편안했던 오늘 산책 길에 딱 어울리는 노래야!"], latency=LLM_LATENCY)
+    return MusicRecommendationNode(llm=llm, spotify_tool=tool, mode="direct", reason=reason), llm, client
+
+
+def bad_keywords_node(with_agent: bool) -> tuple:
+    executor = agent_node(False)[0].music_agent_executor if with_agent else None
+    tool, client = spotify_tool()
+    llm = FakeChatModel(responses=["산책, 휴식, 카페", "편안한 하루에 어울리는 노래야!"], latency=LLM_LATENCY)
+    return MusicRecommendationNode(executor, llm=llm, spotify_tool=tool, mode="direct"), llm, client
+
+
+async def measure(label: str, factory) -> MusicResponse:
+    times = []
+    for _ in range(RUNS):
+        node, llm, client = factory()  # 매번 새 캐시 (캐시 미스 기준)
+        start = time.perf_counter()
+        result = await node.aexecute({"diary_body": DIARY})
+        times.append(time.perf_counter() - start)
+        assert isinstance(result["music"], MusicResponse)
+    print(
+        f"{label:<24} mean={sum(times) / len(times):.2f}s  llm calls={llm.call_count}  "
+        f"spotify searches={client.call_count}  song={result['music'].title!r}"
+    )
+    return result["music"]
+
+
+async def main() -> None:
+    print(f"latency: llm={LLM_LATENCY}s spotify={SPOTIFY_LATENCY}s")
+    await measure("agent", lambda: agent_node(False))
+    await measure("agent (miss)", lambda: agent_node(True))
+    await measure("direct", lambda: direct_node(False))
+    await measure("direct (miss)", lambda: direct_node(True))
+    await measure("direct+template", lambda: direct_node(False, reason="template"))
+    music = await measure("direct (bad json)", lambda: bad_keywords_node(False))
+    assert music.title.startswith(MusicRecommendationNode.FALLBACK_KEYWORD)
+    music = await measure("direct+agent (bad json)", lambda: bad_keywords_node(True))
+    assert music.title == json.loads(MUSIC_OUTPUT)["title"]
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
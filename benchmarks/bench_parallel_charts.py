@@ -0,0 +1,79 @@
+"""
+'q'(일기 생성) 턴에서 차트 렌더링 배치 비교 (가짜 LLM, 사건 ENTRIES개)
+
+- sequential:        본문 → 차트 → 일기 (parallel_charts=False, 현재 스레드에서 렌더링)
+- parallel/thread:   본문과 차트를 동시에 시작, 차트는 그래프 스레드에서 렌더링
+- parallel/process:  본문과 차트를 동시에 시작, 차트는 공용 프로세스 풀(get_chart_process_pool)에서 렌더링
+                     (build_main_workflow 기본값, 첫 실행은 워커 시작 + matplotlib import 포함)
+
+차트 캐시가 맞지 않도록 실행마다 새 임시 폴더의 ChartArtifactStore 사용
+
+실행: python -m benchmarks.bench_parallel_charts
+"""
+import asyncio
+import tempfile
+import time
+from datetime import date, datetime
+
+from langchain_core.messages import HumanMessage
+
+from agents import ChartArtifactStore, GenerateEmotionChartsNode, build_main_graph, build_main_workflow, get_chart_process_pool
+
+from .bench_diary_body import make_entries
+from .fakes import FakeChatModel
+
+LATENCY = 1.0
+ENTRIES = 5
+ROUNDS = 3
+
+
+def q_state() -> dict:
+    return {
+        "messages": [HumanMessage(content="q")],
+        "entries": make_entries(ENTRIES),
+        "user_name": "예리",
+        "today_date": date.today(),
+        "written_at": datetime.now().time(),
+    }
+
+
+def build(parallel_charts: bool, executor, directory: str):
+    return build_main_graph(
+        FakeChatModel(responses=["한 줄", "본문"], latency=LATENCY),
+        llm_with_tool=FakeChatModel(responses=["응답"]),
+        chart_node=GenerateEmotionChartsNode(store=ChartArtifactStore(directory), executor=executor),
+        parallel_charts=parallel_charts,
+    )
+
+
+def measure(label: str, parallel_charts: bool, executor, use_async: bool = False) -> None:
+    elapsed = []
+    for _ in range(ROUNDS):
+        with tempfile.TemporaryDirectory() as directory:
+            graph = build(parallel_charts, executor, directory)
+            start = time.perf_counter()
+            if use_async:
+                result = asyncio.run(graph.ainvoke(q_state()))
+            else:
+                result = graph.invoke(q_state())
+            elapsed.append(time.perf_counter() - start)
+            assert result["emotion_pie_chart_url"] and result["final_markdown"]
+    rounds = "  ".join(f"{t:.2f}s" for t in elapsed)
+    print(f"{label:<28} min={min(elapsed):.2f}s  rounds: {rounds}")
+
+
+def main() -> None:
+    pool = get_chart_process_pool()
+    spec = build_main_workflow(FakeChatModel(), llm_with_tool=FakeChatModel()).nodes["generate_emotion_charts"]
+    default_node = spec.runnable.func.__self__
+    print(f"llm latency={LATENCY}s, entries={ENTRIES}, default chart executor: {type(default_node.executor).__name__}")
+    assert default_node.executor is pool
+
+    measure("sequential", False, None)
+    measure("parallel / thread", True, None)
+    measure("parallel / process", True, pool)
+    measure("parallel / process (async)", True, pool, use_async=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+"""
+명언 검색 도구의 결과 정리(digest) 전후 비교 (로컬 가짜 Tavily 서버 + 실제 AgentExecutor + 가짜 LLM)
+
+create_web_search_tool(digest=False)는 페이지 원문(raw_content)을 그대로 에이전트 scratchpad에 넣고,
+digest=True는 원문에서 명언 / 저자 후보만 뽑아 짧은 목록으로 넘김
+- 도구 출력 크기: 문자 수 / 근사 토큰 수 (count_tokens_approximately)
+- 에이전트 LLM 입력 토큰: 분기 1회당 QuoteRecommendationNode 측정(HistogramMetricsSink)의 prompt_tokens (두 번째 호출이 도구 결과를 읽음)
+- 분기 지연: QuoteRecommendationNode 실행 시간. 가짜 LLM은 입력 토큰 1개당 INPUT_TOKEN_LATENCY초를 더 기다림
+  (긴 프롬프트를 읽는 비용을 흉내 낸 값이므로 실제 모델의 수치와는 다름)
+- 정리 비용: digest_search_results 자체의 CPU 시간
+
+실행: python -m benchmarks.bench_quote_search
+"""
+import asyncio
+import json
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from langchain.agents import AgentExecutor, create_tool_calling_agent
+from langchain_core.messages import AIMessage, ToolMessage
+from langchain_core.messages.utils import count_tokens_approximately
+from langchain_core.output_parsers import PydanticOutputParser
+
+from agents import (
+    HistogramMetricsSink,
+    QuoteRecommendationNode,
+    QuoteResponse,
+    create_web_search_tool,
+    digest_search_results,
+    get_quote_prompt,
+)
+from benchmarks.bench_letter_batch import QUOTE_OUTPUT
+from benchmarks.fakes import FakeChatModel
+
+LLM_LATENCY = 0.3
+INPUT_TOKEN_LATENCY = 0.00005  # 입력 토큰 2만 개당 1초 (가정)
+SERVER_LATENCY = 0.2
+RUNS = 5
+TAVILY_API_KEY = "tvly-stub"  # 로컬 가짜 서버용 (환경 변수 TAVILY_API_KEY 불필요)
+DIARY = "오늘 발표가 있었는데 너무 떨려서 실수를 했다. 그래도 끝까지 해낸 나를 조금은 칭찬해주고 싶다."
+
+NAV = "<nav><ul>" + "".join(f"<li><a href='/c/{i}'>카테고리 {i}</a></li>" for i in range(60)) + "</ul></nav>"
+SCRIPT = "<script>window.dataLayer=[];" + "function t(a){return a};" * 200 + "</script>"
+FOOTER = "<footer>회사소개 | 이용약관 | 개인정보처리방침 | 고객센터<br>Copyright © 2025 All rights reserved.</footer>"
+COMMENTS = "".join(f"<div class='comment'><b>익명{i}</b><p>좋은 글 감사합니다 {i}</p><span>좋아요 {i}</span></div>" for i in range(40))
+ARTICLE = "<p>" + "살다 보면 누구나 넘어지는 날이 있습니다. 그럴 때 우리에게 힘이 되는 한마디가 있습니다. " * 12 + "</p>"
+
+HTML_PAGE = (
+    "<html><head><style>body{margin:0}</style></head><body>" + NAV + SCRIPT
+    + "<h1>용기를 주는 명언 모음</h1>" + ARTICLE
+    + "<blockquote>“천 리 길도 한 걸음부터.” - 노자</blockquote>"
+    + "<blockquote>“실패는 성공의 어머니이다.” (토머스 에디슨)</blockquote>"
+    + ARTICLE + "<p>“오늘 할 수 있는 일에 최선을 다하라.” - 작자 미상</p>"
+    + COMMENTS + FOOTER + "</body></html>"
+)
+MARKDOWN_PAGE = (
+    "[홈](https://x) | [명언](https://x/q) | [로그인](https://x/login) | [회원가입](https://x/join)\n"
+    + "\n".join(f"* [인기 글 {i}](https://x/p/{i})" for i in range(50)) + "\n\n"
+    + "# 힘들 때 읽는 명언\n\n"
+    + ("![배너](https://x/banner.png)\n지친 하루 끝에 읽으면 좋은 문장들을 모았습니다. " * 10) + "\n\n"
+    + "> 넘어지는 것은 부끄러운 일이 아니다. 일어서지 않는 것이 부끄러운 일이다.\n> - 공자\n\n"
+    + "윈스턴 처칠은 “성공은 끝이 아니고 실패는 치명적이지 않다. 중요한 것은 계속하는 용기다”라고 말했다.\n\n"
+    + "Believe you can and you're halfway there - Theodore Roosevelt\n\n"
+    + ("공유하기 | 카카오톡 | 페이스북 | 트위터\n" * 5)
+    + "\n".join(f"댓글 {i}: 정말 위로가 되네요" for i in range(60)) + "\n"
+    + "이 페이지는 쿠키를 사용합니다. 무단 전재 및 재배포 금지\n"
+)
+
+
+def search_response() -> dict:
+    """Tavily /search 응답 (include_raw_content=True, 원문 포함 페이지 3개)"""
+    return {
+        "query": "발표 실수 위로 명언",
+        "answer": "실패를 두려워하지 말고 다시 도전하라는 명언들이 많이 인용됩니다.",
+        "results": [
+            {"title": "용기를 주는 명언 모음", "url": "https://quotes.example/courage",
+             "content": "“천 리 길도 한 걸음부터.” - 노자. 작은 걸음이 모여 큰 길이 됩니다.", "raw_content": HTML_PAGE, "score": 0.9},
+            {"title": "힘들 때 읽는 명언", "url": "https://blog.example/hard-days",
+             "content": "넘어지는 것은 부끄러운 일이 아니다 - 공자", "raw_content": MARKDOWN_PAGE, "score": 0.8},
+            {"title": "실패 명언 30선", "url": "https://news.example/failure",
+             "content": "실패를 이겨낸 사람들의 한마디", "raw_content": MARKDOWN_PAGE.replace("공자", "맹자") + HTML_PAGE, "score": 0.7},
+        ],
+        "response_time": SERVER_LATENCY,
+    }
+
+
+class TavilyStubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), TavilyStubHandler)
+        self.payload = json.dumps(search_response(), ensure_ascii=False).encode()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class TavilyStubHandler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        time.sleep(SERVER_LATENCY)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(self.server.payload)))
+        self.end_headers()
+        self.wfile.write(self.server.payload)
+
+
+def build_node(server_url: str, digest: bool, sink: HistogramMetricsSink) -> QuoteRecommendationNode:
+    """실제 tool calling 에이전트: 첫 호출에서 검색, 두 번째 호출에서 도구 결과를 읽고 명언 JSON 반환"""
+    tool = create_web_search_tool(api_base_url=server_url, digest=digest, tavily_api_key=TAVILY_API_KEY)
+    llm = FakeChatModel(
+        responses=[
+            AIMessage(content="", tool_calls=[{"name": tool.name, "args": {"query": "발표 실수 위로 명언"}, "id": "search"}]),
+            QUOTE_OUTPUT,
+        ],
+        latency=LLM_LATENCY,
+        input_token_latency=INPUT_TOKEN_LATENCY,
+    )
+    parser = PydanticOutputParser(pydantic_object=QuoteResponse)
+    prompt = get_quote_prompt(format_instructions=parser.get_format_instructions())
+    executor = AgentExecutor(agent=create_tool_calling_agent(llm, [tool], prompt), tools=[tool])
+    return QuoteRecommendationNode(executor, metrics_sinks=[sink])
+
+
+def tool_output_size(server_url: str, digest: bool) -> tuple:
+    tool = create_web_search_tool(api_base_url=server_url, digest=digest, tavily_api_key=TAVILY_API_KEY)
+    output = tool.invoke({"query": "발표 실수 위로 명언"})
+    content = json.dumps(output, ensure_ascii=False)
+    tokens = count_tokens_approximately([ToolMessage(content=content, tool_call_id="search")])
+    return len(content), tokens, output
+
+
+def digest_cpu_ms(rounds: int = 50) -> float:
+    response = search_response()
+    start = time.process_time()
+    for _ in range(rounds):
+        digest_search_results(response)
+    return (time.process_time() - start) / rounds * 1000
+
+
+def run_branch(server_url: str, digest: bool) -> dict:
+    sink = HistogramMetricsSink()
+    node = build_node(server_url, digest, sink)
+    sync_times, async_times = [], []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        node({"diary_body": DIARY})
+        sync_times.append(time.perf_counter() - start)
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        asyncio.run(node.acall({"diary_body": DIARY}))
+        async_times.append(time.perf_counter() - start)
+    usage = sink.summary()["QuoteRecommendationNode"]
+    return {
+        "sync": statistics.median(sync_times),
+        "async": statistics.median(async_times),
+        "prompt_tokens": usage["prompt_tokens"] / usage["calls"],
+        "llm_calls": usage["llm_calls"] / usage["calls"],
+    }
+
+
+def main() -> None:
+    server = TavilyStubServer()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        print(f"latency: llm={LLM_LATENCY}s + {INPUT_TOKEN_LATENCY * 1000:.2f}ms/input token (simulated), tavily={SERVER_LATENCY}s")
+        results = {}
+        for digest in (False, True):
+            label = "digest" if digest else "raw"
+            chars, tokens, output = tool_output_size(server.url, digest)
+            branch = run_branch(server.url, digest)
+            results[label] = (tokens, branch)
+            print(
+                f"  {label:<6} tool output={chars:>6} chars / {tokens:>5} tokens  "
+                f"agent prompt={branch['prompt_tokens']:>6.0f} tokens / {branch['llm_calls']:.0f} llm calls  "
+                f"branch sync={branch['sync']:.2f}s async={branch['async']:.2f}s"
+            )
+            if digest:
+                for candidate in output["candidates"]:
+                    print(f"           - {candidate['quote']} ({candidate['author']})")
+        raw_tokens, raw_branch = results["raw"]
+        digest_tokens, digest_branch = results["digest"]
+        print(
+            f"  scratchpad tokens x{raw_tokens / digest_tokens:.1f} smaller, "
+            f"branch {digest_branch['sync'] - raw_branch['sync']:+.2f}s, digest cpu={digest_cpu_ms():.2f}ms/search"
+        )
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""
+RateLimiter 동작 확인 (로컬 가짜 Spotify / Tavily 서버 + 가짜 LLM)
+
+가짜 서버는 초당 SERVER_RPS건을 넘는 요청에 429(Retry-After: 1)를 돌려줌
+- no retry:       재시도 / 예산 없음 → 429가 그대로 실패
+- retry only:     429 / 5xx 재시도 (기본 설정)
+- budget + retry: 서버 한도에 맞춘 rpm 예산 + 재시도 → 429 자체가 거의 발생하지 않음
+failed는 429로 끝난 호출, errors는 그 밖의 예외(설정 오류 등) → errors가 있으면 assert로 종료
+자격 증명은 가짜 값을 직접 넘기므로 SPOTIFY_* / TAVILY_API_KEY 환경 변수 불필요
+
+실행: python -m benchmarks.bench_rate_limiter [N_CALLS]
+"""
+import asyncio
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from agents import AsyncSpotifyClient, PraiseNode, RateLimiter, SpotifyAPIError, configure_rate_limiter, create_web_search_tool
+from benchmarks.fakes import FakeChatModel
+
+N_CALLS = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+SERVER_RPS = 20
+SERVER_LATENCY = 0.02
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), StubHandler)
+        self.lock = threading.Lock()
+        self.window_start = time.monotonic()
+        self.window_count = 0
+        self.hits = {"ok": 0, "429": 0}
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def admit(self) -> bool:
+        """1초 고정 창에서 SERVER_RPS건까지만 허용"""
+        with self.lock:
+            now = time.monotonic()
+            if now - self.window_start >= 1.0:
+                self.window_start, self.window_count = now, 0
+            self.window_count += 1
+            allowed = self.window_count <= SERVER_RPS
+            self.hits["ok" if allowed else "429"] += 1
+            return allowed
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status: int, payload: dict, headers: dict | None = None) -> None:
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _limited(self) -> bool:
+        if self.server.admit():
+            time.sleep(SERVER_LATENCY)
+            return False
+        self._send(429, {"error": "rate limited"}, {"Retry-After": "1"})
+        return True
+
+    def do_GET(self):  # Spotify 검색
+        if not self._limited():
+            track = {"name": "밤편지", "artists": [{"name": "아이유"}], "external_urls": {"spotify": "https://x"}}
+            self._send(200, {"tracks": {"items": [track]}})
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if self.path.endswith("/token"):  # Spotify 토큰 (제한 없음)
+            self._send(200, {"access_token": "stub", "expires_in": 3600})
+        elif not self._limited():  # Tavily 검색
+            self._send(200, {"query": "q", "answer": "a", "results": [{"title": "명언", "url": "https://x", "content": "c"}]})
+
+
+SCENARIOS = {
+    "no retry": dict(max_retries=0),
+    "retry only": dict(max_retries=6, base_delay=0.25),
+    "budget + retry": dict(rpm=SERVER_RPS * 60 * 0.9, burst_seconds=1, max_retries=6, base_delay=0.25),
+}
+
+
+async def run_spotify(server: StubServer, limiter: RateLimiter) -> tuple:
+    client = AsyncSpotifyClient(
+        client_id="stub",
+        client_secret="stub",
+        api_url=f"{server.url}/v1",
+        token_url=f"{server.url}/api/token",
+        max_concurrency=64,
+        rate_limiter=limiter,
+    )
+
+    async def one(i: int) -> str:
+        try:
+            await client.search(q=f"keyword {i}", limit=1)
+            return "ok"
+        except SpotifyAPIError as exc:
+            if exc.status_code != 429:
+                raise
+            return "failed"
+
+    results = await asyncio.gather(*(one(i) for i in range(N_CALLS)), return_exceptions=True)
+    await client.aclose()
+    return count_results(results)
+
+
+async def run_tavily(server: StubServer) -> tuple:
+    tool = create_web_search_tool(api_base_url=server.url, tavily_api_key="tvly-stub")
+
+    async def one(i: int) -> str:
+        result = await tool.ainvoke({"query": f"위로 명언 {i}"})
+        if "error" not in result:
+            return "ok"
+        if "429" not in str(result["error"]):
+            raise RuntimeError(result["error"])
+        return "failed"
+
+    return count_results(await asyncio.gather(*(one(i) for i in range(N_CALLS)), return_exceptions=True))
+
+
+def count_results(results: list) -> tuple:
+    """(ok, failed(429), errors) 개수, errors는 첫 예외를 출력"""
+    errors = [result for result in results if isinstance(result, BaseException)]
+    if errors:
+        print(f"  first error: {errors[0]!r}")
+    return results.count("ok"), results.count("failed"), len(errors)
+
+
+def report(label: str, elapsed: float, ok: int, failed: int, errors: int, server: StubServer, limiter: RateLimiter) -> None:
+    m = limiter.metrics()
+    print(
+        f"{label:<26} {elapsed:6.2f}s  ok={ok:<4} failed={failed:<4} errors={errors:<3} server 429={server.hits['429']:<5} "
+        f"retries={m['retries']:<4} max queue={m['max_queue_depth']:<4} wait p95={m['wait_time_p95']:.2f}s"
+    )
+
+
+def main() -> None:
+    print(f"{N_CALLS} concurrent calls, stub server limit {SERVER_RPS} req/s")
+    for provider in ("spotify", "tavily"):
+        for label, settings in SCENARIOS.items():
+            server = StubServer()
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            limiter = configure_rate_limiter(provider, **settings)
+            start = time.perf_counter()
+            if provider == "spotify":
+                ok, failed, errors = asyncio.run(run_spotify(server, limiter))
+            else:
+                ok, failed, errors = asyncio.run(run_tavily(server))
+            report(f"{provider} / {label}", time.perf_counter() - start, ok, failed, errors, server, limiter)
+            server.shutdown()
+            server.server_close()
+            assert errors == 0, f"{provider} / {label}: 429 이외의 오류 {errors}건"
+
+    # LLM: rpm 예산에 맞춰 호출 속도 조절 (PraiseNode가 공용 "openai" 제한기 사용)
+    limiter = configure_rate_limiter("openai", rpm=3000, burst_seconds=1)
+    node = PraiseNode(FakeChatModel(responses=["잘했어"], latency=0.01))
+
+    async def praise_all():
+        await asyncio.gather(*(node.aexecute({"diary_body": f"일기 {i}"}) for i in range(N_CALLS)))
+
+    start = time.perf_counter()
+    asyncio.run(praise_all())
+    m = limiter.metrics()
+    print(
+        f"{'openai / rpm=3000':<26} {time.perf_counter() - start:6.2f}s  calls={m['calls']} "
+        f"max queue={m['max_queue_depth']} wait p95={m['wait_time_p95']:.2f}s (expected ≈ {(N_CALLS - 50) / 50:.1f}s)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+"""
+AsyncSpotifyClient 동작 확인 (로컬 가짜 Spotify 서버)
+
+- pool:     동시 요청 N건 → 토큰 발급 1회, 동시에 처리 중인 요청 수 ≤ max_concurrency, 커넥션 재사용
+- 401:      서버가 토큰을 무효화한 뒤 동시에 받은 401 N건 → 토큰 재발급 1회
+- retry-after: 서버가 Retry-After를 HTTP-date 형식으로 준 429 → ValueError 없이 재시도해 성공
+- loops:    asyncio.run을 여러 번 (루프가 바뀔 때마다 새 클라이언트) → 루프가 끝날 때 커넥션이 닫혀
+            열린 파일 디스크립터 수가 처음과 같아야 함
+각 항목은 조건을 assert로 확인하고, 실패하면 예외로 종료
+
+실행: python -m benchmarks.bench_spotify_client [N_CALLS]
+"""
+import asyncio
+import gc
+import json
+import os
+import sys
+import threading
+import time
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from agents import AsyncSpotifyClient, RateLimiter
+
+N_CALLS = int(sys.argv[1]) if len(sys.argv) > 1 else 64
+MAX_CONCURRENCY = 4
+SERVER_LATENCY = 0.02
+LOOPS = 5
+
+
+class SpotifyStubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), SpotifyStubHandler)
+        self.lock = threading.Lock()
+        self.token_requests = 0
+        self.valid_token = None
+        self.unauthorized = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.connections = set()
+        self.throttle_next = 0  # 남은 수만큼 429(Retry-After: HTTP-date)로 응답
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def issue_token(self) -> str:
+        with self.lock:
+            self.token_requests += 1
+            self.valid_token = f"token-{self.token_requests}"
+            return self.valid_token
+
+    def revoke_token(self) -> None:
+        with self.lock:
+            self.valid_token = None
+
+    def reset(self) -> None:
+        with self.lock:
+            self.token_requests = self.unauthorized = self.max_in_flight = self.throttle_next = 0
+            self.connections.clear()
+
+
+class SpotifyStubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status: int, payload: dict, headers: dict | None = None) -> None:
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):  # 토큰 발급
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self._send(200, {"access_token": self.server.issue_token(), "expires_in": 3600})
+
+    def do_GET(self):  # 검색
+        server = self.server
+        with server.lock:
+            server.connections.add(self.client_address)
+            authorized = self.headers.get("Authorization") == f"Bearer {server.valid_token}"
+            if not authorized:
+                server.unauthorized += 1
+            throttled = authorized and server.throttle_next > 0
+            if throttled:
+                server.throttle_next -= 1
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+        try:
+            time.sleep(SERVER_LATENCY)
+            if not authorized:
+                self._send(401, {"error": {"status": 401, "message": "The access token expired"}})
+                return
+            if throttled:
+                retry_at = formatdate(time.time() + 1, usegmt=True)
+                self._send(429, {"error": {"status": 429, "message": "API rate limit exceeded"}}, {"Retry-After": retry_at})
+                return
+            track = {"name": "밤편지", "artists": [{"name": "아이유"}], "external_urls": {"spotify": "https://x"}}
+            self._send(200, {"tracks": {"items": [track]}})
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+
+def make_client(server: SpotifyStubServer) -> AsyncSpotifyClient:
+    return AsyncSpotifyClient(
+        client_id="id",
+        client_secret="secret",
+        api_url=server.url,
+        token_url=f"{server.url}/api/token",
+        max_concurrency=MAX_CONCURRENCY,
+        rate_limiter=RateLimiter("spotify-stub"),
+    )
+
+
+async def search_many(client: AsyncSpotifyClient, n: int) -> None:
+    results = await asyncio.gather(*(client.search(f"q{i}", limit=1) for i in range(n)))
+    assert all(r["tracks"]["items"] for r in results)
+
+
+def open_fds() -> int:
+    gc.collect()
+    return len(os.listdir("/proc/self/fd"))
+
+
+def check_pool(server: SpotifyStubServer) -> None:
+    server.reset()
+    client = make_client(server)
+
+    async def run():
+        await search_many(client, N_CALLS)
+        await client.aclose()
+
+    start = time.perf_counter()
+    asyncio.run(run())
+    elapsed = time.perf_counter() - start
+    print(
+        f"pool    {N_CALLS} calls {elapsed:.2f}s  token requests={server.token_requests}  "
+        f"max in flight={server.max_in_flight} (limit {MAX_CONCURRENCY})  connections={len(server.connections)}"
+    )
+    assert server.token_requests == 1
+    assert server.max_in_flight <= MAX_CONCURRENCY
+    assert len(server.connections) <= MAX_CONCURRENCY
+
+
+def check_concurrent_401(server: SpotifyStubServer) -> None:
+    server.reset()
+    client = make_client(server)
+
+    async def run():
+        await search_many(client, MAX_CONCURRENCY)  # 토큰 발급
+        server.revoke_token()
+        await search_many(client, N_CALLS)
+        await client.aclose()
+
+    asyncio.run(run())
+    refreshes = server.token_requests - 1
+    print(f"401     {server.unauthorized} unauthorized responses → token refreshes={refreshes}")
+    assert server.unauthorized >= MAX_CONCURRENCY
+    assert refreshes == 1
+
+
+def check_retry_after_date(server: SpotifyStubServer) -> None:
+    server.reset()
+    client = make_client(server)
+
+    async def run():
+        await search_many(client, 1)  # 토큰 발급
+        server.throttle_next = 1
+        await search_many(client, 1)
+        await client.aclose()
+
+    start = time.perf_counter()
+    asyncio.run(run())
+    metrics = client.rate_limiter.metrics()
+    print(f"retry   429 with HTTP-date Retry-After → retries={metrics['retries']} ok after {time.perf_counter() - start:.2f}s")
+    assert server.throttle_next == 0 and metrics["retries"] == 1
+
+
+def check_loops(server: SpotifyStubServer) -> None:
+    server.reset()
+    client = make_client(server)  # 닫지 않고 여러 루프에서 재사용
+    before = open_fds()
+    for _ in range(LOOPS):
+        asyncio.run(search_many(client, MAX_CONCURRENCY * 2))
+    after = open_fds()
+    print(f"loops   {LOOPS} asyncio.run calls  connections={len(server.connections)}  open fds before={before} after={after}")
+    assert after <= before
+
+
+def main() -> None:
+    server = SpotifyStubServer()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        check_pool(server)
+        check_concurrent_401(server)
+        check_retry_after_date(server)
+        check_loops(server)
+        print("ok")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
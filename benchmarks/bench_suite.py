@@ -0,0 +1,279 @@
+"""
+main_graph / letter_graph 오프라인 성능 측정 (API 키 불필요)
+
+agents 패키지로 두 그래프를 그대로 구성하고 외부 호출만 가짜로 대체
+- 대화 / 본문 / 칭찬 / MBTI LLM: 스크립트대로 응답하는 FakeChatModel
+- 음악 / 명언 에이전트: 실제 AgentExecutor + 가짜 LLM(도구 호출 → 최종 JSON)
+  + SpotifyTool(FakeSpotifyClient) / FakeTavilyTool
+- 세션: 사건 N개를 (이야기 → 키워드 추천 → 기록) 3턴씩 입력한 뒤 'q'로 일기 생성,
+  만들어진 diary_body로 letter_graph 실행
+
+보고 항목 (사건 수별)
+- 턴 / 세션 / 편지 전체 지연 시간, 노드별 호출 수 / 합계 / 평균 시간 (LangGraph 콜백으로 측정)
+- 노드 클래스별 LLM 호출 수와 입력/출력 토큰 수 (BaseNode 측정 결과, HistogramMetricsSink)
+- tracemalloc으로 측정한 최대 메모리(peak)와 세션 후 남은 메모리 블록(net alloc)
+
+출력 형식이 고정되어 있어 실행 결과를 diff로 비교 가능 (--json으로 파일 저장)
+
+실행: python -m benchmarks.bench_suite [--sizes 1 5 10 20] [--llm-latency 0] [--tool-latency 0] [--json out.json]
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+import tracemalloc
+import uuid
+from collections import defaultdict
+from datetime import date, time as dtime
+
+from langchain.agents import AgentExecutor, create_tool_calling_agent
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.output_parsers import PydanticOutputParser
+from langgraph.checkpoint.memory import MemorySaver
+
+from agents import (
+    DiaryEntry,
+    GenerateEmotionChartsNode,
+    HistogramMetricsSink,
+    InMemoryChartStore,
+    MusicResponse,
+    QuoteResponse,
+    SpotifyTool,
+    build_letter_graph,
+    build_main_graph,
+    configure_metrics_sinks,
+    get_metrics_sinks,
+    get_music_prompt,
+    get_quote_prompt,
+)
+from agents.core.cache import TTLCache
+
+from .fakes import FakeChatModel, FakeSpotifyClient, FakeTavilyTool
+
+EMOTIONS = ["기쁨", "설렘", "평범함", "슬픔", "두려움"]
+MUSIC_JSON = json.dumps(
+    {"title": "밤편지", "artist": "아이유", "url": "https://open.spotify.com/track/0", "reason": "잔잔한 밤에 어울려"},
+    ensure_ascii=False,
+)
+QUOTE_JSON = json.dumps(
+    {"quote": "천천히 가도 괜찮다.", "author": "누군가", "explanation": "오늘도 충분히 잘했어."}, ensure_ascii=False
+)
+
+
+class NodeTimer(BaseCallbackHandler):
+    """LangGraph 노드 실행 시간 수집 (노드 이름 = 실행 이름인 run만 측정)"""
+    run_inline = True
+
+    def __init__(self):
+        self._starts = {}
+        self.samples = defaultdict(list)
+
+    def on_chain_start(self, serialized, inputs, *, run_id, metadata=None, **kwargs):
+        node = (metadata or {}).get("langgraph_node")
+        if node is not None and kwargs.get("name") == node:
+            self._starts[run_id] = (node, time.perf_counter())
+
+    def _finish(self, run_id) -> None:
+        item = self._starts.pop(run_id, None)
+        if item is not None:
+            self.samples[item[0]].append(time.perf_counter() - item[1])
+
+    def on_chain_end(self, outputs, *, run_id, **kwargs):
+        self._finish(run_id)
+
+    def on_chain_error(self, error, *, run_id, **kwargs):
+        self._finish(run_id)
+
+    def summary(self) -> dict:
+        return {
+            node: {"calls": len(values), "total_ms": round(sum(values) * 1000, 1), "mean_ms": round(sum(values) / len(values) * 1000, 2)}
+            for node, values in sorted(self.samples.items())
+        }
+
+
+def make_entry(i: int, n: int) -> DiaryEntry:
+    minutes = 7 * 60 + i * (16 * 60 // max(n, 1))  # 07:00부터 23시 전까지 고르게 분포
+    return DiaryEntry(
+        event_title=f"사건 {i}",
+        time_period=dtime(hour=minutes // 60, minute=minutes % 60),
+        core_emotion=EMOTIONS[i % len(EMOTIONS)],
+        emotion_keywords=["잔잔한"],
+        emotion_score=(i * 37) % 101,
+        companions=[{"name": "지연", "relationship": "친구"}] if i % 3 == 0 else [],
+        thoughts=f"{i}번째 일은 생각보다 즐거웠고 다음에도 또 하고 싶었다.",
+        reflection="미리 준비한 덕분에 여유가 있었다.",
+        summary=f"{i}번째 사건을 잘 마무리했다.",
+    )
+
+
+def chat_script(n: int) -> list:
+    """InfoNode 응답 스크립트: 사건마다 질문 → 키워드 추천 도구 → DiaryEntry 도구 → 다음 사건 질문"""
+    responses = []
+    for i in range(n):
+        responses += [
+            AIMessage(content=f"{i}번째 일은 몇 시쯤이었고 누구랑 있었어?"),
+            AIMessage(content="", tool_calls=[{"name": "suggest_keywords_tool", "args": {"core_emotion": EMOTIONS[i % len(EMOTIONS)]}, "id": f"kw-{i}"}]),
+            AIMessage(content="", tool_calls=[{"name": "DiaryEntry", "args": make_entry(i, n).model_dump(mode="json"), "id": f"entry-{i}"}]),
+            AIMessage(content="혹시 오늘 다른 기억에 남는 일도 있었어?"),
+        ]
+    return responses
+
+
+def user_turns(n: int) -> list:
+    turns = []
+    for i in range(n):
+        turns += [
+            f"오늘 {i}번째로 있었던 일을 얘기해 줄게. 친구랑 같이 산책하고 카페에 갔어.",
+            "저녁 7시쯤이었고 지연이랑 같이 있었어. 기분이 좋았어.",
+            "잔잔한, 편안한",
+        ]
+    return turns + ["q"]
+
+
+def build_graphs(n: int, llm_latency: float, tool_latency: float):
+    main_graph = build_main_graph(
+        FakeChatModel(responses=["오늘은 잔잔하지만 알찬 하루였다.", "본문"], latency=llm_latency),
+        llm_with_tool=FakeChatModel(responses=chat_script(n), latency=llm_latency),
+        chart_node=GenerateEmotionChartsNode(store=InMemoryChartStore()),
+        checkpointer=MemorySaver(),
+    )
+
+    music_llm = FakeChatModel(
+        responses=[
+            AIMessage(content="", tool_calls=[{"name": "spotify_recommender_tool", "args": {"diary": "일기", "keyword": "산책"}, "id": "music"}]),
+            AIMessage(content=MUSIC_JSON),
+        ],
+        latency=llm_latency,
+    )
+    quote_llm = FakeChatModel(
+        responses=[
+            AIMessage(content="", tool_calls=[{"name": "tavily_search", "args": {"query": "위로 명언"}, "id": "quote"}]),
+            AIMessage(content=QUOTE_JSON),
+        ],
+        latency=llm_latency,
+    )
+    music_tools = [SpotifyTool(async_client=FakeSpotifyClient(latency=tool_latency), cache=TTLCache())]
+    quote_tools = [FakeTavilyTool(latency=tool_latency)]
+    music_prompt = get_music_prompt(PydanticOutputParser(pydantic_object=MusicResponse).get_format_instructions())
+    quote_prompt = get_quote_prompt(PydanticOutputParser(pydantic_object=QuoteResponse).get_format_instructions())
+
+    letter_graph = build_letter_graph(
+        FakeChatModel(responses=["오늘도 정말 잘했어!", "F 위로", "T 조언"], latency=llm_latency),
+        AgentExecutor(agent=create_tool_calling_agent(music_llm, music_tools, music_prompt), tools=music_tools),
+        AgentExecutor(agent=create_tool_calling_agent(quote_llm, quote_tools, quote_prompt), tools=quote_tools),
+    )
+    return main_graph, letter_graph
+
+
+async def run_session(n: int, llm_latency: float, tool_latency: float) -> dict:
+    """사건 n개 세션 + 편지 생성 1회 실행 후 시간 측정 결과 반환"""
+    main_graph, letter_graph = build_graphs(n, llm_latency, tool_latency)
+    main_timer, letter_timer = NodeTimer(), NodeTimer()
+    usage_sink = HistogramMetricsSink()
+    default_sinks = get_metrics_sinks()
+    configure_metrics_sinks(usage_sink)
+    config = {"configurable": {"thread_id": str(uuid.uuid4())}, "callbacks": [main_timer]}
+
+    turn_times = []
+    state = None
+    session_start = time.perf_counter()
+    for index, text in enumerate(user_turns(n)):
+        inputs = {"messages": [HumanMessage(content=text)]}
+        if index == 0:
+            inputs.update(entries=[], user_name="예리", today_date=date(2025, 7, 31), written_at=dtime(23, 0))
+        start = time.perf_counter()
+        state = await main_graph.ainvoke(inputs, config)
+        turn_times.append(time.perf_counter() - start)
+    session = time.perf_counter() - session_start
+    assert state.get("final_markdown") and len(state["entries"]) == n, "세션 스크립트가 예상대로 진행되지 않았습니다."
+
+    diary_body = "\n\n".join(entry.summary + " " + entry.thoughts for entry in state["entries"])
+    start = time.perf_counter()
+    letter = await letter_graph.ainvoke({"diary_body": diary_body}, {"callbacks": [letter_timer]})
+    letter_time = time.perf_counter() - start
+    assert letter.get("letter_markdown")
+    configure_metrics_sinks(*default_sinks)
+
+    return {
+        "turns": len(turn_times),
+        "session_ms": round(session * 1000, 1),
+        "turn_mean_ms": round(sum(turn_times[:-1]) / max(len(turn_times) - 1, 1) * 1000, 2),
+        "finish_turn_ms": round(turn_times[-1] * 1000, 1),
+        "letter_ms": round(letter_time * 1000, 1),
+        "main_nodes": main_timer.summary(),
+        "letter_nodes": letter_timer.summary(),
+        "llm_usage": {
+            node: {key: stats[key] for key in ("llm_calls", "prompt_tokens", "completion_tokens")}
+            for node, stats in usage_sink.summary().items()
+            if stats["llm_calls"]
+        },
+    }
+
+
+def measure_memory(n: int, llm_latency: float, tool_latency: float) -> dict:
+    """tracemalloc을 켠 상태로 한 번 더 실행 (시간 측정과 분리: tracemalloc 자체가 실행을 느리게 함)"""
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    asyncio.run(run_session(n, llm_latency, tool_latency))
+    after = tracemalloc.take_snapshot()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    diff = after.compare_to(before, "filename")
+    return {
+        "peak_kb": round(peak / 1024),
+        "net_alloc_kb": round(sum(stat.size_diff for stat in diff) / 1024),
+        "net_alloc_blocks": sum(stat.count_diff for stat in diff),
+    }
+
+
+def print_report(results: dict) -> None:
+    for n, result in results.items():
+        print(f"\n## entries={n}  turns={result['turns']}")
+        print(
+            f"session={result['session_ms']}ms  turn(mean)={result['turn_mean_ms']}ms  "
+            f"finish turn={result['finish_turn_ms']}ms  letter={result['letter_ms']}ms"
+        )
+        print(
+            f"memory: peak={result['peak_kb']}KB  net alloc={result['net_alloc_kb']}KB "
+            f"({result['net_alloc_blocks']} blocks)"
+        )
+        for graph in ("main_nodes", "letter_nodes"):
+            print(f"  {graph:<28}{'calls':>6}{'total ms':>12}{'mean ms':>10}")
+            for node, stats in result[graph].items():
+                print(f"  {node:<28}{stats['calls']:>6}{stats['total_ms']:>12}{stats['mean_ms']:>10}")
+        print(f"  {'llm_usage':<28}{'calls':>6}{'prompt tok':>12}{'compl tok':>10}")
+        for node, stats in result["llm_usage"].items():
+            print(f"  {node:<28}{stats['llm_calls']:>6}{stats['prompt_tokens']:>12}{stats['completion_tokens']:>10}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 5, 10, 20], help="세션별 사건 수")
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="가짜 LLM 호출 1회당 지연(초)")
+    parser.add_argument("--tool-latency", type=float, default=0.0, help="가짜 Spotify / Tavily 호출 1회당 지연(초)")
+    parser.add_argument("--no-memory", action="store_true", help="tracemalloc 측정 생략")
+    parser.add_argument("--json", help="결과를 저장할 JSON 파일 경로")
+    args = parser.parse_args()
+
+    random.seed(0)  # SpotifyTool의 후보 곡 선택 고정
+    asyncio.run(run_session(1, 0.0, 0.0))  # import / 첫 실행 비용 제외 (warm-up)
+
+    results = {}
+    for n in args.sizes:
+        results[n] = asyncio.run(run_session(n, args.llm_latency, args.tool_latency))
+        if not args.no_memory:
+            results[n].update(measure_memory(n, args.llm_latency, args.tool_latency))
+        else:
+            results[n].update(peak_kb=None, net_alloc_kb=None, net_alloc_blocks=None)
+
+    print(f"llm latency={args.llm_latency}s  tool latency={args.tool_latency}s")
+    print_report(results)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"llm_latency": args.llm_latency, "tool_latency": args.tool_latency, "results": results}, f, ensure_ascii=False, indent=2, sort_keys=True)
+
+
+if __name__ == "__main__":
+    main()
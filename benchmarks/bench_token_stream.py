@@ -0,0 +1,133 @@
+"""
+InfoNode 응답 / 일기 본문 토큰 스트리밍 측정 (가짜 스트리밍 LLM)
+
+턴마다 그래프를 token_stream_config + stream_mode=["custom", "values"]로 실행해 첫 TokenStreamEvent까지의 시간과 턴 전체 시간을 비교
+- 텍스트 턴: 첫 조각 ≈ LLM_LATENCY, 턴 전체 ≈ LLM_LATENCY + TOKEN_LATENCY × 조각 수
+- 도구 호출 턴(suggest_keywords_tool / DiaryEntry): 텍스트 조각이 나가지 않아야 함
+- 스트리밍으로 받은 텍스트를 이어 붙인 결과가 상태에 저장된 최종 메시지 / diary_body와 같은지 확인
+- token_stream_config 없이 실행하면 노드가 스트리밍 호출로 바꾸지 않아야 함 (조각 0개)
+
+실행: python -m benchmarks.bench_token_stream
+"""
+import asyncio
+import time
+from datetime import date, time as dtime
+
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.checkpoint.memory import MemorySaver
+
+from agents import GenerateEmotionChartsNode, InMemoryChartStore, TokenStreamEvent, build_main_graph, token_stream_config
+from benchmarks.bench_suite import make_entry
+from benchmarks.fakes import FakeChatModel
+
+LLM_LATENCY = 0.3
+TOKEN_LATENCY = 0.02
+QUESTION = "정말 즐거운 하루였겠다! 친구랑 산책하면서 어떤 이야기를 나눴는지, 그때 기분이 어땠는지 조금 더 들려줄래?"
+FOLLOW_UP = "좋아, 기록해 뒀어. 혹시 오늘 다른 기억에 남는 일도 있었어? 없으면 q를 입력해줘."
+BODY = " ".join(["오늘은 친구와 함께 공원을 천천히 걸으며 오랜만에 많은 이야기를 나눴다."] * 8)
+
+TURNS = [
+    ("story", "오늘 친구랑 같이 산책하고 카페에 갔어."),
+    ("keywords (tool)", "저녁 7시쯤이었고 기분이 좋았어."),
+    ("entry (tool) + reply", "잔잔한, 편안한"),
+    ("q: diary body", "q"),
+]
+
+
+def build_graph(stream_tokens: bool = True):
+    chat = FakeChatModel(
+        responses=[
+            AIMessage(content=QUESTION),
+            AIMessage(content="", tool_calls=[{"name": "suggest_keywords_tool", "args": {"core_emotion": "기쁨"}, "id": "kw"}]),
+            AIMessage(content="", tool_calls=[{"name": "DiaryEntry", "args": make_entry(0, 1).model_dump(mode="json"), "id": "entry"}]),
+            AIMessage(content=FOLLOW_UP),
+        ],
+        latency=LLM_LATENCY,
+        token_latency=TOKEN_LATENCY,
+    )
+    body = FakeChatModel(responses=["산책으로 채운 잔잔한 하루", BODY], latency=LLM_LATENCY, token_latency=TOKEN_LATENCY)
+    return build_main_graph(
+        body,
+        llm_with_tool=chat,
+        chart_node=GenerateEmotionChartsNode(store=InMemoryChartStore()),
+        checkpointer=MemorySaver(),
+        stream_tokens=stream_tokens,
+    )
+
+
+def first_input(text: str) -> dict:
+    return {
+        "messages": [HumanMessage(content=text)],
+        "entries": [],
+        "user_name": "예리",
+        "today_date": date(2025, 7, 31),
+        "written_at": dtime(23, 0),
+    }
+
+
+def check(label: str, events: list, state: dict) -> str:
+    """스트리밍 텍스트가 최종 상태와 일치하는지 확인"""
+    streamed = {}
+    for event in events:
+        streamed[event.field] = streamed.get(event.field, "") + event.text
+    if "diary_body" in streamed:
+        assert streamed["diary_body"] == state["diary_body"], label
+    if "messages" in streamed:
+        assert streamed["messages"] == state["messages"][-1].content, label
+    return ",".join(f"{field}={len(text)}" for field, text in sorted(streamed.items())) or "-"
+
+
+async def run_async(stream_tokens: bool, request: bool = True) -> None:
+    graph = build_graph(stream_tokens)
+    config = {"configurable": {"thread_id": "async"}}
+    if request:
+        config = token_stream_config(config)
+    for index, (label, text) in enumerate(TURNS):
+        inputs = first_input(text) if index == 0 else {"messages": [HumanMessage(content=text)]}
+        events, state, first = [], None, None
+        start = time.perf_counter()
+        async for mode, chunk in graph.astream(inputs, config, stream_mode=["custom", "values"]):
+            if mode == "custom" and isinstance(chunk, TokenStreamEvent):
+                first = first if first is not None else time.perf_counter() - start
+                events.append(chunk)
+            elif mode == "values":
+                state = chunk
+        total = time.perf_counter() - start
+        streamed = check(label, events, state)
+        first_text = f"{first:.2f}s" if first is not None else "  -  "
+        print(f"  {label:<22} first token={first_text}  turn={total:.2f}s  events={len(events):<3} chars: {streamed}")
+
+
+def run_sync() -> None:
+    graph = build_graph()
+    config = token_stream_config({"configurable": {"thread_id": "sync"}})
+    for index, (label, text) in enumerate(TURNS):
+        inputs = first_input(text) if index == 0 else {"messages": [HumanMessage(content=text)]}
+        events, state, first = [], None, None
+        start = time.perf_counter()
+        for mode, chunk in graph.stream(inputs, config, stream_mode=["custom", "values"]):
+            if mode == "custom" and isinstance(chunk, TokenStreamEvent):
+                first = first if first is not None else time.perf_counter() - start
+                events.append(chunk)
+            elif mode == "values":
+                state = chunk
+        total = time.perf_counter() - start
+        streamed = check(label, events, state)
+        first_text = f"{first:.2f}s" if first is not None else "  -  "
+        print(f"  {label:<22} first token={first_text}  turn={total:.2f}s  events={len(events):<3} chars: {streamed}")
+
+
+def main() -> None:
+    print(f"latency: first chunk={LLM_LATENCY}s, per chunk={TOKEN_LATENCY}s")
+    print("astream (stream_tokens=True)")
+    asyncio.run(run_async(True))
+    print("astream (stream_tokens=False)")
+    asyncio.run(run_async(False))
+    print("astream (token_stream_config 없음)")
+    asyncio.run(run_async(True, request=False))
+    print("stream (sync, stream_tokens=True)")
+    run_sync()
+
+
+if __name__ == "__main__":
+    main()
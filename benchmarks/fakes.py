@@ -0,0 +1,221 @@
+import asyncio
+import itertools
+import json
+import re
+import threading
+import time
+from typing import Any, AsyncIterator, Iterable, Iterator, List, Optional, Type
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.messages.utils import count_tokens_approximately
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.tools import BaseTool
+from pydantic import BaseModel, Field
+
+from agents.core.spotify import AsyncSpotifyClient
+
+
+class FakeChatModel(BaseChatModel):
+    """
+    지정한 지연 시간 후 미리 정해둔 응답을 순서대로 돌려주는 가짜 LLM
+    - 응답에 AIMessage를 넣으면 도구 호출(tool_calls)까지 그대로 재현
+    - bind_tools는 자기 자신을 반환 (응답은 스크립트로 정해져 있으므로)
+    - usage_metadata에 근사 토큰 수를 채워 노드 측정(BaseNode)에서 토큰 수 확인 가능
+    - stream / astream: 텍스트는 단어 단위 조각으로, 도구 호출은 tool_call_chunks 한 조각으로 스트리밍
+
+    Attributes:
+        responses (List[str | AIMessage]): 순환하며 반환할 응답 목록.
+        latency (float): 호출 1회당 지연 시간(초), 스트리밍에서는 첫 조각까지의 시간.
+        token_latency (float): 스트리밍 조각 사이 지연 시간(초), invoke는 조각 수만큼 더 기다림.
+        input_token_latency (float): 입력 토큰 1개당 추가 지연 시간(초), 긴 프롬프트를 읽는 비용(prefill) 흉내.
+    """
+    responses: List[Any] = ["응답"]
+    latency: float = 0.0
+    token_latency: float = 0.0
+    input_token_latency: float = 0.0
+
+    call_count: int = 0
+    _lock: Any = None
+    _cycle: Any = None
+
+    def model_post_init(self, __context: Any) -> None:
+        self._lock = threading.Lock()
+        self._cycle = itertools.cycle(self.responses)
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-chat-model"
+
+    def _next_message(self, messages: List[BaseMessage]) -> AIMessage:
+        with self._lock:
+            self.call_count += 1
+            response = next(self._cycle)
+        message = response.model_copy() if isinstance(response, AIMessage) else AIMessage(content=response)
+        input_tokens = count_tokens_approximately(messages)
+        output_tokens = count_tokens_approximately([message])
+        message.usage_metadata = {
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "total_tokens": input_tokens + output_tokens,
+        }
+        return message
+
+    def bind_tools(self, tools: Any, **kwargs: Any) -> "FakeChatModel":
+        return self
+
+    @staticmethod
+    def _chunks(message: AIMessage) -> List[AIMessageChunk]:
+        if message.tool_calls:
+            tool_call_chunks = [
+                {"name": call["name"], "args": json.dumps(call["args"], ensure_ascii=False), "id": call["id"], "index": i}
+                for i, call in enumerate(message.tool_calls)
+            ]
+            chunks = [AIMessageChunk(content=message.content, tool_call_chunks=tool_call_chunks)]
+        else:
+            pieces = re.findall(r"\S+\s*|\s+", message.content) or [""]
+            chunks = [AIMessageChunk(content=piece) for piece in pieces]
+        chunks[-1].usage_metadata = message.usage_metadata
+        return chunks
+
+    def _first_latency(self, message: AIMessage) -> float:
+        return self.latency + self.input_token_latency * message.usage_metadata["input_tokens"]
+
+    def _total_latency(self, message: AIMessage) -> float:
+        if not self.token_latency:
+            return self._first_latency(message)
+        return self._first_latency(message) + self.token_latency * (len(self._chunks(message)) - 1)
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        message = self._next_message(messages)
+        time.sleep(self._total_latency(message))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        message = self._next_message(messages)
+        await asyncio.sleep(self._total_latency(message))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _stream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> Iterator[ChatGenerationChunk]:
+        message = self._next_message(messages)
+        time.sleep(self._first_latency(message))
+        for i, chunk in enumerate(self._chunks(message)):
+            if i:
+                time.sleep(self.token_latency)
+            if run_manager is not None:
+                run_manager.on_llm_new_token(chunk.text(), chunk=ChatGenerationChunk(message=chunk))
+            yield ChatGenerationChunk(message=chunk)
+
+    async def _astream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        message = self._next_message(messages)
+        await asyncio.sleep(self._first_latency(message))
+        for i, chunk in enumerate(self._chunks(message)):
+            if i:
+                await asyncio.sleep(self.token_latency)
+            if run_manager is not None:
+                await run_manager.on_llm_new_token(chunk.text(), chunk=ChatGenerationChunk(message=chunk))
+            yield ChatGenerationChunk(message=chunk)
+
+
+class FakeAgentExecutor:
+    """
+    AgentExecutor 대신 지정한 지연 시간 후 {"output": output}을 돌려주는 가짜 에이전트
+
+    Attributes:
+        output (str): 반환할 최종 출력 텍스트 (노드의 PydanticOutputParser가 파싱할 JSON).
+        latency (float): 호출 1회당 지연 시간(초).
+    """
+
+    def __init__(self, output: str, latency: float = 0.0):
+        self.output = output
+        self.latency = latency
+        self.call_count = 0
+
+    def invoke(self, input: dict, config=None, **kwargs) -> dict:
+        self.call_count += 1
+        time.sleep(self.latency)
+        return {"input": input["input"], "output": self.output}
+
+    async def ainvoke(self, input: dict, config=None, **kwargs) -> dict:
+        self.call_count += 1
+        await asyncio.sleep(self.latency)
+        return {"input": input["input"], "output": self.output}
+
+
+class FakeSpotifyClient(AsyncSpotifyClient):
+    """
+    네트워크 없이 지연 시간 후 고정된 검색 결과를 돌려주는 Spotify 클라이언트 (SpotifyTool(async_client=...)에 전달)
+    - misses에 넣은 검색어는 결과 없음(곡을 못 찾은 경우)으로 응답
+    """
+
+    def __init__(self, latency: float = 0.0, n_tracks: int = 50, misses: Iterable[str] = ()):
+        super().__init__(client_id="fake", client_secret="fake")
+        self.latency = latency
+        self.n_tracks = n_tracks
+        self.misses = set(misses)
+        self.call_count = 0
+
+    async def search(self, q: str, type: str = "track", limit: int = 10, offset: int = 0, market: Optional[str] = None) -> dict:
+        self.call_count += 1
+        await asyncio.sleep(self.latency)
+        items = [
+            {"name": f"{q} 노래 {i}", "artists": [{"name": f"가수 {i}"}], "external_urls": {"spotify": f"https://open.spotify.com/track/{i}"}}
+            for i in range(0 if q in self.misses else min(limit, self.n_tracks))
+        ]
+        return {"tracks": {"items": items}}
+
+
+class FakeTavilyInput(BaseModel):
+    query: str = Field(..., description="검색어")
+
+
+class FakeTavilyTool(BaseTool):
+    """TavilySearch 대신 지연 시간 후 고정된 검색 결과를 돌려주는 도구"""
+    name: str = "tavily_search"
+    description: str = "명언을 검색합니다."
+    args_schema: Type[BaseModel] = FakeTavilyInput
+    latency: float = 0.0
+    call_count: int = 0
+
+    def _result(self, query: str) -> dict:
+        self.call_count += 1
+        return {
+            "query": query,
+            "answer": "천천히 가도 괜찮다.",
+            "results": [
+                {"title": f"위로가 되는 명언 {i}", "url": f"https://example.com/{i}", "content": "천천히 가도 멈추지만 않으면 된다. " * 20}
+                for i in range(3)
+            ],
+        }
+
+    def _run(self, query: str) -> dict:
+        time.sleep(self.latency)
+        return self._result(query)
+
+    async def _arun(self, query: str) -> dict:
+        await asyncio.sleep(self.latency)
+        return self._result(query)